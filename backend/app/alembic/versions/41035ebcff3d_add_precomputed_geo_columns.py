@@ -0,0 +1,138 @@
+"""Add precomputed geometry, spatial join and name search columns to the geo tables
+
+Revision ID: 41035ebcff3d
+Revises: 1a31ce608336
+Create Date: 2026-10-16 09:12:47.318205
+
+The geography tables are created by scripts/load_geodata.py, not by a
+revision, so this only upgrades the ones that already exist; missing tables
+are created with the full schema on the next load. The new columns are
+nullable and are filled by re-running the loader.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '41035ebcff3d'
+down_revision = '1a31ce608336'
+branch_labels = None
+depends_on = None
+
+
+CENTROID = ('centroid_lat', 'centroid_lon')
+BBOX = ('min_lon', 'min_lat', 'max_lon', 'max_lat')
+NAME_KEYS = ('name_key', 'name_phonetic')
+TRANSPORT = ('airport', 'port', 'checkpoint')
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _add_float_columns(table, names):
+    for name in names:
+        op.add_column(table, sa.Column(name, sa.Float(), nullable=True))
+        op.create_index(op.f(f'ix_{table}_{name}'), table, [name], unique=False)
+
+
+def _add_name_keys(table):
+    for name in NAME_KEYS:
+        op.add_column(table, sa.Column(name, sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True))
+        op.create_index(op.f(f'ix_{table}_{name}'), table, [name], unique=False)
+
+
+def _drop_indexed_columns(table, names):
+    for name in names:
+        op.drop_index(op.f(f'ix_{table}_{name}'), table_name=table)
+        op.drop_column(table, name)
+
+
+def upgrade():
+    tables = _existing_tables()
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+
+    if 'region' in tables:
+        _add_float_columns('region', CENTROID + BBOX)
+        _add_name_keys('region')
+
+    if 'district' in tables:
+        op.add_column('district', sa.Column('area_km2', sa.Float(), nullable=True))
+        _add_float_columns('district', CENTROID + BBOX)
+        _add_name_keys('district')
+
+    if 'road' in tables:
+        op.create_index(op.f('ix_road_type'), 'road', ['type'], unique=False)
+        _add_float_columns('road', BBOX)
+        _add_name_keys('road')
+
+    for table in TRANSPORT:
+        if table not in tables:
+            continue
+        # SQLite cannot add a foreign key constraint to an existing table
+        # (and does not enforce them by default), so the reference is only
+        # added on other databases
+        for name, referent in (('region_id', 'region'), ('district_id', 'district')):
+            op.add_column(table, sa.Column(name, sa.Integer(), nullable=True))
+            if not sqlite:
+                op.create_foreign_key(None, table, referent, [name], ['id'])
+            op.create_index(op.f(f'ix_{table}_{name}'), table, [name], unique=False)
+        op.add_column(table, sa.Column('region_label', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True))
+        _add_name_keys(table)
+
+    if 'road' in tables and 'district' in tables and 'roaddistrict' not in tables:
+        op.create_table(
+            'roaddistrict',
+            sa.Column('road_id', sa.Integer(), nullable=False),
+            sa.Column('district_id', sa.Integer(), nullable=False),
+            sa.Column('length_km', sa.Float(), nullable=False),
+            sa.ForeignKeyConstraint(['district_id'], ['district.id'], ),
+            sa.ForeignKeyConstraint(['road_id'], ['road.id'], ),
+            sa.PrimaryKeyConstraint('road_id', 'district_id'),
+        )
+        op.create_index(op.f('ix_roaddistrict_district_id'), 'roaddistrict', ['district_id'], unique=False)
+
+    if 'geodataversion' not in tables:
+        op.create_table(
+            'geodataversion',
+            sa.Column('table_name', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('table_name'),
+        )
+
+
+def downgrade():
+    tables = _existing_tables()
+
+    if 'geodataversion' in tables:
+        op.drop_table('geodataversion')
+
+    if 'roaddistrict' in tables:
+        op.drop_index(op.f('ix_roaddistrict_district_id'), table_name='roaddistrict')
+        op.drop_table('roaddistrict')
+
+    for table in TRANSPORT:
+        if table not in tables:
+            continue
+        _drop_indexed_columns(table, NAME_KEYS)
+        op.drop_column(table, 'region_label')
+        for name in ('district_id', 'region_id'):
+            op.drop_index(op.f(f'ix_{table}_{name}'), table_name=table)
+        # SQLite cannot drop columns with a foreign key in place; batch mode
+        # recreates the table there and drops the constraints along with them
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('district_id')
+            batch_op.drop_column('region_id')
+
+    if 'road' in tables:
+        _drop_indexed_columns('road', NAME_KEYS + BBOX)
+        op.drop_index(op.f('ix_road_type'), table_name='road')
+
+    if 'district' in tables:
+        _drop_indexed_columns('district', NAME_KEYS + CENTROID + BBOX)
+        op.drop_column('district', 'area_km2')
+
+    if 'region' in tables:
+        _drop_indexed_columns('region', NAME_KEYS + CENTROID + BBOX)
@@ -2,7 +2,7 @@ from collections.abc import Generator
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
@@ -12,6 +12,7 @@ from app.core import security
 from app.core.config import settings
 from app.core.db import engine
 from app.models import TokenPayload, User
+from app.utils.geo_index import SimplifiedGeometries
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -27,6 +28,27 @@ SessionDep = Annotated[Session, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
+def get_simplify_level(
+    zoom: int | None = Query(
+        None,
+        ge=0,
+        le=24,
+        description="Map zoom level; geometry is simplified to ~1px at this zoom",
+    ),
+    simplify: float | None = Query(
+        None, gt=0, description="Simplification tolerance in degrees"
+    ),
+) -> int | None:
+    if zoom is not None and simplify is not None:
+        raise HTTPException(
+            status_code=400, detail="Use either 'zoom' or 'simplify', not both"
+        )
+    return SimplifiedGeometries.level_for(zoom=zoom, tolerance=simplify)
+
+
+SimplifyLevelDep = Annotated[int | None, Depends(get_simplify_level)]
+
+
 def get_current_user(session: SessionDep, token: TokenDep) -> User:
     try:
         payload = jwt.decode(
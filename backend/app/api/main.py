@@ -1,7 +1,22 @@
 from fastapi import APIRouter
 
 # Geography API routes (v1) - Core Somalia Geography API
-from app.api.v1.endpoints import regions, districts, roads, transport, location_codes, places
+from app.api.v1.endpoints import (
+    districts,
+    geofence,
+    isochrone,
+    location_codes,
+    matrix,
+    nearby,
+    places,
+    regions,
+    reverse,
+    roads,
+    route,
+    search,
+    tiles,
+    transport,
+)
 from app.core.config import settings
 
 api_router = APIRouter()
@@ -10,9 +25,19 @@ api_router = APIRouter()
 api_router.include_router(regions.router, prefix="/regions", tags=["regions"])
 api_router.include_router(districts.router, prefix="/districts", tags=["districts"])
 api_router.include_router(roads.router, prefix="/roads", tags=["roads"])
-api_router.include_router(location_codes.router, prefix="/locationcode", tags=["location-codes"])
+api_router.include_router(
+    location_codes.router, prefix="/locationcode", tags=["location-codes"]
+)
 api_router.include_router(places.router, prefix="/places", tags=["places"])
 api_router.include_router(transport.router, prefix="/transport", tags=["transport"])
+api_router.include_router(reverse.router, prefix="/reverse", tags=["reverse-geocoding"])
+api_router.include_router(nearby.router, prefix="/nearby", tags=["nearby"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(tiles.router, prefix="/tiles", tags=["tiles"])
+api_router.include_router(route.router, prefix="/route", tags=["routing"])
+api_router.include_router(isochrone.router, prefix="/isochrone", tags=["routing"])
+api_router.include_router(matrix.router, prefix="/matrix", tags=["routing"])
+api_router.include_router(geofence.router, prefix="/geofence", tags=["geofence"])
 
 # Optional: Original template routes (authentication, users, etc.)
 # Include authentication routes for user management
@@ -21,27 +46,33 @@ api_router.include_router(transport.router, prefix="/transport", tags=["transpor
 # Import login routes (needed for frontend authentication)
 try:
     from app.api.routes import login
+
     api_router.include_router(login.router)
 except ImportError as e:
     import logging
+
     logger = logging.getLogger(__name__)
     logger.warning(f"Could not import login routes: {e}")
 
 # Import users routes
 try:
     from app.api.routes import users
+
     api_router.include_router(users.router)
 except ImportError as e:
     import logging
+
     logger = logging.getLogger(__name__)
     logger.warning(f"Could not import users routes: {e}")
 
 # Import utils routes
 try:
     from app.api.routes import utils
+
     api_router.include_router(utils.router)
 except ImportError as e:
     import logging
+
     logger = logging.getLogger(__name__)
     logger.warning(f"Could not import utils routes: {e}")
 
@@ -49,16 +80,19 @@ except ImportError as e:
 if settings.ENVIRONMENT == "local":
     try:
         from app.api.routes import private
+
         api_router.include_router(private.router)
     except ImportError as e:
         import logging
+
         logger = logging.getLogger(__name__)
         logger.warning(f"Could not import private routes: {e}")
 
 # Try importing items (only if Item model exists)
 try:
-    from app.models import Item
     from app.api.routes import items
+    from app.models import Item  # noqa: F401
+
     api_router.include_router(items.router)
 except ImportError:
     # Item model doesn't exist - skip items router (this is expected)
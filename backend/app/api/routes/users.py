@@ -24,15 +24,18 @@ from app.models import (
     UserUpdate,
     UserUpdateMe,
 )
+
 try:
     from app.utils import generate_new_account_email, send_email
 except ImportError:
     # Email functionality not available
-    def generate_new_account_email(*args, **kwargs):
+    def generate_new_account_email(*_args, **_kwargs):
         return None
-    def send_email(*args, **kwargs):
+
+    def send_email(*_args, **_kwargs):
         pass
 
+
 router = APIRouter(prefix="/users", tags=["users"])
 
 
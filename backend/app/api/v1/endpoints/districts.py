@@ -1,38 +1,126 @@
-from typing import Any
+from typing import Any, Literal
+
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select, func
+from fastapi.responses import JSONResponse
+from sqlalchemy import false
+from sqlmodel import Session, col, func, select
 
 from app import models
 from app.api import deps
+from app.utils.geo_index import get_admin_index, simplified_districts
+from app.utils.geometry import parse_bbox, parse_lat_lon
+from app.utils.spatial_db import bbox_conditions, contains_point_conditions
+from app.utils.topojson import district_topology
 
 router = APIRouter()
 
 
-@router.get("/", response_model=models.DistrictsPublic)
+@router.get(
+    "/",
+    response_model=models.DistrictsPublic,
+    responses={
+        200: {
+            "content": {"application/json": {}},
+            "description": "Districts, or a TopoJSON Topology with format=topojson",
+        }
+    },
+)
 def read_districts(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
     region: str | None = Query(None, description="Filter by region name"),
+    bbox: str | None = Query(
+        None, description="Filter by bounding box: 'minLon,minLat,maxLon,maxLat'"
+    ),
+    contains: str | None = Query(
+        None, description="Filter to the district containing a point: 'lat,lon'"
+    ),
+    simplify_level: deps.SimplifyLevelDep = None,
+    format: Literal["json", "topojson"] = Query(
+        "json", description="Response format: 'json' or 'topojson'"
+    ),
 ) -> Any:
     """
     Retrieve districts.
+    Filter by bbox: districts whose bounding box intersects the box
+    Filter by contains: the district containing the point
+    Both filters run on the spatial index of a PostGIS/SpatiaLite database when
+    available, else on the precomputed bbox columns and the in-memory index.
+    Pass 'zoom' (or 'simplify' tolerance) to get precomputed simplified boundaries.
+    With format=topojson, boundaries are returned as a TopoJSON Topology whose
+    shared borders are stored once; simplification is then applied to the
+    shared arcs so neighbouring districts stay seamless.
     """
     # Build query
     query = select(models.District)
-    count_query = select(func.count(models.District.id))
-    
+    count_query = select(func.count(col(models.District.id)))
+
     if region:
         query = query.where(models.District.region_name == region)
         count_query = count_query.where(models.District.region_name == region)
 
+    if bbox:
+        try:
+            min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid bbox '{bbox}': {e}")
+        overlaps = bbox_conditions(
+            db, models.District, (min_lon, min_lat, max_lon, max_lat)
+        )
+        query = query.where(*overlaps)
+        count_query = count_query.where(*overlaps)
+
+    if contains:
+        try:
+            lat, lon = parse_lat_lon(contains)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid point '{contains}': {e}"
+            )
+        containing = contains_point_conditions(db, models.District, lon, lat)
+        if containing is None:
+            match = get_admin_index(db).locate(lon, lat).district
+            containing = (
+                models.District.id == match.id if match is not None else false(),
+            )
+        query = query.where(*containing)
+        count_query = count_query.where(*containing)
+
     # Get total count
     total_count = db.exec(count_query).one()
-    
+
     # Get paginated results
     districts = db.exec(query.offset(skip).limit(limit)).all()
-    
-    return models.DistrictsPublic(data=districts, count=total_count)
+
+    if format == "topojson":
+        topology = district_topology.get(db).to_topojson(
+            "districts",
+            [
+                (
+                    district.id,
+                    models.DistrictPublic.model_validate(district).model_dump(
+                        exclude={"geometry"}
+                    ),
+                )
+                for district in districts
+            ],
+            level=simplify_level,
+        )
+        topology["count"] = total_count
+        return JSONResponse(topology)
+
+    data = [models.DistrictPublic.model_validate(district) for district in districts]
+    if simplify_level is not None:
+        simplified = simplified_districts.get(db)
+        data = [
+            district.model_copy(
+                update={"geometry": simplified.get(district.id, simplify_level)}
+            )
+            for district in data
+        ]
+
+    return models.DistrictsPublic(data=data, count=total_count)
 
 
 @router.get("/{district_id}", response_model=models.DistrictPublic)
@@ -51,6 +139,6 @@ def read_district(
         available_ids = [str(d) for d in available_districts[:10]]
         raise HTTPException(
             status_code=404,
-            detail=f"District '{district_id}' not found. Available district IDs: {', '.join(available_ids)}"
+            detail=f"District '{district_id}' not found. Available district IDs: {', '.join(available_ids)}",
         )
     return district
@@ -0,0 +1,139 @@
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+from app import models
+from app.api import deps
+from app.utils.geo_index import get_admin_index
+from app.utils.geofence import GeofenceTracker
+
+router = APIRouter()
+
+NDJSON = "application/x-ndjson"
+
+# Longest accepted record; a longer line is reported and skipped
+MAX_LINE_BYTES = 4096
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body iterator reads the request body.
+
+    ``StreamingResponse`` listens for client disconnects by calling
+    ``receive`` alongside the body iterator, which would steal request body
+    messages from ``request.stream()``. Here only the iterator receives; a
+    disconnect ends the request stream (``ClientDisconnect``) instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except (ClientDisconnect, OSError):
+            return
+        if self.background is not None:
+            await self.background()
+
+
+@router.post(
+    "/stream",
+    response_class=DuplexStreamingResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {NDJSON: {"schema": models.GeofencePing.model_json_schema()}},
+        }
+    },
+    responses={
+        200: {"content": {NDJSON: {"schema": models.GeofenceEvent.model_json_schema()}}}
+    },
+)
+def geofence_stream(
+    *,
+    request: Request,
+    db: Session = Depends(deps.get_db),
+) -> Any:
+    """
+    Stream district/region enter and exit events for a stream of GPS pings.
+
+    The request body is newline-delimited JSON, one {id, lat, lon, ts} record
+    per line, and may be sent incrementally (chunked upload). Each line is
+    answered as soon as its chunk arrives with zero or more NDJSON events
+    {id, event: enter|exit, level: district|region, area_id, code, name,
+    lat, lon, ts}. The last known district/region of every id is kept for
+    the duration of the stream, so only changes are reported; the first
+    ping of an id reports the areas it starts in. Invalid lines produce an
+    {"error", "line"} record and are skipped.
+    """
+    tracker = GeofenceTracker(get_admin_index(db))
+    line_number = 0
+
+    async def handle(lines: list[bytes]) -> bytes:
+        nonlocal line_number
+        output: list[bytes] = []
+        pings: list[models.GeofencePing] = []
+        for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            if len(line) > MAX_LINE_BYTES:
+                error = f"line longer than {MAX_LINE_BYTES} bytes"
+            else:
+                try:
+                    pings.append(models.GeofencePing.model_validate_json(line))
+                    continue
+                except ValidationError as e:
+                    error = "; ".join(
+                        f"{'.'.join(str(loc) for loc in err['loc']) or 'record'}: {err['msg']}"
+                        for err in e.errors()
+                    )
+            # Report the error after the events of the valid pings before it
+            if pings:
+                output.extend(await _process(tracker, pings))
+                pings = []
+            output.append(
+                json.dumps({"error": error, "line": line_number}).encode() + b"\n"
+            )
+        if pings:
+            output.extend(await _process(tracker, pings))
+        return b"".join(output)
+
+    async def events() -> AsyncIterator[bytes]:
+        buffer = b""
+        discarding = False
+        async for chunk in request.stream():
+            if discarding:
+                # Skip the rest of an over-long line (already reported)
+                newline = chunk.find(b"\n")
+                if newline < 0:
+                    continue
+                chunk = chunk[newline + 1 :]
+                discarding = False
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            if len(buffer) > MAX_LINE_BYTES:
+                lines.append(buffer)
+                buffer = b""
+                discarding = True
+            if lines and (output := await handle(lines)):
+                yield output
+        # Last record without a trailing newline
+        if buffer and (output := await handle([buffer])):
+            yield output
+
+    return DuplexStreamingResponse(events(), media_type=NDJSON)
+
+
+async def _process(
+    tracker: GeofenceTracker, pings: list[models.GeofencePing]
+) -> list[bytes]:
+    """Run a batch through the tracker off the event loop and encode its events."""
+    events = await run_in_threadpool(tracker.update, pings)
+    return [event.model_dump_json().encode() + b"\n" for event in events]
@@ -0,0 +1,76 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+
+from app import models
+from app.api import deps
+from app.utils.geometry import convex_hull
+from app.utils.road_graph import MAX_SNAP_KM, get_road_graph
+
+router = APIRouter()
+
+MAX_ISOCHRONE_MINUTES = 600
+MAX_ISOCHRONE_COUNT = 10
+
+
+@router.get("/", response_model=models.IsochronesPublic)
+def read_isochrones(
+    *,
+    db: Session = Depends(deps.get_db),
+    lat: float = Query(..., ge=-90, le=90, description="Latitude (-90 to 90)"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude (-180 to 180)"),
+    minutes: str = Query(
+        "30,60,120", description="Comma-separated travel times in minutes"
+    ),
+) -> Any:
+    """
+    Find the area reachable by road from a point within each travel time.
+    Travel times use assumed speeds per road type and surface; each area is
+    the convex hull of the reachable part of the road network.
+    """
+    try:
+        limits = sorted({float(m) for m in minutes.split(",")})
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid minutes '{minutes}': expected comma-separated numbers, e.g. 30,60,120",
+        )
+    if (
+        not limits
+        or len(limits) > MAX_ISOCHRONE_COUNT
+        or not all(0 < m <= MAX_ISOCHRONE_MINUTES for m in limits)
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid minutes '{minutes}': give 1 to {MAX_ISOCHRONE_COUNT} values between 0 and {MAX_ISOCHRONE_MINUTES}",
+        )
+
+    graph = get_road_graph(db)
+    start = graph.snap(lon, lat)
+    if start is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No road found within {MAX_SNAP_KM:g} km of ({lat}, {lon})",
+        )
+
+    isochrones = []
+    for reach in graph.reachable(start, [m / 60 for m in limits]):
+        ring = convex_hull(reach.points)
+        isochrones.append(
+            models.Isochrone(
+                minutes=round(reach.hours * 60, 3),
+                road_km=round(reach.road_km, 3),
+                geometry={"type": "Polygon", "coordinates": [[list(p) for p in ring]]}
+                if len(ring) >= 4
+                else None,
+            )
+        )
+
+    return models.IsochronesPublic(
+        lat=lat,
+        lon=lon,
+        snap_distance_km=round(start.distance_km, 3),
+        data=isochrones,
+        count=len(isochrones),
+    )
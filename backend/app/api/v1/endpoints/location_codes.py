@@ -1,9 +1,12 @@
 from typing import Any
-from fastapi import APIRouter, HTTPException, Query
-from openlocationcode import openlocationcode as olc
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
 
 from app import models
-from app.utils.olc_helper import generate_somalia_olc, decode_somalia_olc
+from app.api import deps
+from app.utils.olc_grid import get_olc_grid
+from app.utils.olc_helper import decode_somalia_olc, generate_somalia_olc
 
 router = APIRouter()
 
@@ -11,28 +14,35 @@ router = APIRouter()
 @router.get("/generate", response_model=models.LocationCodeResponse)
 def generate_location_code(
     *,
+    db: Session = Depends(deps.get_db),
     lat: float = Query(..., ge=-90, le=90, description="Latitude (-90 to 90)"),
     lon: float = Query(..., ge=-180, le=180, description="Longitude (-180 to 180)"),
 ) -> Any:
     """
     Generate Open Location Code for given coordinates.
     Returns Somalia-specific location code with region prefix if available.
+    The region is resolved from a precomputed OLC cell grid over the loaded
+    region/district boundaries.
     """
+    grid = get_olc_grid(db)
+    # Fall back to the built-in approximate boxes when no boundaries are loaded
+    region_lookup = None if grid.is_empty else grid.region_code
+
     try:
         # Generate Somalia-specific OLC with region prefix
-        code = generate_somalia_olc(lat, lon)
-        
+        code = generate_somalia_olc(lat, lon, region_lookup=region_lookup)
+
         # Decode to get center coordinates
         decoded = decode_somalia_olc(code)
-        
+
         # Extract region code if present
         region_code = decoded.get("region_code")
-        
+
         return models.LocationCodeResponse(
             code=code,
             latitude_center=decoded["latitude_center"],
             longitude_center=decoded["longitude_center"],
-            region_code=region_code
+            region_code=region_code,
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid coordinates: {str(e)}")
@@ -41,7 +51,9 @@ def generate_location_code(
 @router.get("/resolve", response_model=models.LocationCodeResponse)
 def resolve_location_code(
     *,
-    code: str = Query(..., description="Open Location Code (e.g., '8FJ53+PM' or 'SOM-BNR:8FJ53+PM')"),
+    code: str = Query(
+        ..., description="Open Location Code (e.g., '8FJ53+PM' or 'SOM-BNR:8FJ53+PM')"
+    ),
 ) -> Any:
     """
     Resolve Open Location Code to coordinates.
@@ -49,12 +61,12 @@ def resolve_location_code(
     """
     try:
         decoded = decode_somalia_olc(code)
-        
+
         return models.LocationCodeResponse(
             code=code,
             latitude_center=decoded["latitude_center"],
             longitude_center=decoded["longitude_center"],
-            region_code=decoded.get("region_code")
+            region_code=decoded.get("region_code"),
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid location code: {str(e)}")
@@ -0,0 +1,173 @@
+from typing import Any
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel import Session, col, select
+
+from app import models
+from app.api import deps
+from app.utils.geometry import haversine_km_array
+from app.utils.road_graph import get_road_graph
+
+router = APIRouter()
+
+# Road distances run one graph search per point on the smaller side
+MAX_ROAD_MATRIX_SOURCES = 50
+
+
+def _resolve_points(
+    db: Session, points: list[models.MatrixPoint], side: str
+) -> list[models.MatrixLocation]:
+    """Turn coordinates, district codes and transport references into locations."""
+    codes = {p.district_code for p in points if p.district_code}
+    # Precomputed centroid columns only; the geometry is never loaded
+    districts: dict[str, tuple[str, float | None, float | None]] = (
+        {
+            code: (name, lat, lon)
+            for code, name, lat, lon in db.exec(
+                select(
+                    models.District.code,
+                    models.District.name,
+                    models.District.centroid_lat,
+                    models.District.centroid_lon,
+                ).where(col(models.District.code).in_(codes))
+            ).all()
+        }
+        if codes
+        else {}
+    )
+    facilities: dict[tuple[str, int], tuple[str, float, float]] = {}
+    for kind, table in models.TRANSPORT_KINDS.items():
+        ids = {
+            p.transport_id
+            for p in points
+            if (p.transport_kind or "").lower() == kind and p.transport_id is not None
+        }
+        if ids:
+            for facility_id, name, lat, lon in db.exec(
+                select(table.id, table.name, table.latitude, table.longitude).where(
+                    col(table.id).in_(ids)
+                )
+            ).all():
+                facilities[(kind, facility_id)] = (name, lat, lon)
+
+    locations = []
+    for i, point in enumerate(points):
+        given = [
+            point.lat is not None or point.lon is not None,
+            point.district_code is not None,
+            point.transport_kind is not None or point.transport_id is not None,
+        ]
+        if sum(given) != 1:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{side}[{i}]: give exactly one of lat/lon, district_code or transport_kind/transport_id",
+            )
+        if given[0]:
+            if point.lat is None or point.lon is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{side}[{i}]: both lat and lon are required",
+                )
+            locations.append(models.MatrixLocation(lat=point.lat, lon=point.lon))
+        elif given[1]:
+            district = districts.get(point.district_code or "")
+            if district is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"{side}[{i}]: district '{point.district_code}' not found",
+                )
+            name, centroid_lat, centroid_lon = district
+            if centroid_lat is None or centroid_lon is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"{side}[{i}]: district '{point.district_code}' has no centroid",
+                )
+            locations.append(
+                models.MatrixLocation(lat=centroid_lat, lon=centroid_lon, name=name)
+            )
+        else:
+            kind = (point.transport_kind or "").lower()
+            if kind not in models.TRANSPORT_KINDS or point.transport_id is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{side}[{i}]: transport_kind must be 'airport', 'port' or 'checkpoint' with a transport_id",
+                )
+            facility = facilities.get((kind, point.transport_id))
+            if facility is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"{side}[{i}]: {kind} {point.transport_id} not found",
+                )
+            name, lat, lon = facility
+            locations.append(models.MatrixLocation(lat=lat, lon=lon, name=name))
+    return locations
+
+
+def _to_rows(values: np.ndarray, digits: int) -> list[list[float | None]]:
+    return [
+        [round(float(v), digits) if np.isfinite(v) else None for v in row]
+        for row in values
+    ]
+
+
+@router.post("/", response_model=models.MatrixResponse)
+def create_matrix(
+    *,
+    db: Session = Depends(deps.get_db),
+    body: models.MatrixRequest,
+) -> Any:
+    """
+    Compute distances between every origin and every destination.
+    Locations are coordinates, district codes (district centroid) or
+    transport facilities. Great-circle distances are always returned; with
+    road=true, the length and duration of the fastest road route are added
+    (null where a point is off the network or unreachable).
+    """
+    origins = _resolve_points(db, body.origins, "origins")
+    destinations = _resolve_points(db, body.destinations, "destinations")
+
+    origin_lats = np.array([p.lat for p in origins])
+    origin_lons = np.array([p.lon for p in origins])
+    destination_lats = np.array([p.lat for p in destinations])
+    destination_lons = np.array([p.lon for p in destinations])
+    great_circle = haversine_km_array(
+        origin_lats[:, None],
+        origin_lons[:, None],
+        destination_lats[None, :],
+        destination_lons[None, :],
+    )
+    response = models.MatrixResponse(
+        origins=origins,
+        destinations=destinations,
+        great_circle_km=np.round(great_circle, 3).tolist(),
+    )
+
+    if body.road:
+        if min(len(origins), len(destinations)) > MAX_ROAD_MATRIX_SOURCES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Road distances need at most {MAX_ROAD_MATRIX_SOURCES} origins or destinations",
+            )
+        graph = get_road_graph(db)
+        origin_snaps = [graph.snap(p.lon, p.lat) for p in origins]
+        destination_snaps = [graph.snap(p.lon, p.lat) for p in destinations]
+        rows = [i for i, snap in enumerate(origin_snaps) if snap is not None]
+        cols = [j for j, snap in enumerate(destination_snaps) if snap is not None]
+        sources = [snap for snap in origin_snaps if snap is not None]
+        targets = [snap for snap in destination_snaps if snap is not None]
+
+        # Roads are undirected: search from whichever side is smaller
+        if len(targets) < len(sources):
+            hours, km = (m.T for m in graph.route_costs(targets, sources))
+        else:
+            hours, km = graph.route_costs(sources, targets)
+
+        road_hours = np.full(great_circle.shape, np.inf)
+        road_km = np.full(great_circle.shape, np.inf)
+        road_hours[np.ix_(rows, cols)] = hours
+        road_km[np.ix_(rows, cols)] = km
+        response.road_km = _to_rows(road_km, 3)
+        response.road_minutes = _to_rows(road_hours * 60, 1)
+
+    return response
@@ -0,0 +1,112 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+
+from app import crud, models
+from app.api import deps
+from app.utils.geo_index import get_admin_index, get_road_index, get_transport_index
+
+router = APIRouter()
+
+MAX_NEARBY_RADIUS_KM = 200
+
+# layer name -> transport kind
+POINT_LAYERS = {"airports": "airport", "ports": "port", "checkpoints": "checkpoint"}
+NEARBY_LAYERS = ("roads", *POINT_LAYERS, "districts")
+
+
+@router.get("/", response_model=models.NearbyPublic)
+def read_nearby(
+    *,
+    db: Session = Depends(deps.get_db),
+    lat: float = Query(..., ge=-90, le=90, description="Latitude (-90 to 90)"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude (-180 to 180)"),
+    radius_km: float = Query(
+        10, gt=0, le=MAX_NEARBY_RADIUS_KM, description="Search radius in km"
+    ),
+    layers: str = Query(
+        ",".join(NEARBY_LAYERS),
+        description=f"Comma-separated layers: {', '.join(NEARBY_LAYERS)}",
+    ),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Maximum number of features to return"
+    ),
+) -> Any:
+    """
+    Find roads, airports, ports, checkpoints and districts within a radius of
+    a point, in one call, closest first.
+
+    Answered from the in-memory spatial indexes: distances are great-circle
+    km to facilities, and km to the closest point of a road or district
+    boundary (0 for the district containing the point).
+    """
+    requested = [layer.strip().lower() for layer in layers.split(",") if layer.strip()]
+    unknown = sorted(set(requested) - set(NEARBY_LAYERS))
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid layers '{layers}'. Must be a comma-separated subset of: {', '.join(NEARBY_LAYERS)}",
+        )
+
+    features: list[models.NearbyFeature] = []
+    if "roads" in requested:
+        index = get_road_index(db)
+        positions, distances = index.within(lon, lat, radius_km)
+        features.extend(
+            models.NearbyFeature(
+                layer="roads",
+                id=int(index.ids[position]),
+                name=index.names[position],
+                type=index.types[position],
+                distance_km=round(distance, 3),
+            )
+            for position, distance in zip(
+                positions.tolist(), distances.tolist(), strict=True
+            )
+        )
+
+    for layer, kind in POINT_LAYERS.items():
+        if layer not in requested:
+            continue
+        table = models.TRANSPORT_KINDS[kind]
+        within = get_transport_index(db, kind).within(lat, lon, radius_km)
+        if not within:
+            continue
+        rows = crud.get_facilities_by_id(db, table, [id_ for id_, _ in within])
+        features.extend(
+            models.NearbyFeature(
+                layer=layer,
+                id=row.id,
+                name=row.name,
+                type=row.type,
+                latitude=row.latitude,
+                longitude=row.longitude,
+                distance_km=round(distance_km, 3),
+            )
+            for id_, distance_km in within
+            if (row := rows.get(id_)) is not None
+        )
+
+    if "districts" in requested:
+        features.extend(
+            models.NearbyFeature(
+                layer="districts",
+                id=district.id,
+                name=district.name,
+                code=district.code,
+                distance_km=round(distance_km, 3),
+            )
+            for district, distance_km in get_admin_index(db).districts_within(
+                lon, lat, radius_km
+            )
+        )
+
+    features.sort(key=lambda feature: feature.distance_km)
+    return models.NearbyPublic(
+        lat=lat,
+        lon=lon,
+        radius_km=radius_km,
+        data=features[:limit],
+        count=len(features),
+    )
@@ -1,13 +1,26 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select, or_
-from sqlalchemy import func
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session, col, select
 
 from app import models
 from app.api import deps
+from app.core.config import settings
+from app.utils.place_fts import get_place_speller, search_place_fts
+from app.utils.place_search import (
+    PlaceEntry,
+    district_entry,
+    get_autocompleter,
+    get_place_index,
+    match_name_keys,
+    region_entry,
+)
 
 router = APIRouter()
 
+# Spelling suggestions returned with /places/search results
+MAX_SUGGESTIONS = 5
+
 
 @router.get("/search", response_model=models.PlacesSearchResponse)
 def search_places(
@@ -18,71 +31,116 @@ def search_places(
 ) -> Any:
     """
     Search for places (districts and regions) by name with fuzzy matching.
-    Searches in district names, region names, and aliases.
+    Searches in district names, region names, and aliases; districts also
+    match on the name of their region, ranked below the region itself.
+    Somali and English spellings of a name (Muqdisho/Mogadishu,
+    Kismaayo/Kismayo, Xamar/Hamar) are exact hits on the indexed name key
+    columns and come first. Other matches are served from an in-memory
+    trigram index, so misspellings still match; results are ordered by
+    similarity score, then population.
+    Names within one edit per four characters of the query (at most two)
+    match too, and are returned as ``suggestions`` with their edit distance.
+    With PLACE_SEARCH_BACKEND=fts, other matches are served from the
+    loader's SQLite FTS5 table instead (word prefix matches ranked by bm25,
+    no score) and suggestions come from a spelling dictionary of the names
+    and aliases, without building the in-memory index; a query without FTS
+    hits is retried with the closest suggestion.
     """
-    name_lower = name.lower()
-    results = []
-    seen_ids = set()
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
 
-    # Search in districts - match by name or region name
-    districts = db.exec(
-        select(models.District).where(
-            or_(
-                func.lower(models.District.name).contains(name_lower),
-                func.lower(models.District.region_name).contains(name_lower),
-            )
-        ).limit(limit * 2)  # Get more to account for alias filtering
-    ).all()
+    matches: list[tuple[PlaceEntry, float | None]] = list(match_name_keys(db, name))
+    fuzzy: list[tuple[PlaceEntry, float | None]] | None = None
+    corrections: list[tuple[str, int]] = []
+    if settings.PLACE_SEARCH_BACKEND == "fts":
+        fuzzy = _search_fts(db, name, limit + len(matches))
+        if fuzzy is not None:
+            corrections = get_place_speller(db).corrections(name)
+        if fuzzy == [] and corrections:
+            fuzzy = _search_fts(db, corrections[0][0], limit + len(matches))
+    if fuzzy is None:
+        hits, corrections = get_place_index(db).search_with_corrections(
+            name, limit + len(matches)
+        )
+        fuzzy = list(hits)
+    corrections = corrections[:MAX_SUGGESTIONS]
+    seen = {(entry.kind, entry.id) for entry, _ in matches}
+    matches.extend(match for match in fuzzy if (match[0].kind, match[0].id) not in seen)
+    # Stable: key hits stay ahead of unscored FTS matches
+    matches.sort(key=lambda match: -(match[1] or 0))
+    matches = matches[:limit]
 
-    for district in districts:
-        # Check if name matches district name, region name, or any alias
-        matches = (
-            name_lower in district.name.lower() or
-            name_lower in district.region_name.lower()
+    results = [
+        models.PlaceSearchResult(
+            id=entry.code or str(entry.id),
+            name=entry.name,
+            region=entry.region or entry.name,
+            type=entry.kind,
+            aliases=entry.aliases,
+            centroid=entry.centroid,
+            population=entry.population,
+            score=score,
         )
-        
-        # Also check aliases
-        aliases = district.aliases or []
-        if not matches:
-            matches = any(name_lower in alias.lower() for alias in aliases)
+        for entry, score in matches
+    ]
+    suggestions = [
+        models.PlaceSpellingSuggestion(text=text, distance=distance)
+        for text, distance in corrections
+    ]
+    return models.PlacesSearchResponse(
+        data=results, count=len(results), suggestions=suggestions
+    )
 
-        if matches:
-            district_id = district.code or f"SOM-{district.region_name[:3].upper()}-{district.name[:3].upper()}"
-            if district_id not in seen_ids:
-                result = models.PlaceSearchResult(
-                    id=district_id,
-                    name=district.name,
-                    region=district.region_name,
-                    type="district",
-                    aliases=district.aliases,
-                    centroid=district.centroid,
-                    population=district.population,
-                )
-                results.append(result)
-                seen_ids.add(district_id)
-                
-                if len(results) >= limit:
-                    break
 
-    # Also search in regions if we haven't reached the limit
-    if len(results) < limit:
-        regions = db.exec(
-            select(models.Region).where(
-                func.lower(models.Region.name).contains(name_lower)
-            ).limit(limit - len(results))
+def _search_fts(
+    db: Session, name: str, limit: int
+) -> list[tuple[PlaceEntry, float | None]] | None:
+    """Places from the FTS5 index in rank order; None if it is missing."""
+    hits = search_place_fts(db, name, limit, kinds=("district", "region"))
+    if hits is None:
+        return None
+    ids = {
+        kind: [id_ for k, id_ in hits if k == kind] for kind in ("district", "region")
+    }
+    entries = {
+        ("district", row.id): district_entry(row)
+        for row in db.exec(
+            select(models.District).where(col(models.District.id).in_(ids["district"]))
         ).all()
+    }
+    entries.update(
+        (("region", row.id), region_entry(row))
+        for row in db.exec(
+            select(models.Region).where(col(models.Region.id).in_(ids["region"]))
+        ).all()
+    )
+    return [(entries[hit], None) for hit in hits if hit in entries]
 
-        for region in regions:
-            if region.code not in seen_ids:
-                result = models.PlaceSearchResult(
-                    id=region.code,
-                    name=region.name,
-                    region=region.name,
-                    type="region",
-                    centroid=None,  # Could calculate from geometry
-                    population=region.population,
-                )
-                results.append(result)
-                seen_ids.add(region.code)
 
-    return models.PlacesSearchResponse(data=results, count=len(results))
+@router.get("/autocomplete", response_model=models.PlaceAutocompleteResponse)
+def autocomplete_places(
+    *,
+    db: Session = Depends(deps.get_db),
+    q: str = Query(..., min_length=1, description="Prefix typed so far"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+) -> Any:
+    """
+    Complete a partly typed name: regions, districts (and their aliases),
+    airports and named roads with a word starting with the prefix.
+    Regions come first, then districts, airports and roads; within a type,
+    by population, road count, or airport type. Served from an in-memory
+    sorted key array (binary search), cheap enough for every keystroke.
+    """
+    suggestions = [
+        models.PlaceSuggestion(
+            text=completion.text,
+            type=completion.kind,
+            id=completion.id,
+            name=completion.name,
+            region=completion.region,
+        )
+        for completion in get_autocompleter(db).complete(q, limit)
+    ]
+    return models.PlaceAutocompleteResponse(
+        query=q, data=suggestions, count=len(suggestions)
+    )
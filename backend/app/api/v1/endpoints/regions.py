@@ -1,29 +1,120 @@
-from typing import Any
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select, func
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy import false
+from sqlmodel import Session, col, func, select
 
 from app import models
 from app.api import deps
+from app.utils.geo_index import get_admin_index, simplified_regions
+from app.utils.geometry import parse_bbox, parse_lat_lon
+from app.utils.spatial_db import bbox_conditions, contains_point_conditions
+from app.utils.topojson import region_topology
 
 router = APIRouter()
 
 
-@router.get("/", response_model=models.RegionsPublic)
+@router.get(
+    "/",
+    response_model=models.RegionsPublic,
+    responses={
+        200: {
+            "content": {"application/json": {}},
+            "description": "Regions, or a TopoJSON Topology with format=topojson",
+        }
+    },
+)
 def read_regions(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    bbox: str | None = Query(
+        None, description="Filter by bounding box: 'minLon,minLat,maxLon,maxLat'"
+    ),
+    contains: str | None = Query(
+        None, description="Filter to the region containing a point: 'lat,lon'"
+    ),
+    simplify_level: deps.SimplifyLevelDep = None,
+    format: Literal["json", "topojson"] = Query(
+        "json", description="Response format: 'json' or 'topojson'"
+    ),
 ) -> Any:
     """
     Retrieve regions.
+    Filter by bbox: regions whose bounding box intersects the box
+    Filter by contains: the region containing the point
+    Both filters run on the spatial index of a PostGIS/SpatiaLite database when
+    available, else on the precomputed bbox columns and the in-memory index.
+    Pass 'zoom' (or 'simplify' tolerance) to get precomputed simplified boundaries.
+    With format=topojson, boundaries are returned as a TopoJSON Topology whose
+    shared borders are stored once; simplification is then applied to the
+    shared arcs so neighbouring regions stay seamless.
     """
+    query = select(models.Region)
+    count_query = select(func.count(col(models.Region.id)))
+
+    if bbox:
+        try:
+            min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid bbox '{bbox}': {e}")
+        overlaps = bbox_conditions(
+            db, models.Region, (min_lon, min_lat, max_lon, max_lat)
+        )
+        query = query.where(*overlaps)
+        count_query = count_query.where(*overlaps)
+
+    if contains:
+        try:
+            lat, lon = parse_lat_lon(contains)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid point '{contains}': {e}"
+            )
+        containing = contains_point_conditions(db, models.Region, lon, lat)
+        if containing is None:
+            match = get_admin_index(db).locate(lon, lat).region
+            containing = (
+                models.Region.id == match.id if match is not None else false(),
+            )
+        query = query.where(*containing)
+        count_query = count_query.where(*containing)
+
     # Get total count
-    total_count = db.exec(select(func.count(models.Region.id))).one()
-    
+    total_count = db.exec(count_query).one()
+
     # Get paginated results
-    regions = db.exec(select(models.Region).offset(skip).limit(limit)).all()
-    
-    return models.RegionsPublic(data=regions, count=total_count)
+    regions = db.exec(query.offset(skip).limit(limit)).all()
+
+    if format == "topojson":
+        topology = region_topology.get(db).to_topojson(
+            "regions",
+            [
+                (
+                    region.id,
+                    models.RegionPublic.model_validate(region).model_dump(
+                        exclude={"geometry"}
+                    ),
+                )
+                for region in regions
+            ],
+            level=simplify_level,
+        )
+        topology["count"] = total_count
+        return JSONResponse(topology)
+
+    data = [models.RegionPublic.model_validate(region) for region in regions]
+    if simplify_level is not None:
+        simplified = simplified_regions.get(db)
+        data = [
+            region.model_copy(
+                update={"geometry": simplified.get(region.id, simplify_level)}
+            )
+            for region in data
+        ]
+
+    return models.RegionsPublic(data=data, count=total_count)
 
 
 @router.get("/{region_id}", response_model=models.RegionPublic)
@@ -42,6 +133,6 @@ def read_region(
         available_ids = [str(r) for r in available_regions[:10]]
         raise HTTPException(
             status_code=404,
-            detail=f"Region '{region_id}' not found. Available region IDs: {', '.join(available_ids)}"
+            detail=f"Region '{region_id}' not found. Available region IDs: {', '.join(available_ids)}",
         )
     return region
@@ -0,0 +1,73 @@
+from typing import Any
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+
+from app import models
+from app.api import deps
+from app.utils.geo_index import get_admin_index
+
+router = APIRouter()
+
+
+@router.get("/", response_model=models.ReverseGeocodeResponse)
+def reverse_geocode(
+    *,
+    db: Session = Depends(deps.get_db),
+    lat: float = Query(..., ge=-90, le=90, description="Latitude (-90 to 90)"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude (-180 to 180)"),
+) -> Any:
+    """
+    Find the district and region containing the given coordinates.
+    Uses an in-memory spatial index over district and region boundaries.
+    """
+    match = get_admin_index(db).locate(lon, lat)
+    if match.district is None and match.region is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No district or region found at ({lat}, {lon}). Coordinates may be outside Somalia.",
+        )
+
+    return models.ReverseGeocodeResponse(
+        lat=lat,
+        lon=lon,
+        district_id=match.district.id if match.district else None,
+        district_code=match.district.code if match.district else None,
+        district_name=match.district.name if match.district else None,
+        region_id=match.region.id if match.region else None,
+        region_code=match.region.code if match.region else None,
+        region_name=match.region.name if match.region else None,
+    )
+
+
+@router.post("/batch", response_model=models.ReverseGeocodeBatchResponse)
+def reverse_geocode_batch(
+    *,
+    db: Session = Depends(deps.get_db),
+    body: models.ReverseGeocodeBatchRequest,
+) -> Any:
+    """
+    Find the containing district and region for many points in one call.
+    Points are given as [lon, lat] pairs; codes are returned in the same order
+    (null where a point falls outside all districts/regions).
+    """
+    if not body.points:
+        return models.ReverseGeocodeBatchResponse(
+            district_codes=[], region_codes=[], count=0
+        )
+
+    coords = np.asarray(body.points, dtype=np.float64)
+    lons, lats = coords[:, 0], coords[:, 1]
+    if np.any(np.abs(lats) > 90) or np.any(np.abs(lons) > 180):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid coordinates: points must be [lon, lat] with lon in -180..180 and lat in -90..90",
+        )
+
+    matches = get_admin_index(db).locate_many(lons, lats)
+    return models.ReverseGeocodeBatchResponse(
+        district_codes=[m.district.code if m.district else None for m in matches],
+        region_codes=[m.region.code if m.region else None for m in matches],
+        count=len(matches),
+    )
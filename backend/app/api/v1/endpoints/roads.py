@@ -1,53 +1,222 @@
 from typing import Any
+
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select, func
+from sqlmodel import Session, col, func, or_, select
+from sqlmodel.sql.expression import SelectOfScalar
 
 from app import models
 from app.api import deps
+from app.utils.geo_index import get_road_index
+from app.utils.geometry import BBox, parse_bbox
+from app.utils.spatial_db import bbox_conditions, intersects_conditions
 
 router = APIRouter()
 
 
+def _parse_bbox(bbox: str) -> BBox:
+    try:
+        return parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid bbox '{bbox}': {e}")
+
+
+def _parse_type(type: str) -> str:
+    if type.lower() not in ["primary", "secondary"]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid type '{type}'. Must be 'primary' or 'secondary'",
+        )
+    return type.lower()
+
+
 @router.get("/", response_model=models.RoadsPublic)
 def read_roads(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-    district: str | None = Query(None, description="Filter by district name"),
-    type: str | None = Query(None, description="Filter by road type: 'primary' or 'secondary'"),
+    district: str | None = Query(None, description="Filter by district name or code"),
+    type: str | None = Query(
+        None, description="Filter by road type: 'primary' or 'secondary'"
+    ),
+    bbox: str | None = Query(
+        None, description="Filter by bounding box: 'minLon,minLat,maxLon,maxLat'"
+    ),
+    exact: bool = Query(
+        True,
+        description="Match road segments against the bbox, not just road bounding boxes",
+    ),
 ) -> Any:
     """
     Retrieve roads.
     Filter by type: 'primary' or 'secondary'
-    Note: District filtering not yet implemented (requires spatial queries).
+    Filter by district: roads passing through the district (precomputed road/district links)
+    Filter by bbox: roads with at least one segment inside the box; with
+    exact=false, roads whose bounding box intersects the box. Both run on the
+    spatial index of a PostGIS/SpatiaLite database when available, else on
+    the in-memory road index and the precomputed bbox columns.
     """
     # Build query
     query = select(models.Road)
-    count_query = select(func.count(models.Road.id))
-    
+    count_query = select(func.count(col(models.Road.id)))
+
+    if bbox:
+        box = _parse_bbox(bbox)
+        conditions = (
+            intersects_conditions(db, models.Road, box)
+            if exact
+            else bbox_conditions(db, models.Road, box)
+        )
+        if conditions is None:
+            # No spatial database: match segments with the in-memory index
+            return _read_roads_in_index(db, box, exact, district, type, skip, limit)
+        query = query.where(*conditions).order_by(col(models.Road.id))
+        count_query = count_query.where(*conditions)
+
     # Apply filters
     if district:
-        district_str = str(district) if district else None
-        if district_str:
-            query = query.where(models.Road.name.contains(district_str))
-            count_query = count_query.where(models.Road.name.contains(district_str))
-    
+        district_road_ids = _district_road_ids(district)
+        query = query.where(col(models.Road.id).in_(district_road_ids))
+        count_query = count_query.where(col(models.Road.id).in_(district_road_ids))
+
     if type:
-        if type.lower() not in ['primary', 'secondary']:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid type '{type}'. Must be 'primary' or 'secondary'"
-            )
-        type_str = type.lower()
+        type_str = _parse_type(type)
         query = query.where(models.Road.type == type_str)
         count_query = count_query.where(models.Road.type == type_str)
-    
+
     total_count = db.exec(count_query).one()
-    
+
     # Get paginated results
     roads = db.exec(query.offset(skip).limit(limit)).all()
-    
-    return models.RoadsPublic(data=roads, count=total_count)
+
+    return models.RoadsPublic(
+        data=[models.RoadPublic.model_validate(road) for road in roads],
+        count=total_count,
+    )
+
+
+def _read_roads_in_index(
+    db: Session,
+    box: BBox,
+    exact: bool,
+    district: str | None,
+    type: str | None,
+    skip: int,
+    limit: int,
+) -> models.RoadsPublic:
+    """
+    Bbox query on the in-memory road index. Filtering, counting and paging
+    happen on the id list, so only the roads of the requested page are read
+    back from the database.
+    """
+    index = get_road_index(db)
+    positions = index.query_positions(box, exact)
+    if type:
+        type_str = _parse_type(type)
+        positions = positions[
+            [index.types[position] == type_str for position in positions.tolist()]
+        ]
+    road_ids = np.sort(index.ids[positions])
+    if district:
+        road_ids = road_ids[
+            np.isin(road_ids, db.exec(_district_road_ids(district)).all())
+        ]
+
+    page = road_ids[skip : skip + limit].tolist()
+    roads = (
+        db.exec(
+            select(models.Road)
+            .where(col(models.Road.id).in_(page))
+            .order_by(col(models.Road.id))
+        ).all()
+        if page
+        else []
+    )
+    return models.RoadsPublic(
+        data=[models.RoadPublic.model_validate(road) for road in roads],
+        count=len(road_ids),
+    )
+
+
+def _district_road_ids(district: str) -> SelectOfScalar[int]:
+    """Ids of the roads passing through a district (name or code), from the precomputed links."""
+    return (
+        select(models.RoadDistrict.road_id)
+        .join(
+            models.District,
+            col(models.District.id) == col(models.RoadDistrict.district_id),
+        )
+        .where(
+            or_(
+                func.lower(models.District.name) == district.lower(),
+                models.District.code == district,
+            )
+        )
+    )
+
+
+@router.get("/stats", response_model=models.RoadStatsPublic)
+def read_road_stats(
+    db: Session = Depends(deps.get_db),
+    district: str | None = Query(None, description="Filter by district name or code"),
+    type: str | None = Query(
+        None, description="Filter by road type: 'primary' or 'secondary'"
+    ),
+    bbox: str | None = Query(
+        None, description="Filter by bounding box: 'minLon,minLat,maxLon,maxLat'"
+    ),
+) -> Any:
+    """
+    Number of roads and total length in km, overall and per road type.
+    Computed in SQL from the lengths and bounding boxes precomputed by the loader.
+    Filter by district: lengths are those of the roads clipped to the district
+    Filter by bbox: roads whose bounding box intersects the box
+    """
+    if district:
+        query = (
+            select(
+                models.Road.type,
+                func.count(col(models.Road.id)),
+                func.coalesce(func.sum(col(models.RoadDistrict.length_km)), 0.0),
+            )
+            .join(
+                models.RoadDistrict,
+                col(models.RoadDistrict.road_id) == col(models.Road.id),
+            )
+            .join(
+                models.District,
+                col(models.District.id) == col(models.RoadDistrict.district_id),
+            )
+            .where(
+                or_(
+                    func.lower(models.District.name) == district.lower(),
+                    models.District.code == district,
+                )
+            )
+        )
+    else:
+        query = select(
+            models.Road.type,
+            func.count(col(models.Road.id)),
+            func.coalesce(func.sum(col(models.Road.length_km)), 0.0),
+        )
+
+    if type:
+        query = query.where(models.Road.type == _parse_type(type))
+    if bbox:
+        query = query.where(*bbox_conditions(db, models.Road, _parse_bbox(bbox)))
+
+    by_type = [
+        models.RoadTypeStats(type=road_type, count=count, total_km=round(total_km, 3))
+        for road_type, count, total_km in db.exec(
+            query.group_by(models.Road.type).order_by(models.Road.type)
+        ).all()
+    ]
+    return models.RoadStatsPublic(
+        count=sum(stats.count for stats in by_type),
+        total_km=round(sum(stats.total_km for stats in by_type), 3),
+        by_type=by_type,
+    )
 
 
 @router.get("/{road_id}", response_model=models.RoadPublic)
@@ -65,6 +234,6 @@ def read_road(
         available_ids = [str(r) for r in available_roads[:10]]
         raise HTTPException(
             status_code=404,
-            detail=f"Road '{road_id}' not found. Available road IDs: {', '.join(available_ids)}"
+            detail=f"Road '{road_id}' not found. Available road IDs: {', '.join(available_ids)}",
         )
     return road
@@ -0,0 +1,59 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+
+from app import models
+from app.api import deps
+from app.utils.geometry import parse_lat_lon
+from app.utils.road_graph import MAX_SNAP_KM, get_road_graph
+
+router = APIRouter()
+
+
+@router.get("/", response_model=models.RouteResponse)
+def read_route(
+    *,
+    db: Session = Depends(deps.get_db),
+    origin: str = Query(..., alias="from", description="Start point as 'lat,lon'"),
+    destination: str = Query(..., alias="to", description="End point as 'lat,lon'"),
+) -> Any:
+    """
+    Find the fastest route over the road network between two points.
+    Points are snapped to the nearest road; travel time uses assumed speeds
+    per road type and surface.
+    """
+    try:
+        origin_lat, origin_lon = parse_lat_lon(origin)
+        destination_lat, destination_lon = parse_lat_lon(destination)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid coordinates: {e}")
+
+    graph = get_road_graph(db)
+    start = graph.snap(origin_lon, origin_lat)
+    end = graph.snap(destination_lon, destination_lat)
+    if start is None or end is None:
+        lat, lon = (
+            (origin_lat, origin_lon)
+            if start is None
+            else (destination_lat, destination_lon)
+        )
+        raise HTTPException(
+            status_code=404,
+            detail=f"No road found within {MAX_SNAP_KM:g} km of ({lat}, {lon})",
+        )
+
+    route = graph.route(start, end)
+    if route is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No route found: the points are on disconnected parts of the road network",
+        )
+
+    return models.RouteResponse(
+        distance_km=round(route.distance_km, 3),
+        duration_minutes=round(route.duration_hours * 60, 1),
+        origin_snap_km=round(start.distance_km, 3),
+        destination_snap_km=round(end.distance_km, 3),
+        geometry={"type": "LineString", "coordinates": route.coordinates},
+    )
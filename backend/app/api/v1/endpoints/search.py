@@ -0,0 +1,70 @@
+from collections import Counter
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+
+from app import models
+from app.api import deps
+from app.utils.place_search import SEARCH_KINDS, PlaceEntry, get_search_index
+
+router = APIRouter()
+
+
+@router.get("/", response_model=models.SearchResponse)
+def search(
+    *,
+    db: Session = Depends(deps.get_db),
+    q: str = Query(
+        ..., min_length=1, description="Name, alias or airport IATA/ICAO code"
+    ),
+    types: str = Query(
+        ",".join(SEARCH_KINDS),
+        description=f"Comma-separated types: {', '.join(SEARCH_KINDS)}",
+    ),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    per_type_limit: int | None = Query(
+        None, ge=1, description="Maximum number of matches of each type"
+    ),
+) -> Any:
+    """
+    Search every named entity at once: regions, districts (and aliases),
+    airports (also by IATA/ICAO code), ports, checkpoints and roads (one
+    result per road name). Served from one in-memory trigram index, so
+    misspellings still match; results are ordered by score.
+    With per_type_limit, only the best matches of each type are kept
+    before skip/limit paginate the merged list.
+    """
+    requested = [t.strip().lower() for t in types.split(",") if t.strip()]
+    unknown = sorted(set(requested) - set(SEARCH_KINDS))
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid types '{types}'. Must be a comma-separated subset of: {', '.join(SEARCH_KINDS)}",
+        )
+
+    counts: Counter[str] = Counter()
+    matches: list[tuple[PlaceEntry, float]] = []
+    for entry, score in get_search_index(db).matches(q):
+        if entry.kind not in requested:
+            continue
+        if per_type_limit is not None and counts[entry.kind] >= per_type_limit:
+            continue
+        counts[entry.kind] += 1
+        matches.append((entry, score))
+
+    results = [
+        models.SearchResult(
+            type=entry.kind,
+            id=entry.id,
+            name=entry.name,
+            code=entry.code,
+            region=entry.region,
+            lat=entry.centroid.get("lat") if entry.centroid else None,
+            lon=entry.centroid.get("lon") if entry.centroid else None,
+            score=score,
+        )
+        for entry, score in matches[skip : skip + limit]
+    ]
+    return models.SearchResponse(data=results, count=len(matches), counts=dict(counts))
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Response
+from sqlmodel import Session
+
+from app.api import deps
+from app.utils.tiles import MAX_TILE_ZOOM, TILE_LAYERS, dataset_version, get_tile
+
+router = APIRouter()
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header lists the ETag (weak comparison)."""
+    if if_none_match is None:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+@router.get(
+    "/{layer}/{z}/{x}/{y}.pbf",
+    response_class=Response,
+    responses={
+        200: {"content": {MVT_MEDIA_TYPE: {}}, "description": "Mapbox Vector Tile"}
+    },
+)
+def read_tile(
+    *,
+    db: Session = Depends(deps.get_db),
+    layer: str = Path(
+        ..., description="Layer: 'regions', 'districts', 'roads' or 'transport'"
+    ),
+    z: int = Path(..., ge=0, le=MAX_TILE_ZOOM, description="Zoom level"),
+    x: int = Path(..., ge=0, description="Tile column"),
+    y: int = Path(..., ge=0, description="Tile row (XYZ scheme, origin top-left)"),
+    if_none_match: str | None = Header(
+        None, description="ETag of a cached copy of the tile"
+    ),
+) -> Response:
+    """
+    Get a Mapbox Vector Tile (MVT) for a layer.
+    Boundaries are served pre-simplified for the zoom level; tiles are
+    cached per dataset version, so reloading the data refreshes them.
+    A request whose If-None-Match lists the current ETag gets an empty 304.
+    """
+    if layer not in TILE_LAYERS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown tile layer '{layer}'. Available layers: {', '.join(TILE_LAYERS)}",
+        )
+    if x >= 2**z or y >= 2**z:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tile {z}/{x}/{y} out of range: x and y must be below {2**z} at zoom {z}",
+        )
+
+    # Checked before building the tile: revalidation is only a version lookup
+    etag = f'"{dataset_version(db, layer)}-{z}-{x}-{y}"'
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    tile, version = get_tile(db, layer, z, x, y)
+    return Response(
+        content=tile,
+        media_type=MVT_MEDIA_TYPE,
+        headers={"ETag": f'"{version}-{z}-{x}-{y}"'},
+    )
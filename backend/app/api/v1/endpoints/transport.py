@@ -1,46 +1,146 @@
 from typing import Any
+
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select, func
+from sqlmodel import Session, col, func, or_, select
 
-from app import models
+from app import crud, models
 from app.api import deps
+from app.utils.geo_index import get_transport_index
+from app.utils.geometry import parse_bbox
+from app.utils.spatial_db import bbox_conditions
 
 router = APIRouter()
 
+REGION_FILTER = Query(None, description="Filter by region name or code")
+DISTRICT_FILTER = Query(None, description="Filter by district name or code")
+BBOX_FILTER = Query(
+    None, description="Filter by bounding box: 'minLon,minLat,maxLon,maxLat'"
+)
+
+
+def _location_filters(
+    db: Session, table: Any, region: str | None, district: str | None, bbox: str | None
+) -> list[Any]:
+    """
+    Conditions on the region/district assigned by the loader's spatial join
+    and on the facility location (R*Tree / spatial index when available).
+    """
+    conditions: list[Any] = []
+    if bbox:
+        try:
+            conditions.extend(bbox_conditions(db, table, parse_bbox(bbox)))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid bbox '{bbox}': {e}")
+    if region:
+        conditions.append(
+            table.region_id.in_(
+                select(models.Region.id).where(
+                    or_(
+                        func.lower(models.Region.name) == region.lower(),
+                        models.Region.code == region,
+                    )
+                )
+            )
+        )
+    if district:
+        conditions.append(
+            table.district_id.in_(
+                select(models.District.id).where(
+                    or_(
+                        func.lower(models.District.name) == district.lower(),
+                        models.District.code == district,
+                    )
+                )
+            )
+        )
+    return conditions
+
+
+@router.get("/nearest", response_model=models.NearestFacilitiesPublic)
+def read_nearest_facilities(
+    *,
+    db: Session = Depends(deps.get_db),
+    lat: float = Query(..., ge=-90, le=90, description="Latitude (-90 to 90)"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude (-180 to 180)"),
+    kind: str = Query(
+        ..., description="Facility kind: 'airport', 'port' or 'checkpoint'"
+    ),
+    k: int = Query(5, ge=1, le=100, description="Number of facilities to return"),
+) -> Any:
+    """
+    Find the k nearest airports, ports or checkpoints to a point.
+
+    Distances are great-circle (haversine) kilometres, closest first.
+    """
+    kind = kind.lower()
+    if kind not in models.TRANSPORT_KINDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid kind '{kind}'. Must be 'airport', 'port' or 'checkpoint'",
+        )
+    table = models.TRANSPORT_KINDS[kind]
+
+    nearest = get_transport_index(db, kind).nearest(lat, lon, k)
+    rows = crud.get_facilities_by_id(db, table, [id_ for id_, _ in nearest])
+    data = [
+        models.NearestFacility(
+            id=row.id,
+            kind=kind,
+            name=row.name,
+            type=row.type,
+            latitude=row.latitude,
+            longitude=row.longitude,
+            region=row.region,
+            distance_km=round(distance_km, 3),
+        )
+        for id_, distance_km in nearest
+        if (row := rows.get(id_)) is not None
+    ]
+    return models.NearestFacilitiesPublic(data=data, count=len(data))
+
 
 @router.get("/airports", response_model=models.AirportsPublic)
 def read_airports(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-    type: str | None = Query(None, description="Filter by type: 'international' or 'domestic'"),
+    type: str | None = Query(
+        None, description="Filter by type: 'international' or 'domestic'"
+    ),
+    region: str | None = REGION_FILTER,
+    district: str | None = DISTRICT_FILTER,
+    bbox: str | None = BBOX_FILTER,
 ) -> Any:
     """
     Retrieve airports.
-    
+
     Filter by type: 'international' or 'domestic'
+    Filter by region/district: name or code of the containing area
+    Filter by bbox: facilities inside the box
     """
     # Build query with optional filtering
-    query = select(models.Airport)
-    
+    conditions = _location_filters(db, models.Airport, region, district, bbox)
+
     if type:
-        if type.lower() not in ['international', 'domestic']:
+        if type.lower() not in ["international", "domestic"]:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid type '{type}'. Must be 'international' or 'domestic'"
+                detail=f"Invalid type '{type}'. Must be 'international' or 'domestic'",
             )
-        query = query.where(models.Airport.type == type.lower())
-    
+        conditions.append(models.Airport.type == type.lower())
+    query = select(models.Airport).where(*conditions)
+
     # Get total count
-    count_query = select(func.count(models.Airport.id))
-    if type:
-        count_query = count_query.where(models.Airport.type == type.lower())
+    count_query = select(func.count(col(models.Airport.id))).where(*conditions)
     total_count = db.exec(count_query).one()
-    
+
     # Get paginated results
     airports = db.exec(query.offset(skip).limit(limit)).all()
-    
-    return models.AirportsPublic(data=airports, count=total_count)
+
+    return models.AirportsPublic(
+        data=[models.AirportPublic.model_validate(airport) for airport in airports],
+        count=total_count,
+    )
 
 
 @router.get("/airports/{airport_id}", response_model=models.AirportPublic)
@@ -58,7 +158,7 @@ def read_airport(
         available_ids = [str(a) for a in available_airports[:10]]
         raise HTTPException(
             status_code=404,
-            detail=f"Airport '{airport_id}' not found. Available airport IDs: {', '.join(available_ids)}"
+            detail=f"Airport '{airport_id}' not found. Available airport IDs: {', '.join(available_ids)}",
         )
     return airport
 
@@ -68,17 +168,32 @@ def read_ports(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    region: str | None = REGION_FILTER,
+    district: str | None = DISTRICT_FILTER,
+    bbox: str | None = BBOX_FILTER,
 ) -> Any:
     """
     Retrieve ports.
+
+    Filter by region/district: name or code of the containing area
+    Filter by bbox: facilities inside the box
     """
+    conditions = _location_filters(db, models.Port, region, district, bbox)
+
     # Get total count
-    total_count = db.exec(select(func.count(models.Port.id))).one()
-    
+    total_count = db.exec(
+        select(func.count(col(models.Port.id))).where(*conditions)
+    ).one()
+
     # Get paginated results
-    ports = db.exec(select(models.Port).offset(skip).limit(limit)).all()
-    
-    return models.PortsPublic(data=ports, count=total_count)
+    ports = db.exec(
+        select(models.Port).where(*conditions).offset(skip).limit(limit)
+    ).all()
+
+    return models.PortsPublic(
+        data=[models.PortPublic.model_validate(port) for port in ports],
+        count=total_count,
+    )
 
 
 @router.get("/ports/{port_id}", response_model=models.PortPublic)
@@ -96,7 +211,7 @@ def read_port(
         available_ids = [str(p) for p in available_ports[:10]]
         raise HTTPException(
             status_code=404,
-            detail=f"Port '{port_id}' not found. Available port IDs: {', '.join(available_ids)}"
+            detail=f"Port '{port_id}' not found. Available port IDs: {', '.join(available_ids)}",
         )
     return port
 
@@ -106,17 +221,35 @@ def read_checkpoints(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    region: str | None = REGION_FILTER,
+    district: str | None = DISTRICT_FILTER,
+    bbox: str | None = BBOX_FILTER,
 ) -> Any:
     """
     Retrieve checkpoints.
+
+    Filter by region/district: name or code of the containing area
+    Filter by bbox: facilities inside the box
     """
+    conditions = _location_filters(db, models.Checkpoint, region, district, bbox)
+
     # Get total count
-    total_count = db.exec(select(func.count(models.Checkpoint.id))).one()
-    
+    total_count = db.exec(
+        select(func.count(col(models.Checkpoint.id))).where(*conditions)
+    ).one()
+
     # Get paginated results
-    checkpoints = db.exec(select(models.Checkpoint).offset(skip).limit(limit)).all()
-    
-    return models.CheckpointsPublic(data=checkpoints, count=total_count)
+    checkpoints = db.exec(
+        select(models.Checkpoint).where(*conditions).offset(skip).limit(limit)
+    ).all()
+
+    return models.CheckpointsPublic(
+        data=[
+            models.CheckpointPublic.model_validate(checkpoint)
+            for checkpoint in checkpoints
+        ],
+        count=total_count,
+    )
 
 
 @router.get("/checkpoints/{checkpoint_id}", response_model=models.CheckpointPublic)
@@ -134,6 +267,6 @@ def read_checkpoint(
         available_ids = [str(c) for c in available_checkpoints[:10]]
         raise HTTPException(
             status_code=404,
-            detail=f"Checkpoint '{checkpoint_id}' not found. Available checkpoint IDs: {', '.join(available_ids)}"
+            detail=f"Checkpoint '{checkpoint_id}' not found. Available checkpoint IDs: {', '.join(available_ids)}",
         )
     return checkpoint
@@ -56,6 +56,23 @@ class Settings(BaseSettings):
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         return self.DATABASE_URL
 
+    # How often (seconds) cached geographic indexes re-check the database
+    # for reloaded data before serving from memory.
+    GEO_INDEX_REFRESH_SECONDS: int = 60
+    # Open Location Code length whose cells are precomputed into the
+    # cell -> district/region lookup grid (6 = 0.05 deg, 8 = 0.0025 deg cells)
+    OLC_GRID_CODE_LENGTH: int = 6
+    # Vector tiles kept in the in-memory LRU cache, and an optional directory
+    # for a persistent on-disk tile cache (disabled when unset)
+    TILE_CACHE_SIZE: int = 2048
+    TILE_CACHE_DIR: str | None = None
+    # SpatiaLite extension loaded into SQLite connections for native geometry
+    # columns (see app.utils.spatial_db); "none" disables it
+    SPATIALITE_LIBRARY: str = "mod_spatialite"
+    # /places/search index: per-worker in-memory trigram index ("memory") or
+    # the loader's SQLite FTS5 table ("fts", shared by all workers)
+    PLACE_SEARCH_BACKEND: Literal["memory", "fts"] = "memory"
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
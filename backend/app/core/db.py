@@ -1,10 +1,39 @@
+import logging
+from typing import Any
+
+from sqlalchemy import event
 from sqlmodel import Session, create_engine
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
 
 
+def load_spatialite(dbapi_connection: Any, _connection_record: Any) -> None:
+    """
+    Load SpatiaLite into a new SQLite connection when available.
+    Without it the API keeps working on the JSON geometry columns.
+    """
+    try:
+        dbapi_connection.enable_load_extension(True)
+    except AttributeError as e:  # sqlite3 built without extension support
+        logger.debug("SpatiaLite not loaded: %s", e)
+        return
+    try:
+        dbapi_connection.load_extension(settings.SPATIALITE_LIBRARY)
+    except Exception as e:  # library not found
+        logger.debug("SpatiaLite not loaded: %s", e)
+    finally:
+        # Never leave SQL-level load_extension() enabled on pooled connections
+        dbapi_connection.enable_load_extension(False)
+
+
+if engine.dialect.name == "sqlite" and settings.SPATIALITE_LIBRARY.lower() != "none":
+    event.listen(engine, "connect", load_spatialite)
+
+
 # make sure all SQLModel models are imported (app.models) before initializing DB
 # otherwise, SQLModel might fail to initialize relationships properly
 # for more details: https://github.com/fastapi/full-stack-fastapi-template/issues/28
@@ -6,7 +6,6 @@ import jwt
 
 from app.core.config import settings
 
-
 ALGORITHM = "HS256"
 
 
@@ -21,8 +20,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password using bcrypt."""
     try:
         return bcrypt.checkpw(
-            plain_password.encode('utf-8'),
-            hashed_password.encode('utf-8')
+            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
         )
     except Exception:
         return False
@@ -31,7 +29,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     """Hash password using bcrypt."""
     # Ensure password is not longer than 72 bytes (bcrypt limit)
-    password_bytes = password.encode('utf-8')[:72]
+    password_bytes = password.encode("utf-8")[:72]
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+    return hashed.decode("utf-8")
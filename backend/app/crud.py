@@ -1,10 +1,15 @@
 # Somalia Geography API - CRUD operations
 # User authentication functions for login/registration
 
-from sqlmodel import Session, select
+from collections.abc import Iterable
+from typing import TypeVar
+
+from sqlmodel import Session, col, select
 
 from app.core.security import get_password_hash, verify_password
-from app.models import Item, ItemCreate, User, UserCreate, UserUpdate
+from app.models import Item, ItemCreate, TransportFacility, User, UserCreate, UserUpdate
+
+FacilityT = TypeVar("FacilityT", bound=TransportFacility)
 
 
 def get_user_by_email(session: Session, email: str) -> User | None:
@@ -62,3 +67,25 @@ def create_item(session: Session, item_in: ItemCreate, owner_id: int) -> Item:
     session.commit()
     session.refresh(item)
     return item
+
+
+def get_facilities_by_id(
+    session: Session, table: type[FacilityT], ids: Iterable[int]
+) -> dict[int, FacilityT]:
+    """Get airports, ports or checkpoints (one table) by ID."""
+    statement = select(table).where(col(table.id).in_(list(ids)))
+    return {facility.id: facility for facility in session.exec(statement).all()}
+
+
+def get_facilities_in_bbox(
+    session: Session, table: type[FacilityT], bbox: tuple[float, float, float, float]
+) -> list[FacilityT]:
+    """Get airports, ports or checkpoints (one table) inside a (min_lon, min_lat, max_lon, max_lat) box."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    statement = select(table).where(
+        col(table.longitude) >= min_lon,
+        col(table.longitude) <= max_lon,
+        col(table.latitude) >= min_lat,
+        col(table.latitude) <= max_lat,
+    )
+    return list(session.exec(statement).all())
@@ -2,12 +2,18 @@ try:
     import sentry_sdk
 except ImportError:
     sentry_sdk = None
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
+from sqlmodel import Session
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.db import engine
+from app.utils.geo_index import warm_indexes
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -17,17 +23,31 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local" and sentry_sdk:
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    # Build in-memory spatial indexes before serving the first request
+    with Session(engine) as session:
+        warm_indexes(session)
+    yield
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="Open-source API providing Somali geographic and infrastructure data including administrative boundaries, roads, transport infrastructure, and postal codes.",
     version="1.0.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
 # Always enable CORS for local development
-cors_origins = settings.all_cors_origins if settings.all_cors_origins else ["http://localhost:5173", "http://127.0.0.1:5173"]
+cors_origins = (
+    settings.all_cors_origins
+    if settings.all_cors_origins
+    else ["http://localhost:5173", "http://127.0.0.1:5173"]
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
@@ -1,19 +1,29 @@
-from typing import Any, Dict, List, Optional
-from sqlmodel import Field, Relationship, SQLModel, JSON
+from typing import Any
 
-# Database base for table creation
-from sqlmodel import SQLModel as Base
+from pydantic import BaseModel
+from sqlmodel import JSON, Field, Relationship, SQLModel
 
+# Database base for table creation
 
 # Somalia Geography Models
 
+
 # Shared properties for Region
 class RegionBase(SQLModel):
     name: str = Field(index=True, max_length=255)
     code: str = Field(index=True, max_length=10)  # e.g., "SOM-BNR"
-    population: Optional[int] = None
-    area_km2: Optional[float] = None
-    geometry: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSON)  # GeoJSON geometry
+    population: int | None = None
+    area_km2: float | None = None
+    # Geometry metrics precomputed by the loader (see app.utils.geometry.area_metrics)
+    centroid_lat: float | None = Field(default=None, index=True)
+    centroid_lon: float | None = Field(default=None, index=True)
+    min_lon: float | None = Field(default=None, index=True)
+    min_lat: float | None = Field(default=None, index=True)
+    max_lon: float | None = Field(default=None, index=True)
+    max_lat: float | None = Field(default=None, index=True)
+    geometry: dict[str, Any] | None = Field(
+        default=None, sa_type=JSON
+    )  # GeoJSON geometry
 
 
 class RegionCreate(RegionBase):
@@ -21,13 +31,19 @@ class RegionCreate(RegionBase):
 
 
 class RegionUpdate(RegionBase):
-    name: Optional[str] = None
-    code: Optional[str] = None
+    name: str | None = None
+    code: str | None = None
 
 
 class Region(RegionBase, table=True):
     id: int = Field(default=None, primary_key=True)
-    districts: List["District"] = Relationship(back_populates="region", cascade_delete=True)
+    # Search keys of the name, computed by the loader (see app.utils.names);
+    # table-only, so they are neither returned nor settable by clients
+    name_key: str | None = Field(default=None, index=True, max_length=255)
+    name_phonetic: str | None = Field(default=None, index=True, max_length=255)
+    districts: list["District"] = Relationship(
+        back_populates="region", cascade_delete=True
+    )
 
 
 class RegionPublic(RegionBase):
@@ -35,7 +51,7 @@ class RegionPublic(RegionBase):
 
 
 class RegionsPublic(SQLModel):
-    data: List[RegionPublic]
+    data: list[RegionPublic]
     count: int
 
 
@@ -44,10 +60,22 @@ class DistrictBase(SQLModel):
     name: str = Field(index=True, max_length=255)
     code: str = Field(index=True, max_length=20)  # e.g., "SOM-HSH-BLTWYN"
     region_name: str = Field(index=True, max_length=255)
-    population: Optional[int] = None
-    aliases: Optional[List[str]] = Field(default=None, sa_type=JSON)
-    centroid: Optional[Dict[str, float]] = Field(default=None, sa_type=JSON)  # {"lat": float, "lon": float}
-    geometry: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSON)  # GeoJSON geometry
+    population: int | None = None
+    aliases: list[str] | None = Field(default=None, sa_type=JSON)
+    centroid: dict[str, float] | None = Field(
+        default=None, sa_type=JSON
+    )  # {"lat": float, "lon": float}
+    # Geometry metrics precomputed by the loader (see app.utils.geometry.area_metrics)
+    area_km2: float | None = None
+    centroid_lat: float | None = Field(default=None, index=True)
+    centroid_lon: float | None = Field(default=None, index=True)
+    min_lon: float | None = Field(default=None, index=True)
+    min_lat: float | None = Field(default=None, index=True)
+    max_lon: float | None = Field(default=None, index=True)
+    max_lat: float | None = Field(default=None, index=True)
+    geometry: dict[str, Any] | None = Field(
+        default=None, sa_type=JSON
+    )  # GeoJSON geometry
 
 
 class DistrictCreate(DistrictBase):
@@ -55,13 +83,17 @@ class DistrictCreate(DistrictBase):
 
 
 class DistrictUpdate(DistrictBase):
-    name: Optional[str] = None
-    code: Optional[str] = None
-    region_name: Optional[str] = None
+    name: str | None = None
+    code: str | None = None
+    region_name: str | None = None
 
 
 class District(DistrictBase, table=True):
     id: int = Field(default=None, primary_key=True)
+    # Search keys of the name, computed by the loader (see app.utils.names);
+    # table-only, so they are neither returned nor settable by clients
+    name_key: str | None = Field(default=None, index=True, max_length=255)
+    name_phonetic: str | None = Field(default=None, index=True, max_length=255)
     region_id: int = Field(foreign_key="region.id", nullable=False)
     region: Region = Relationship(back_populates="districts")
 
@@ -72,18 +104,25 @@ class DistrictPublic(DistrictBase):
 
 
 class DistrictsPublic(SQLModel):
-    data: List[DistrictPublic]
+    data: list[DistrictPublic]
     count: int
 
 
 # Shared properties for Road
 class RoadBase(SQLModel):
     name: str = Field(index=True, max_length=255)
-    type: str = Field(max_length=50)  # primary, secondary, etc.
-    length_km: Optional[float] = None
-    condition: Optional[str] = Field(max_length=50)  # good, fair, poor
-    surface: Optional[str] = Field(max_length=50)  # paved, unpaved
-    geometry: Optional[List[List[float]]] = Field(default=None, sa_type=JSON)  # [[lon, lat], [lon, lat], ...]
+    type: str = Field(index=True, max_length=50)  # primary, secondary, etc.
+    length_km: float | None = None  # Geodesic length, computed by the loader if missing
+    condition: str | None = Field(max_length=50)  # good, fair, poor
+    surface: str | None = Field(max_length=50)  # paved, unpaved
+    # Bounding box precomputed by the loader
+    min_lon: float | None = Field(default=None, index=True)
+    min_lat: float | None = Field(default=None, index=True)
+    max_lon: float | None = Field(default=None, index=True)
+    max_lat: float | None = Field(default=None, index=True)
+    geometry: list[list[float]] | None = Field(
+        default=None, sa_type=JSON
+    )  # [[lon, lat], [lon, lat], ...]
 
 
 class RoadCreate(RoadBase):
@@ -91,12 +130,16 @@ class RoadCreate(RoadBase):
 
 
 class RoadUpdate(RoadBase):
-    name: Optional[str] = None
-    type: Optional[str] = None
+    name: str | None = None
+    type: str | None = None
 
 
 class Road(RoadBase, table=True):
     id: int = Field(default=None, primary_key=True)
+    # Search keys of the name, computed by the loader (see app.utils.names);
+    # table-only, so they are neither returned nor settable by clients
+    name_key: str | None = Field(default=None, index=True, max_length=255)
+    name_phonetic: str | None = Field(default=None, index=True, max_length=255)
 
 
 class RoadPublic(RoadBase):
@@ -104,8 +147,35 @@ class RoadPublic(RoadBase):
 
 
 class RoadsPublic(SQLModel):
-    data: List[RoadPublic]
+    data: list[RoadPublic]
+    count: int
+
+
+class RoadTypeStats(SQLModel):
+    type: str
+    count: int
+    total_km: float
+
+
+class RoadStatsPublic(SQLModel):
     count: int
+    total_km: float
+    by_type: list[RoadTypeStats]
+
+
+# Road <-> District membership, precomputed by the loader from the geometries
+class RoadDistrict(SQLModel, table=True):
+    road_id: int = Field(foreign_key="road.id", primary_key=True)
+    district_id: int = Field(foreign_key="district.id", primary_key=True, index=True)
+    length_km: float  # Length of the road clipped to the district
+
+
+# Version of a geo table's contents, bumped by the loader whenever it rewrites
+# rows in place, so cached in-memory indexes notice changes that keep the row
+# count and ids (see app.utils.geo_index.table_signature)
+class GeoDataVersion(SQLModel, table=True):
+    table_name: str = Field(primary_key=True, max_length=64)
+    version: int = 0
 
 
 # Location Code models
@@ -122,13 +192,35 @@ class LocationCodeResponse(SQLModel):
     code: str
     latitude_center: float
     longitude_center: float
-    region_code: Optional[str] = None  # e.g., "SOM-BNR"
+    region_code: str | None = None  # e.g., "SOM-BNR"
+
+
+# Reverse geocoding models
+class ReverseGeocodeResponse(SQLModel):
+    lat: float
+    lon: float
+    district_id: int | None = None
+    district_code: str | None = None
+    district_name: str | None = None
+    region_id: int | None = None
+    region_code: str | None = None
+    region_name: str | None = None
+
+
+class ReverseGeocodeBatchRequest(SQLModel):
+    points: list[tuple[float, float]] = Field(max_length=100_000)  # [[lon, lat], ...]
+
+
+class ReverseGeocodeBatchResponse(SQLModel):
+    district_codes: list[str | None]
+    region_codes: list[str | None]
+    count: int
 
 
 # Search models
 class PlaceSearch(SQLModel):
     name: str
-    limit: Optional[int] = 10
+    limit: int | None = 10
 
 
 class PlaceSearchResult(SQLModel):
@@ -136,29 +228,80 @@ class PlaceSearchResult(SQLModel):
     name: str
     region: str
     type: str  # district, region, etc.
-    aliases: Optional[List[str]] = None
-    centroid: Optional[Dict[str, float]] = None
-    population: Optional[int] = None
+    aliases: list[str] | None = None
+    centroid: dict[str, float] | None = None
+    population: int | None = None
+    score: float | None = None  # Name similarity, 0-1
+
+
+class PlaceSpellingSuggestion(SQLModel):
+    text: str  # Indexed name the query may be a misspelling of
+    distance: int  # Edit distance from the query
 
 
 class PlacesSearchResponse(SQLModel):
-    data: List[PlaceSearchResult]
+    data: list[PlaceSearchResult]
+    count: int
+    suggestions: list[PlaceSpellingSuggestion] = Field(
+        default_factory=list
+    )  # "Did you mean", closest first
+
+
+class PlaceSuggestion(SQLModel):
+    text: str  # Completed name or alias
+    type: str  # region, district, airport, road
+    id: int
+    name: str  # Name of the place (differs from text for aliases)
+    region: str | None = None
+
+
+class PlaceAutocompleteResponse(SQLModel):
+    query: str
+    data: list[PlaceSuggestion]
     count: int
 
 
+# Unified search models
+class SearchResult(SQLModel):
+    type: str  # region, district, airport, port, checkpoint, road
+    id: int  # For roads: the first road with the name
+    name: str
+    code: str | None = None  # Region/district code, airport IATA (else ICAO) code
+    region: str | None = None
+    lat: float | None = None  # Centroid or facility location
+    lon: float | None = None
+    score: float  # Name similarity, 0-1
+
+
+class SearchResponse(SQLModel):
+    data: list[SearchResult]
+    count: int  # Matches after per-type limits, before skip/limit
+    counts: dict[str, int]  # Matches per type, after per-type limits
+
+
 # Transport infrastructure models
 class AirportBase(SQLModel):
     name: str = Field(max_length=255)
-    iata_code: Optional[str] = Field(max_length=3)
-    icao_code: Optional[str] = Field(max_length=4)
+    iata_code: str | None = Field(max_length=3)
+    icao_code: str | None = Field(max_length=4)
     type: str = Field(max_length=50)  # international, domestic, etc.
     latitude: float
     longitude: float
     region: str = Field(max_length=255)
+    # Containing region/district, assigned by the loader's spatial join
+    region_id: int | None = Field(default=None, foreign_key="region.id", index=True)
+    district_id: int | None = Field(default=None, foreign_key="district.id", index=True)
 
 
 class Airport(AirportBase, table=True):
     id: int = Field(default=None, primary_key=True)
+    # Region label from the source tags; ``region`` is replaced by the name of
+    # the containing region when the loader locates the facility
+    region_label: str | None = Field(default=None, max_length=255)
+    # Search keys of the name, computed by the loader (see app.utils.names);
+    # table-only, so they are neither returned nor settable by clients
+    name_key: str | None = Field(default=None, index=True, max_length=255)
+    name_phonetic: str | None = Field(default=None, index=True, max_length=255)
 
 
 class AirportPublic(AirportBase):
@@ -166,7 +309,7 @@ class AirportPublic(AirportBase):
 
 
 class AirportsPublic(SQLModel):
-    data: List[AirportPublic]
+    data: list[AirportPublic]
     count: int
 
 
@@ -176,10 +319,20 @@ class PortBase(SQLModel):
     latitude: float
     longitude: float
     region: str = Field(max_length=255)
+    # Containing region/district, assigned by the loader's spatial join
+    region_id: int | None = Field(default=None, foreign_key="region.id", index=True)
+    district_id: int | None = Field(default=None, foreign_key="district.id", index=True)
 
 
 class Port(PortBase, table=True):
     id: int = Field(default=None, primary_key=True)
+    # Region label from the source tags; ``region`` is replaced by the name of
+    # the containing region when the loader locates the facility
+    region_label: str | None = Field(default=None, max_length=255)
+    # Search keys of the name, computed by the loader (see app.utils.names);
+    # table-only, so they are neither returned nor settable by clients
+    name_key: str | None = Field(default=None, index=True, max_length=255)
+    name_phonetic: str | None = Field(default=None, index=True, max_length=255)
 
 
 class PortPublic(PortBase):
@@ -187,7 +340,7 @@ class PortPublic(PortBase):
 
 
 class PortsPublic(SQLModel):
-    data: List[PortPublic]
+    data: list[PortPublic]
     count: int
 
 
@@ -198,10 +351,20 @@ class CheckpointBase(SQLModel):
     longitude: float
     region: str = Field(max_length=255)
     status: str = Field(max_length=50)  # active, inactive
+    # Containing region/district, assigned by the loader's spatial join
+    region_id: int | None = Field(default=None, foreign_key="region.id", index=True)
+    district_id: int | None = Field(default=None, foreign_key="district.id", index=True)
 
 
 class Checkpoint(CheckpointBase, table=True):
     id: int = Field(default=None, primary_key=True)
+    # Region label from the source tags; ``region`` is replaced by the name of
+    # the containing region when the loader locates the facility
+    region_label: str | None = Field(default=None, max_length=255)
+    # Search keys of the name, computed by the loader (see app.utils.names);
+    # table-only, so they are neither returned nor settable by clients
+    name_key: str | None = Field(default=None, index=True, max_length=255)
+    name_phonetic: str | None = Field(default=None, index=True, max_length=255)
 
 
 class CheckpointPublic(CheckpointBase):
@@ -209,17 +372,138 @@ class CheckpointPublic(CheckpointBase):
 
 
 class CheckpointsPublic(SQLModel):
-    data: List[CheckpointPublic]
+    data: list[CheckpointPublic]
     count: int
 
 
+# Transport facility tables by the kind names used in the API
+TransportFacility = Airport | Port | Checkpoint
+TRANSPORT_KINDS: dict[str, type[TransportFacility]] = {
+    "airport": Airport,
+    "port": Port,
+    "checkpoint": Checkpoint,
+}
+
+
+class NearestFacility(SQLModel):
+    id: int
+    kind: str  # airport, port, checkpoint
+    name: str
+    type: str
+    latitude: float
+    longitude: float
+    region: str
+    distance_km: float
+
+
+class NearestFacilitiesPublic(SQLModel):
+    data: list[NearestFacility]
+    count: int
+
+
+# Radius search models
+class NearbyFeature(SQLModel):
+    layer: str  # roads, airports, ports, checkpoints, districts
+    id: int
+    name: str
+    type: str | None = None  # Road or facility type
+    code: str | None = None  # District code
+    latitude: float | None = None  # Facility location (point layers)
+    longitude: float | None = None
+    distance_km: float  # To the closest point of the feature (0 inside a district)
+
+
+class NearbyPublic(SQLModel):
+    lat: float
+    lon: float
+    radius_km: float
+    data: list[NearbyFeature]
+    count: int  # Matches within the radius, before the limit
+
+
+# Routing models
+class RouteResponse(SQLModel):
+    distance_km: float
+    duration_minutes: float  # Estimated from assumed speeds per road type/surface
+    origin_snap_km: float  # Distance from the requested origin to the nearest road
+    destination_snap_km: float
+    geometry: dict[str, Any]  # GeoJSON LineString
+
+
+class Isochrone(SQLModel):
+    minutes: float
+    road_km: float  # Length of road reachable within the time
+    geometry: dict[str, Any] | None = (
+        None  # GeoJSON Polygon (convex hull of the reachable network)
+    )
+
+
+class MatrixPoint(SQLModel):
+    """A matrix location: coordinates, a district code or a transport facility."""
+
+    lat: float | None = Field(default=None, ge=-90, le=90)
+    lon: float | None = Field(default=None, ge=-180, le=180)
+    district_code: str | None = None  # Uses the district centroid
+    transport_kind: str | None = None  # airport, port or checkpoint
+    transport_id: int | None = None
+
+
+class MatrixRequest(SQLModel):
+    origins: list[MatrixPoint] = Field(min_length=1, max_length=1000)
+    destinations: list[MatrixPoint] = Field(min_length=1, max_length=1000)
+    road: bool = False  # Also compute road-network distances and times
+
+
+class MatrixLocation(SQLModel):
+    lat: float
+    lon: float
+    name: str | None = None
+
+
+class MatrixResponse(SQLModel):
+    origins: list[MatrixLocation]
+    destinations: list[MatrixLocation]
+    great_circle_km: list[list[float]]
+    road_km: list[list[float | None]] | None = (
+        None  # Length of the fastest route, null if unreachable
+    )
+    road_minutes: list[list[float | None]] | None = None
+
+
+class IsochronesPublic(SQLModel):
+    lat: float
+    lon: float
+    snap_distance_km: float  # Distance from the requested point to the nearest road
+    data: list[Isochrone]
+    count: int
+
+
+# Geofencing models (NDJSON stream records)
+class GeofencePing(SQLModel):
+    id: str | int  # Tracked object (vehicle, device, ...)
+    lat: float = Field(ge=-90, le=90)
+    lon: float = Field(ge=-180, le=180)
+    ts: Any | None = None  # Passed through to the events
+
+
+class GeofenceEvent(SQLModel):
+    id: str | int
+    event: str  # enter, exit
+    level: str  # district, region
+    area_id: int
+    code: str
+    name: str
+    lat: float
+    lon: float
+    ts: Any | None = None
+
+
 # Generic message
 class Message(SQLModel):
     message: str
 
 
 # User and Authentication Models (from template)
-from pydantic import BaseModel
 
 
 class TokenPayload(BaseModel):
@@ -0,0 +1,705 @@
+"""
+Cached in-memory geographic indexes for Somalia Geography API.
+
+Indexes are built from the database on first use (and warmed at startup),
+then shared by all requests. Each index remembers the dataset signature it
+was built from; the signature is re-checked at most every
+``settings.GEO_INDEX_REFRESH_SECONDS`` so that re-running the loader is
+picked up without restarting the server.
+"""
+
+import itertools
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlmodel import Session, SQLModel, col, select
+
+from app import models
+from app.core.config import settings
+from app.utils.geometry import (
+    EARTH_RADIUS_KM,
+    BBox,
+    Ring,
+    RingEdges,
+    bbox_of_points,
+    chord_to_km,
+    point_in_rings,
+    point_segment_distances_km,
+    points_in_rings,
+    polygons_of,
+    radius_bbox,
+    ring_edges,
+    segments_intersect_bbox,
+    simplify_geometry,
+    unit_vector,
+)
+from app.utils.spatial_index import KDTree, STRtree
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Every CachedIndex registers itself here so warm_indexes() can build them all
+_registry: list["CachedIndex[Any]"] = []
+
+
+def _table_name(table: type[SQLModel]) -> str:
+    return str(table.__tablename__)
+
+
+def _data_versions(db: Session, tables: Sequence[type[SQLModel]]) -> dict[str, int]:
+    """GeoDataVersion of the given tables; empty on databases without the table."""
+    names = [_table_name(table) for table in tables]
+    try:
+        rows = db.exec(
+            select(
+                models.GeoDataVersion.table_name, models.GeoDataVersion.version
+            ).where(col(models.GeoDataVersion.table_name).in_(names))
+        ).all()
+    except (OperationalError, ProgrammingError):
+        db.rollback()
+        return {}
+    return dict(rows)
+
+
+def table_signature(db: Session, *tables: type[SQLModel]) -> tuple[Any, ...]:
+    """
+    Cheap fingerprint of the given tables: (row count, max id, data version)
+    per table. The version catches in-place rewrites that keep the row
+    count and ids (see ``bump_data_version``).
+    """
+    versions = _data_versions(db, tables)
+    signature: list[Any] = []
+    for table in tables:
+        count, max_id = db.exec(select(func.count(table.id), func.max(table.id))).one()  # type: ignore[attr-defined]
+        signature.extend((count, max_id, versions.get(_table_name(table))))
+    return tuple(signature)
+
+
+def bump_data_version(db: Session, *tables: type[SQLModel]) -> None:
+    """
+    Record that rows of the given tables were rewritten in place, so
+    CachedIndexes built from them are rebuilt. Committed with the session.
+    """
+    for table in tables:
+        name = _table_name(table)
+        row = db.get(models.GeoDataVersion, name) or models.GeoDataVersion(
+            table_name=name
+        )
+        row.version += 1
+        db.add(row)
+
+
+class CachedIndex(Generic[T]):
+    """
+    Lazily built, thread-safe index that is rebuilt when its tables change.
+
+    Args:
+        name: Name used in log messages
+        tables: Tables whose signature invalidates the index
+        builder: Callable building the index from a database session
+        warm: Whether warm_indexes() builds it at startup (checked then);
+            otherwise it is built on first use
+    """
+
+    def __init__(
+        self,
+        name: str,
+        tables: Sequence[type[SQLModel]],
+        builder: Callable[[Session], T],
+        warm: Callable[[], bool] = lambda: True,
+    ):
+        self.name = name
+        self.tables = tuple(tables)
+        self.builder = builder
+        self.warm = warm
+        self._lock = threading.Lock()
+        self._value: T | None = None
+        self._signature: tuple[Any, ...] | None = None
+        self._checked_at = 0.0
+        _registry.append(self)
+
+    def get(self, db: Session) -> T:
+        now = time.monotonic()
+        if (
+            self._value is not None
+            and now - self._checked_at < settings.GEO_INDEX_REFRESH_SECONDS
+        ):
+            return self._value
+
+        with self._lock:
+            signature = table_signature(db, *self.tables)
+            if self._value is None or signature != self._signature:
+                started = time.perf_counter()
+                self._value = self.builder(db)
+                self._signature = signature
+                logger.info(
+                    "Built %s index in %.1f ms",
+                    self.name,
+                    (time.perf_counter() - started) * 1000,
+                )
+            self._checked_at = time.monotonic()
+            return self._value
+
+    @property
+    def signature(self) -> tuple[Any, ...] | None:
+        return self._signature
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._value = None
+            self._signature = None
+
+
+@dataclass
+class AdminArea:
+    """A district or region with its polygons prepared for point lookups."""
+
+    id: int
+    code: str
+    name: str
+    bbox: BBox | None
+    polygons: list[list[Ring]] = field(repr=False)
+    region_id: int | None = None
+
+
+@dataclass
+class AdminMatch:
+    district: AdminArea | None
+    region: AdminArea | None
+
+
+class _PolygonLayer:
+    """STR-tree over the individual polygons of a set of admin areas."""
+
+    def __init__(self, areas: Sequence[AdminArea]):
+        self.areas = list(areas)
+        self.entries: list[tuple[BBox, tuple[int, list[Ring]]]] = []
+        for position, area in enumerate(self.areas):
+            for rings in area.polygons:
+                bbox = bbox_of_points(rings[0])
+                if bbox:
+                    self.entries.append((bbox, (position, rings)))
+        self.tree: STRtree[tuple[int, list[Ring]]] = STRtree(self.entries)
+        self._edges: list[list[RingEdges]] | None = None
+
+    def locate(self, lon: float, lat: float) -> AdminArea | None:
+        for position, rings in self.tree.query_point(lon, lat):
+            if point_in_rings(lon, lat, rings):
+                return self.areas[position]
+        return None
+
+    def within(
+        self, lon: float, lat: float, radius_km: float
+    ) -> list[tuple[AdminArea, float]]:
+        """
+        Areas within ``radius_km`` of a point as (area, distance_km), closest
+        first; the distance is 0 for the area containing the point.
+        """
+        distances: dict[int, float] = {}
+        for position, rings in self.tree.query(radius_bbox(lon, lat, radius_km)):
+            if point_in_rings(lon, lat, rings):
+                distance = 0.0
+            else:
+                edges = [ring_edges(ring) for ring in rings]
+                distance = float(
+                    min(
+                        point_segment_distances_km(lon, lat, x1, y1, x2, y2).min()
+                        for x1, y1, x2, y2 in edges
+                        if x1.size
+                    )
+                )
+            if distance <= radius_km and distance < distances.get(position, math.inf):
+                distances[position] = distance
+        return sorted(
+            (
+                (self.areas[position], distance)
+                for position, distance in distances.items()
+            ),
+            key=lambda item: item[1],
+        )
+
+    def locate_many(self, lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+        """
+        Vectorized lookup of many points.
+
+        Points are sorted by longitude once so each polygon's candidates are
+        a binary-searched slice narrowed by a latitude mask; only those go
+        through the vectorized ray casting test.
+
+        Returns:
+            Array of positions into ``self.areas``, -1 where nothing matched
+        """
+        if self._edges is None:
+            self._edges = [
+                [ring_edges(ring) for ring in rings] for _, (_, rings) in self.entries
+            ]
+
+        result = np.full(len(lons), -1, dtype=np.int64)
+        order = np.argsort(lons, kind="stable")
+        sorted_lons = lons[order]
+        for (bbox, (position, _)), edges in zip(self.entries, self._edges, strict=True):
+            lo = np.searchsorted(sorted_lons, bbox[0], side="left")
+            hi = np.searchsorted(sorted_lons, bbox[2], side="right")
+            if lo == hi:
+                continue
+            candidates = order[lo:hi]
+            candidates = candidates[
+                (result[candidates] < 0)
+                & (lats[candidates] >= bbox[1])
+                & (lats[candidates] <= bbox[3])
+            ]
+            if candidates.size == 0:
+                continue
+            inside = points_in_rings(lons[candidates], lats[candidates], edges)
+            result[candidates[inside]] = position
+        return result
+
+
+class AdminIndex:
+    """
+    Point-in-polygon index over district and region boundaries.
+
+    Lookups do an STR-tree bounding-box prefilter followed by an exact
+    ray-casting test on the few candidate polygons.
+    """
+
+    def __init__(self, regions: Sequence[AdminArea], districts: Sequence[AdminArea]):
+        self.regions_by_id: dict[int, AdminArea] = {r.id: r for r in regions}
+        self.districts_by_id: dict[int, AdminArea] = {d.id: d for d in districts}
+        self._regions = _PolygonLayer(regions)
+        self._districts = _PolygonLayer(districts)
+
+    def locate_district(self, lon: float, lat: float) -> AdminArea | None:
+        return self._districts.locate(lon, lat)
+
+    def locate_region(self, lon: float, lat: float) -> AdminArea | None:
+        return self._regions.locate(lon, lat)
+
+    def district_polygons(self, bbox: BBox) -> list[tuple[AdminArea, list[Ring]]]:
+        """
+        District polygons whose bounding box intersects ``bbox``.
+        """
+        return [
+            (self._districts.areas[pos], rings)
+            for pos, rings in self._districts.tree.query(bbox)
+        ]
+
+    def districts_within(
+        self, lon: float, lat: float, radius_km: float
+    ) -> list[tuple[AdminArea, float]]:
+        """
+        Districts whose boundary comes within ``radius_km`` of a point, as
+        (district, distance_km), closest first (0 for the containing one).
+        """
+        return self._districts.within(lon, lat, radius_km)
+
+    def locate(self, lon: float, lat: float) -> AdminMatch:
+        """
+        Find the district and region containing a point.
+
+        The region is taken from the district when one matches, and falls back
+        to the region polygons otherwise (e.g. gaps in district coverage).
+        """
+        district = self.locate_district(lon, lat)
+        region = None
+        if district and district.region_id is not None:
+            region = self.regions_by_id.get(district.region_id)
+        if region is None:
+            region = self.locate_region(lon, lat)
+        return AdminMatch(district=district, region=region)
+
+    def locate_many(self, lons: np.ndarray, lats: np.ndarray) -> list[AdminMatch]:
+        """
+        Batch version of ``locate`` using vectorized point-in-polygon tests.
+        """
+        district_pos = self._districts.locate_many(lons, lats)
+        districts = self._districts.areas
+        matches = [
+            AdminMatch(district=districts[pos] if pos >= 0 else None, region=None)
+            for pos in district_pos.tolist()
+        ]
+        for match in matches:
+            if match.district and match.district.region_id is not None:
+                match.region = self.regions_by_id.get(match.district.region_id)
+
+        missing = np.fromiter(
+            (i for i, match in enumerate(matches) if match.region is None),
+            dtype=np.int64,
+        )
+        if missing.size:
+            region_pos = self._regions.locate_many(lons[missing], lats[missing])
+            regions = self._regions.areas
+            for i, pos in zip(missing.tolist(), region_pos.tolist(), strict=True):
+                if pos >= 0:
+                    matches[i].region = regions[pos]
+        return matches
+
+
+def _stored_bbox(row: Any) -> BBox | None:
+    """Bbox precomputed by the loader, if present."""
+    if row.min_lon is None:
+        return None
+    return (row.min_lon, row.min_lat, row.max_lon, row.max_lat)
+
+
+def build_admin_index(db: Session) -> AdminIndex:
+    regions = [
+        AdminArea(
+            id=row.id,
+            code=row.code,
+            name=row.name,
+            bbox=_stored_bbox(row),
+            polygons=polygons_of(row.geometry),
+        )
+        for row in db.exec(select(models.Region)).all()
+    ]
+    districts = [
+        AdminArea(
+            id=row.id,
+            code=row.code,
+            name=row.name,
+            bbox=_stored_bbox(row),
+            polygons=polygons_of(row.geometry),
+            region_id=row.region_id,
+        )
+        for row in db.exec(select(models.District)).all()
+    ]
+    for area in (*regions, *districts):
+        if area.bbox is None:
+            area.bbox = bbox_of_points([p for rings in area.polygons for p in rings[0]])
+    return AdminIndex(regions, districts)
+
+
+admin_index: CachedIndex[AdminIndex] = CachedIndex(
+    "admin boundaries", [models.Region, models.District], build_admin_index
+)
+
+
+def get_admin_index(db: Session) -> AdminIndex:
+    return admin_index.get(db)
+
+
+class PointIndex:
+    """
+    Nearest-neighbour index over point features (airports, ports, ...).
+
+    Points are stored as unit vectors in a k-d tree, so euclidean
+    nearest neighbours are exactly the great-circle (haversine) nearest ones.
+    """
+
+    def __init__(self, points: Sequence[tuple[int, float, float]]):
+        self.tree: KDTree[int] = KDTree(
+            [(unit_vector(lat, lon), id_) for id_, lat, lon in points]
+        )
+
+    def __len__(self) -> int:
+        return len(self.tree)
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> list[tuple[int, float]]:
+        """
+        Return up to k (id, distance_km) pairs, closest first.
+        """
+        return [
+            (id_, chord_to_km(chord))
+            for chord, id_ in self.tree.nearest(unit_vector(lat, lon), k)
+        ]
+
+    def within(
+        self, lat: float, lon: float, radius_km: float
+    ) -> list[tuple[int, float]]:
+        """
+        Return all (id, distance_km) pairs within ``radius_km``, closest first.
+        """
+        chord = 2 * math.sin(min(math.pi, radius_km / EARTH_RADIUS_KM) / 2)
+        return [
+            (id_, chord_to_km(c))
+            for c, id_ in self.tree.within(unit_vector(lat, lon), chord)
+        ]
+
+
+def _point_index_builder(table: Any) -> Callable[[Session], PointIndex]:
+    def build(db: Session) -> PointIndex:
+        rows = db.exec(select(table.id, table.latitude, table.longitude)).all()
+        return PointIndex(list(rows))
+
+    return build
+
+
+transport_indexes: dict[str, CachedIndex[PointIndex]] = {
+    kind: CachedIndex(f"{kind} locations", [table], _point_index_builder(table))
+    for kind, table in (
+        ("airport", models.Airport),
+        ("port", models.Port),
+        ("checkpoint", models.Checkpoint),
+    )
+}
+
+
+def get_transport_index(db: Session, kind: str) -> PointIndex:
+    return transport_indexes[kind].get(db)
+
+
+class RoadIndex:
+    """
+    Bounding-box index over road polylines.
+
+    Per-road bboxes live in an STR-tree; all vertices are kept in flat NumPy
+    arrays (``starts[i]:starts[i + 1]`` slices road i) so candidate roads
+    that only partly overlap the query box can be checked segment by
+    segment in a single vectorized pass.
+    """
+
+    def __init__(
+        self,
+        roads: Sequence[tuple[int, Sequence[Sequence[float]]]],
+        types: Sequence[str] | None = None,
+        names: Sequence[str] | None = None,
+        surfaces: Sequence[str | None] | None = None,
+    ):
+        self.ids = np.array([road_id for road_id, _ in roads], dtype=np.int64)
+        self.types = list(types) if types is not None else [""] * len(roads)
+        self.names = list(names) if names is not None else [""] * len(roads)
+        self.surfaces = list(surfaces) if surfaces is not None else [None] * len(roads)
+        lengths = np.array([len(coords) for _, coords in roads], dtype=np.int64)
+        self.starts = np.concatenate(([0], np.cumsum(lengths)))
+        flat = np.fromiter(
+            itertools.chain.from_iterable(
+                point for _, coords in roads for point in coords
+            ),
+            dtype=np.float64,
+        )
+        if flat.size == 2 * lengths.sum():
+            coords = flat.reshape(-1, 2)
+        else:
+            # Some positions carry an altitude
+            coords = np.array(
+                [point[:2] for _, line in roads for point in line], dtype=np.float64
+            )
+        self.xs = coords[:, 0]
+        self.ys = coords[:, 1]
+
+        entries = []
+        for position, (start, end) in enumerate(
+            zip(self.starts[:-1], self.starts[1:], strict=True)
+        ):
+            if end > start:
+                xs, ys = self.xs[start:end], self.ys[start:end]
+                entries.append(
+                    (
+                        (
+                            float(xs.min()),
+                            float(ys.min()),
+                            float(xs.max()),
+                            float(ys.max()),
+                        ),
+                        position,
+                    )
+                )
+        self.tree: STRtree[int] = STRtree(entries)
+        self._boxes = np.full((len(roads), 4), np.nan)
+        for box, position in entries:
+            self._boxes[position] = box
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def query(self, bbox: BBox, exact: bool = True) -> list[int]:
+        """
+        Return ids of roads intersecting ``bbox``, sorted ascending.
+
+        Args:
+            bbox: (min_lon, min_lat, max_lon, max_lat)
+            exact: If False, return every road whose bbox intersects the
+                query box without checking individual segments
+        """
+        ids: list[int] = np.sort(self.ids[self.query_positions(bbox, exact)]).tolist()
+        return ids
+
+    def query_positions(self, bbox: BBox, exact: bool = True) -> np.ndarray:
+        """
+        Like ``query`` but returns internal positions (see ``coords``).
+        """
+        positions = np.array(self.tree.query(bbox), dtype=np.int64)
+        if exact and positions.size:
+            # Roads whose bbox lies inside the query box need no segment test
+            boxes = self._boxes[positions]
+            contained = (
+                (boxes[:, 0] >= bbox[0])
+                & (boxes[:, 2] <= bbox[2])
+                & (boxes[:, 1] >= bbox[1])
+                & (boxes[:, 3] <= bbox[3])
+            )
+            positions = np.concatenate(
+                (positions[contained], self._segment_hits(positions[~contained], bbox))
+            )
+        return positions
+
+    def coords(self, position: int) -> np.ndarray:
+        """
+        (n, 2) array of [lon, lat] vertices of the road at ``position``.
+        """
+        start, end = self.starts[position], self.starts[position + 1]
+        return np.column_stack((self.xs[start:end], self.ys[start:end]))
+
+    def within(
+        self, lon: float, lat: float, radius_km: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Roads passing within ``radius_km`` of a point.
+
+        Returns:
+            (positions, distances_km) sorted by distance
+        """
+        pos = self.query_positions(radius_bbox(lon, lat, radius_km), exact=False)
+        pos = pos[self.starts[pos + 1] > self.starts[pos]]
+        if not pos.size:
+            return pos, np.empty(0)
+        owner, first, second = self._segments(pos)
+        distances = np.full(len(pos), np.inf)
+        np.minimum.at(
+            distances,
+            owner,
+            point_segment_distances_km(
+                lon,
+                lat,
+                self.xs[first],
+                self.ys[first],
+                self.xs[second],
+                self.ys[second],
+            ),
+        )
+        inside = distances <= radius_km
+        pos, distances = pos[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        return pos[order], distances[order]
+
+    def _segments(self, pos: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(owner index into pos, first vertex, second vertex) of every segment."""
+        starts = self.starts[pos]
+        counts = self.starts[pos + 1] - starts
+        # Single-vertex roads are degenerate segments (start == end)
+        seg_counts = np.maximum(counts - 1, 1)
+        owner = np.repeat(np.arange(len(pos)), seg_counts)
+        offsets = np.arange(seg_counts.sum()) - np.repeat(
+            np.cumsum(seg_counts) - seg_counts, seg_counts
+        )
+        first = starts[owner] + offsets
+        second = np.minimum(first + 1, (starts + counts - 1)[owner])
+        return owner, first, second
+
+    def _segment_hits(self, pos: np.ndarray, bbox: BBox) -> np.ndarray:
+        if not pos.size:
+            return pos
+        owner, first, second = self._segments(pos)
+        hits = segments_intersect_bbox(
+            self.xs[first], self.ys[first], self.xs[second], self.ys[second], bbox
+        )
+        hit_pos: np.ndarray = pos[np.unique(owner[hits])]
+        return hit_pos
+
+
+def _build_road_index(db: Session) -> RoadIndex:
+    roads = db.exec(select(models.Road)).all()
+    return RoadIndex(
+        [(road.id, road.geometry or []) for road in roads],
+        types=[road.type for road in roads],
+        names=[road.name for road in roads],
+        surfaces=[road.surface for road in roads],
+    )
+
+
+road_index: CachedIndex[RoadIndex] = CachedIndex(
+    "road", [models.Road], _build_road_index
+)
+
+
+def get_road_index(db: Session) -> RoadIndex:
+    return road_index.get(db)
+
+
+# Zoom levels with precomputed simplified boundaries; above the last level
+# the full-resolution geometry is served.
+SIMPLIFY_ZOOM_LEVELS = range(0, 13)
+
+
+def zoom_tolerance(zoom: int) -> float:
+    """
+    Simplification tolerance for a web map zoom level: one 256px tile pixel
+    in degrees.
+    """
+    return 360.0 / (256 * 2.0**zoom)
+
+
+class SimplifiedGeometries:
+    """
+    Douglas-Peucker simplified boundaries, precomputed per zoom level.
+    """
+
+    def __init__(self, geometries: dict[int, dict[str, Any] | None]):
+        self.levels: dict[int, dict[int, dict[str, Any] | None]] = {
+            zoom: {
+                id_: simplify_geometry(geom, zoom_tolerance(zoom))
+                for id_, geom in geometries.items()
+            }
+            for zoom in SIMPLIFY_ZOOM_LEVELS
+        }
+
+    @staticmethod
+    def level_for(
+        zoom: int | None = None, tolerance: float | None = None
+    ) -> int | None:
+        """
+        Pick the precomputed level for a zoom or tolerance request.
+
+        A tolerance maps to the coarsest level that does not exceed it.
+        Returns None when full resolution should be served.
+        """
+        if zoom is not None:
+            return zoom if zoom in SIMPLIFY_ZOOM_LEVELS else None
+        if tolerance is not None:
+            for level in SIMPLIFY_ZOOM_LEVELS:
+                if zoom_tolerance(level) <= tolerance:
+                    return level
+        return None
+
+    def get(self, id_: int, level: int) -> dict[str, Any] | None:
+        return self.levels[level].get(id_)
+
+
+def _simplified_builder(table: Any) -> Callable[[Session], SimplifiedGeometries]:
+    def build(db: Session) -> SimplifiedGeometries:
+        rows = db.exec(select(table.id, table.geometry)).all()
+        return SimplifiedGeometries(dict(rows))
+
+    return build
+
+
+simplified_regions: CachedIndex[SimplifiedGeometries] = CachedIndex(
+    "simplified regions", [models.Region], _simplified_builder(models.Region)
+)
+simplified_districts: CachedIndex[SimplifiedGeometries] = CachedIndex(
+    "simplified districts", [models.District], _simplified_builder(models.District)
+)
+
+
+def warm_indexes(db: Session) -> None:
+    """
+    Build all indexes up front so the first requests don't pay for it.
+    """
+    for index in _registry:
+        if not index.warm():
+            continue
+        try:
+            index.get(db)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not build {index.name} index: {e}")
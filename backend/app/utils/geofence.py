@@ -0,0 +1,110 @@
+"""
+Geofencing of GPS point feeds for Somalia Geography API.
+
+A ``GeofenceTracker`` keeps the last known district and region of every
+tracked id and turns incoming pings into enter/exit events. Pings are
+processed in batches: a ping that is still inside its id's last district
+is confirmed with a single point-in-polygon test against that district,
+and only the remaining pings go through the admin index lookup.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from app import models
+from app.utils.geo_index import AdminArea, AdminIndex, AdminMatch
+from app.utils.geometry import bbox_contains_point, point_in_rings
+
+# Below this many unresolved pings, scalar lookups beat the vectorized scan
+# over every district polygon.
+BATCH_LOOKUP_MIN = 32
+
+
+def area_contains(area: AdminArea, lon: float, lat: float) -> bool:
+    """Point-in-polygon test against a single admin area."""
+    if area.bbox is not None and not bbox_contains_point(area.bbox, lon, lat):
+        return False
+    return any(point_in_rings(lon, lat, rings) for rings in area.polygons)
+
+
+class GeofenceTracker:
+    """
+    Per-id district/region state of a stream of pings.
+
+    Args:
+        admin: Admin index the pings are located with
+    """
+
+    def __init__(self, admin: AdminIndex):
+        self.admin = admin
+        # Keyed by the typed id: device 1 and device "1" are tracked apart
+        self.state: dict[str | int, AdminMatch] = {}
+
+    def _locate(self, pings: Sequence[models.GeofencePing]) -> list[AdminMatch]:
+        matches: list[AdminMatch | None] = []
+        unresolved: list[int] = []
+        for i, ping in enumerate(pings):
+            last = self.state.get(ping.id)
+            # Districts do not overlap, so a ping inside the id's last
+            # district is in that district whatever order it arrived in.
+            if (
+                last is not None
+                and last.district is not None
+                and area_contains(last.district, ping.lon, ping.lat)
+            ):
+                matches.append(last)
+            else:
+                matches.append(None)
+                unresolved.append(i)
+
+        if len(unresolved) >= BATCH_LOOKUP_MIN:
+            lons = np.array([pings[i].lon for i in unresolved], dtype=np.float64)
+            lats = np.array([pings[i].lat for i in unresolved], dtype=np.float64)
+            for i, match in zip(
+                unresolved, self.admin.locate_many(lons, lats), strict=True
+            ):
+                matches[i] = match
+        else:
+            for i in unresolved:
+                matches[i] = self.admin.locate(pings[i].lon, pings[i].lat)
+        return [match for match in matches if match is not None]  # all resolved above
+
+    def update(
+        self, pings: Sequence[models.GeofencePing]
+    ) -> list[models.GeofenceEvent]:
+        """
+        Process a batch of pings (in arrival order) and return the events.
+
+        When an id changes area, exits are reported innermost first
+        (district, then region) and enters outermost first. The first ping
+        of an id reports the areas it starts in as enters.
+        """
+        events: list[models.GeofenceEvent] = []
+        for ping, match in zip(pings, self._locate(pings), strict=True):
+            last = self.state.get(ping.id, AdminMatch(district=None, region=None))
+            changes: list[tuple[str, str, AdminArea]] = []
+            for level in ("district", "region"):
+                before, after = getattr(last, level), getattr(match, level)
+                if before is not None and (after is None or after.id != before.id):
+                    changes.append(("exit", level, before))
+            for level in ("region", "district"):
+                before, after = getattr(last, level), getattr(match, level)
+                if after is not None and (before is None or before.id != after.id):
+                    changes.append(("enter", level, after))
+            for event, level, area in changes:
+                events.append(
+                    models.GeofenceEvent(
+                        id=ping.id,
+                        event=event,
+                        level=level,
+                        area_id=area.id,
+                        code=area.code,
+                        name=area.name,
+                        lat=ping.lat,
+                        lon=ping.lon,
+                        ts=ping.ts,
+                    )
+                )
+            self.state[ping.id] = match
+        return events
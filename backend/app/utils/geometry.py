@@ -0,0 +1,664 @@
+"""
+Planar and geodesic geometry helpers for Somalia Geography API.
+
+Geometries are plain GeoJSON dictionaries (as stored in the JSON columns),
+with coordinates in [lon, lat] order.
+"""
+
+import itertools
+import math
+from collections.abc import Iterator, Sequence
+from typing import Any, NamedTuple
+
+import numpy as np
+
+# (min_lon, min_lat, max_lon, max_lat)
+BBox = tuple[float, float, float, float]
+Ring = list[tuple[float, float]]
+# Edge arrays (x1, y1, x2, y2) of a ring
+RingEdges = tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two points in kilometres.
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def unit_vector(lat: float, lon: float) -> tuple[float, float, float]:
+    """
+    Position on the unit sphere; euclidean (chord) distance between unit
+    vectors is monotonic in great-circle distance.
+    """
+    phi = math.radians(lat)
+    lmb = math.radians(lon)
+    return (math.cos(phi) * math.cos(lmb), math.cos(phi) * math.sin(lmb), math.sin(phi))
+
+
+def chord_to_km(chord: float) -> float:
+    """
+    Convert a unit-sphere chord length to great-circle distance in kilometres.
+    """
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def polygons_of(geom: dict[str, Any] | None) -> list[list[Ring]]:
+    """
+    Return the polygons of a Polygon/MultiPolygon geometry as lists of rings.
+
+    Each ring is a list of (lon, lat) tuples; the first ring of a polygon is
+    the exterior, the rest are holes. Other geometry types yield no polygons.
+    """
+    if not geom:
+        return []
+    geom_type = geom.get("type")
+    coords = geom.get("coordinates") or []
+    if geom_type == "Polygon":
+        raw_polygons = [coords]
+    elif geom_type == "MultiPolygon":
+        raw_polygons = coords
+    else:
+        return []
+
+    polygons = []
+    for raw_polygon in raw_polygons:
+        rings = [
+            [(float(p[0]), float(p[1])) for p in ring] for ring in raw_polygon if ring
+        ]
+        if rings:
+            polygons.append(rings)
+    return polygons
+
+
+def iter_points(geom: dict[str, Any] | None) -> Iterator[tuple[float, float]]:
+    """
+    Yield every (lon, lat) vertex of a GeoJSON geometry.
+    """
+    if not geom:
+        return
+
+    def _walk(coords: Any) -> Iterator[tuple[float, float]]:
+        if coords and isinstance(coords[0], (int, float)):
+            yield float(coords[0]), float(coords[1])
+        else:
+            for child in coords:
+                yield from _walk(child)
+
+    yield from _walk(geom.get("coordinates") or [])
+
+
+def bbox_of_points(points: Sequence[Sequence[float]]) -> BBox | None:
+    """
+    Bounding box of a sequence of [lon, lat] points, or None if empty.
+    """
+    if not points:
+        return None
+    lons = [p[0] for p in points]
+    lats = [p[1] for p in points]
+    return (min(lons), min(lats), max(lons), max(lats))
+
+
+def bbox_of_geometry(geom: dict[str, Any] | None) -> BBox | None:
+    """
+    Bounding box of a GeoJSON geometry, or None if it has no coordinates.
+    """
+    return bbox_of_points(list(iter_points(geom)))
+
+
+def bbox_intersects(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def bbox_contains_point(bbox: BBox, lon: float, lat: float) -> bool:
+    return bbox[0] <= lon <= bbox[2] and bbox[1] <= lat <= bbox[3]
+
+
+def point_in_rings(lon: float, lat: float, rings: Sequence[Ring]) -> bool:
+    """
+    Even-odd ray casting test against all rings of a polygon.
+
+    Holes are handled naturally because a point inside a hole crosses
+    an even number of edges.
+    """
+    inside = False
+    for ring in rings:
+        n = len(ring)
+        if n < 3:
+            continue
+        x1, y1 = ring[-1]
+        for x2, y2 in ring:
+            if (y2 > lat) != (y1 > lat):
+                x_cross = x2 + (lat - y2) * (x1 - x2) / (y1 - y2)
+                if lon < x_cross:
+                    inside = not inside
+            x1, y1 = x2, y2
+    return inside
+
+
+def point_in_geometry(lon: float, lat: float, geom: dict[str, Any] | None) -> bool:
+    """
+    Exact point-in-polygon test for a Polygon/MultiPolygon geometry.
+    """
+    return any(point_in_rings(lon, lat, rings) for rings in polygons_of(geom))
+
+
+def ring_edges(ring: Ring) -> RingEdges:
+    """
+    Edge arrays (x1, y1, x2, y2) of a ring, for vectorized tests.
+    """
+    xs = np.fromiter((p[0] for p in ring), dtype=np.float64, count=len(ring))
+    ys = np.fromiter((p[1] for p in ring), dtype=np.float64, count=len(ring))
+    return xs, ys, np.roll(xs, 1), np.roll(ys, 1)
+
+
+def points_in_rings(
+    lons: np.ndarray,
+    lats: np.ndarray,
+    edges: Sequence[RingEdges],
+    max_cells: int = 1_000_000,
+) -> np.ndarray:
+    """
+    Vectorized even-odd ray casting of many points against one polygon.
+
+    Args:
+        lons: Point longitudes
+        lats: Point latitudes
+        edges: ``ring_edges`` of every ring of the polygon
+        max_cells: Upper bound on the points x edges matrix built per chunk
+
+    Returns:
+        Boolean array, True where the point is inside the polygon
+    """
+    inside = np.zeros(len(lons), dtype=bool)
+    for x1, y1, x2, y2 in edges:
+        if len(x1) == 0:
+            continue
+        chunk = max(1, max_cells // len(x1))
+        for start in range(0, len(lons), chunk):
+            px = lons[start : start + chunk, None]
+            py = lats[start : start + chunk, None]
+            straddles = (y1 > py) != (y2 > py)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+            crossings = np.count_nonzero(straddles & (px < x_cross), axis=1)
+            inside[start : start + chunk] ^= (crossings % 2).astype(bool)
+    return inside
+
+
+def segments_intersect_bbox(
+    x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, bbox: BBox
+) -> np.ndarray:
+    """
+    Vectorized segment / axis-aligned box intersection test.
+
+    Uses the separating axis theorem: a segment misses the box only if
+    their x or y extents are disjoint, or all four box corners lie strictly
+    on the same side of the segment's line.
+    """
+    min_x, min_y, max_x, max_y = bbox
+    overlap = (
+        (np.minimum(x1, x2) <= max_x)
+        & (np.maximum(x1, x2) >= min_x)
+        & (np.minimum(y1, y2) <= max_y)
+        & (np.maximum(y1, y2) >= min_y)
+    )
+    dx = x2 - x1
+    dy = y2 - y1
+    sides = [
+        dx * (cy - y1) - dy * (cx - x1)
+        for cx, cy in ((min_x, min_y), (max_x, min_y), (max_x, max_y), (min_x, max_y))
+    ]
+    all_positive = (sides[0] > 0) & (sides[1] > 0) & (sides[2] > 0) & (sides[3] > 0)
+    all_negative = (sides[0] < 0) & (sides[1] < 0) & (sides[2] < 0) & (sides[3] < 0)
+    hits: np.ndarray = overlap & ~all_positive & ~all_negative
+    return hits
+
+
+def parse_bbox(value: str) -> BBox:
+    """
+    Parse a "minLon,minLat,maxLon,maxLat" string.
+
+    Raises:
+        ValueError: If the string is malformed or the box is inverted
+    """
+    parts = value.split(",")
+    if len(parts) != 4:
+        raise ValueError(
+            "expected 4 comma-separated numbers: minLon,minLat,maxLon,maxLat"
+        )
+    min_lon, min_lat, max_lon, max_lat = (float(p) for p in parts)
+    if not all(math.isfinite(v) for v in (min_lon, min_lat, max_lon, max_lat)):
+        raise ValueError("coordinates must be finite numbers")
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("min values must not exceed max values")
+    return (min_lon, min_lat, max_lon, max_lat)
+
+
+def parse_lat_lon(value: str) -> tuple[float, float]:
+    """
+    Parse a "lat,lon" string.
+
+    Raises:
+        ValueError: If the string is malformed or out of range
+    """
+    parts = value.split(",")
+    if len(parts) != 2:
+        raise ValueError("expected 'lat,lon'")
+    lat, lon = (float(p) for p in parts)
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("lat must be in -90..90 and lon in -180..180")
+    return lat, lon
+
+
+def haversine_km_array(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized great-circle distance in kilometres.
+    """
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = np.radians(lon2 - lon1)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    distances: np.ndarray = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+    return distances
+
+
+def radius_bbox(lon: float, lat: float, radius_km: float) -> BBox:
+    """
+    Bounding box of all points within ``radius_km`` of (lon, lat).
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(min(89.0, abs(lat) + dlat)))
+    dlon = min(180.0, radius_km / (KM_PER_DEGREE * cos_lat))
+    return (lon - dlon, lat - dlat, lon + dlon, lat + dlat)
+
+
+def point_segment_distances_km(
+    lon: float,
+    lat: float,
+    x1: np.ndarray,
+    y1: np.ndarray,
+    x2: np.ndarray,
+    y2: np.ndarray,
+) -> np.ndarray:
+    """
+    Distance in kilometres from a point to each segment (x1, y1)-(x2, y2).
+
+    Uses a local equirectangular projection around the point, which is
+    accurate to well under 1% for the short distances of radius searches.
+    """
+    km_per_lon = KM_PER_DEGREE * math.cos(math.radians(lat))
+    ax = (x1 - lon) * km_per_lon
+    ay = (y1 - lat) * KM_PER_DEGREE
+    dx = (x2 - lon) * km_per_lon - ax
+    dy = (y2 - lat) * KM_PER_DEGREE - ay
+    length2 = dx * dx + dy * dy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.clip(
+            np.where(length2 > 0, -(ax * dx + ay * dy) / length2, 0.0), 0.0, 1.0
+        )
+    return np.hypot(ax + t * dx, ay + t * dy)
+
+
+def line_metrics(
+    lines: Sequence[Sequence[Sequence[float]] | None],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Geodesic lengths and bounding boxes of many [[lon, lat], ...] lines in
+    one vectorized pass.
+
+    All coordinates are flattened into a single array; the haversine
+    distance is computed for every consecutive pair and the pairs that
+    straddle two lines are dropped before summing per line.
+
+    Returns:
+        (lengths_km, bboxes): arrays of shape (n,) and (n, 4); lines without
+        coordinates get length 0 and a NaN bbox
+    """
+    n = len(lines)
+    counts = np.fromiter(
+        (len(line) if line else 0 for line in lines), dtype=np.int64, count=n
+    )
+    lengths: np.ndarray = np.zeros(n)
+    bboxes = np.full((n, 4), np.nan)
+    if not counts.any():
+        return lengths, bboxes
+
+    flat = np.fromiter(
+        itertools.chain.from_iterable(
+            itertools.chain.from_iterable(line for line in lines if line)
+        ),
+        dtype=np.float64,
+    )
+    if flat.size == 2 * counts.sum():
+        coords = flat.reshape(-1, 2)
+    else:
+        # Some positions carry an altitude
+        coords = np.array(
+            [p[:2] for line in lines if line for p in line], dtype=np.float64
+        )
+    owner = np.repeat(np.arange(n), counts)
+    xs, ys = coords[:, 0], coords[:, 1]
+
+    same_line = owner[1:] == owner[:-1]
+    segment_km = haversine_km_array(ys[:-1], xs[:-1], ys[1:], xs[1:])
+    lengths = np.bincount(owner[1:][same_line], segment_km[same_line], n)
+
+    present = counts > 0
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[present]
+    bboxes[present] = np.column_stack(
+        (
+            np.minimum.reduceat(xs, starts),
+            np.minimum.reduceat(ys, starts),
+            np.maximum.reduceat(xs, starts),
+            np.maximum.reduceat(ys, starts),
+        )
+    )
+    return lengths, bboxes
+
+
+def line_length_inside_km(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    edges: Sequence[RingEdges],
+) -> float:
+    """
+    Length in kilometres of the part of a polyline lying inside a polygon.
+
+    Each segment is split at its crossings with the polygon edges; the
+    pieces whose midpoints are inside the polygon are summed.
+
+    Args:
+        xs: Polyline longitudes
+        ys: Polyline latitudes
+        edges: ``ring_edges`` of every ring of the polygon
+    """
+    if len(xs) < 2 or not edges:
+        return 0.0
+    if len(edges) == 1:
+        qx1, qy1, qx2, qy2 = edges[0]
+    else:
+        qx1, qy1, qx2, qy2 = (np.concatenate([e[i] for e in edges]) for i in range(4))
+
+    # Only edges level with the line and not entirely left of it can affect
+    # a +x ray cast from a point on the line; of those, only edges that also
+    # overlap the line's bbox can cross it. Parity is additive across rings,
+    # so the filtered edges can be tested as one set.
+    min_x, max_x, min_y, max_y = xs.min(), xs.max(), ys.min(), ys.max()
+    relevant = (
+        (np.maximum(qy1, qy2) >= min_y)
+        & (np.minimum(qy1, qy2) <= max_y)
+        & (np.maximum(qx1, qx2) >= min_x)
+    )
+    ray_edges = [(qx1[relevant], qy1[relevant], qx2[relevant], qy2[relevant])]
+    near = relevant & (np.minimum(qx1, qx2) <= max_x)
+    qx1, qy1, qx2, qy2 = qx1[near], qy1[near], qx2[near], qy2[near]
+
+    segment_km = haversine_km_array(ys[:-1], xs[:-1], ys[1:], xs[1:])
+    if not qx1.size:
+        # No boundary near the line: it is entirely inside or outside
+        inside_first = points_in_rings(xs[:1], ys[:1], ray_edges)[0]
+        return float(segment_km.sum()) if inside_first else 0.0
+
+    # Segment A + t (B - A) meets edge Q1 + u (Q2 - Q1)
+    ax, ay, bx, by = xs[:-1, None], ys[:-1, None], xs[1:, None], ys[1:, None]
+    rx, ry = bx - ax, by - ay
+    sx, sy = qx2 - qx1, qy2 - qy1
+    denom = rx * sy - ry * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = ((qx1 - ax) * sy - (qy1 - ay) * sx) / denom
+        u = ((qx1 - ax) * ry - (qy1 - ay) * rx) / denom
+    crossing = (denom != 0) & (t > 0) & (t < 1) & (u >= 0) & (u <= 1)
+
+    max_crossings = int(crossing.sum(axis=1).max())
+    if max_crossings == 0:
+        # Every segment is entirely inside or outside
+        mid_x = (xs[:-1] + xs[1:]) / 2
+        mid_y = (ys[:-1] + ys[1:]) / 2
+        return float(segment_km @ points_in_rings(mid_x, mid_y, ray_edges))
+
+    # Unused split slots are 1.0, giving empty pieces
+    splits = np.sort(np.where(crossing, t, 1.0), axis=1)[:, :max_crossings]
+    segments = len(xs) - 1
+    bounds = np.hstack((np.zeros((segments, 1)), splits, np.ones((segments, 1))))
+    lo, hi = bounds[:, :-1], bounds[:, 1:]
+    mid = (lo + hi) / 2
+
+    mid_x = (ax + rx * mid).ravel()
+    mid_y = (ay + ry * mid).ravel()
+    inside = points_in_rings(mid_x, mid_y, ray_edges).reshape(mid.shape)
+    return float(((hi - lo) * inside).sum(axis=1) @ segment_km)
+
+
+class AreaMetrics(NamedTuple):
+    area_km2: float
+    centroid: tuple[float, float]  # (lon, lat)
+    bbox: BBox
+
+
+def area_metrics(
+    geometries: Sequence[dict[str, Any] | None],
+) -> list[AreaMetrics | None]:
+    """
+    Geodesic area, area-weighted centroid and bounding box of many
+    Polygon/MultiPolygon geometries in one vectorized pass.
+
+    Every ring of every geometry is flattened into a single edge array and
+    per-ring sums are taken with ``np.bincount``. Holes are subtracted
+    whatever their winding order. The area is the spherical polygon area
+    (Chamberlain & Duquette); the centroid is the planar centroid of the
+    surface in lon/lat, so it accounts for every polygon and hole rather
+    than averaging vertices.
+
+    Returns:
+        One entry per geometry; None for geometries without polygons
+    """
+    rings: list[np.ndarray] = []
+    ring_owner: list[int] = []
+    ring_sign: list[float] = []
+    for index, geom in enumerate(geometries):
+        for polygon in polygons_of(geom):
+            for ring_index, ring in enumerate(polygon):
+                if len(ring) < 3:
+                    continue
+                rings.append(np.asarray(ring, dtype=np.float64))
+                ring_owner.append(index)
+                ring_sign.append(1.0 if ring_index == 0 else -1.0)
+
+    results: list[AreaMetrics | None] = [None] * len(geometries)
+    if not rings:
+        return results
+
+    lengths = np.fromiter(
+        (len(ring) for ring in rings), dtype=np.int64, count=len(rings)
+    )
+    points = np.concatenate(rings)
+    edge_ring = np.repeat(np.arange(len(rings)), lengths)
+    # Next vertex of each vertex within its ring (cyclic, so open and
+    # closed rings are handled alike)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    following = np.arange(len(points)) + 1
+    following[starts + lengths - 1] = starts
+    x1, y1 = points[:, 0], points[:, 1]
+    x2, y2 = x1[following], y1[following]
+
+    n_rings = len(rings)
+    cross = x1 * y2 - x2 * y1
+    planar = np.bincount(edge_ring, cross, n_rings) / 2
+    moment_x = np.bincount(edge_ring, (x1 + x2) * cross, n_rings) / 6
+    moment_y = np.bincount(edge_ring, (y1 + y2) * cross, n_rings) / 6
+    spherical = (
+        np.abs(
+            np.bincount(
+                edge_ring,
+                np.radians(x2 - x1)
+                * (2 + np.sin(np.radians(y1)) + np.sin(np.radians(y2))),
+                n_rings,
+            )
+        )
+        * EARTH_RADIUS_KM**2
+        / 2
+    )
+
+    owner = np.asarray(ring_owner)
+    sign = np.asarray(ring_sign)
+    # Orient every ring so exteriors add and holes subtract
+    factor = sign * np.sign(planar)
+    n_geoms = len(geometries)
+    area = np.bincount(owner, planar * factor, n_geoms)
+    centroid_x = np.bincount(owner, moment_x * factor, n_geoms)
+    centroid_y = np.bincount(owner, moment_y * factor, n_geoms)
+    area_km2 = np.maximum(np.bincount(owner, spherical * sign, n_geoms), 0.0)
+
+    vertex_owner = owner[edge_ring]
+    min_x = np.full(n_geoms, np.inf)
+    min_y = np.full(n_geoms, np.inf)
+    max_x = np.full(n_geoms, -np.inf)
+    max_y = np.full(n_geoms, -np.inf)
+    np.minimum.at(min_x, vertex_owner, x1)
+    np.minimum.at(min_y, vertex_owner, y1)
+    np.maximum.at(max_x, vertex_owner, x1)
+    np.maximum.at(max_y, vertex_owner, y1)
+
+    for index in np.unique(owner).tolist():
+        bbox = (
+            float(min_x[index]),
+            float(min_y[index]),
+            float(max_x[index]),
+            float(max_y[index]),
+        )
+        if area[index] > 0:
+            centroid = (
+                float(centroid_x[index] / area[index]),
+                float(centroid_y[index] / area[index]),
+            )
+        else:
+            # Degenerate (zero-area) geometry: fall back to the bbox centre
+            centroid = ((bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2)
+        results[index] = AreaMetrics(float(area_km2[index]), centroid, bbox)
+    return results
+
+
+def convex_hull(points: Sequence[Sequence[float]] | np.ndarray) -> Ring:
+    """
+    Convex hull of (lon, lat) points (Andrew's monotone chain).
+
+    Returns:
+        Closed counter-clockwise ring; fewer than 4 positions when the
+        points are all collinear or coincident
+    """
+    unique = sorted({(float(p[0]), float(p[1])) for p in points})
+    if len(unique) < 3:
+        return unique
+
+    def cross(
+        o: tuple[float, float], a: tuple[float, float], b: tuple[float, float]
+    ) -> float:
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower: Ring = []
+    for p in unique:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    upper: Ring = []
+    for p in reversed(unique):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    hull = lower[:-1] + upper[:-1]
+    return hull + hull[:1]
+
+
+def simplify_line(
+    points: Sequence[tuple[float, float]], tolerance: float
+) -> list[tuple[float, float]]:
+    """
+    Douglas-Peucker simplification of a polyline.
+
+    Args:
+        points: (lon, lat) vertices
+        tolerance: Maximum allowed deviation in degrees
+
+    Returns:
+        Simplified vertices, always keeping the first and last point
+    """
+    if len(points) < 3 or tolerance <= 0:
+        return list(points)
+    coords = np.asarray(points, dtype=np.float64)
+    keep = np.zeros(len(coords), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(coords) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = coords[first], coords[last]
+        inner = coords[first + 1 : last]
+        dx, dy = end - start
+        norm = math.hypot(dx, dy)
+        if norm == 0:
+            distances = np.hypot(inner[:, 0] - start[0], inner[:, 1] - start[1])
+        else:
+            distances = (
+                np.abs(dx * (inner[:, 1] - start[1]) - dy * (inner[:, 0] - start[0]))
+                / norm
+            )
+        farthest = int(distances.argmax())
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return [(float(x), float(y)) for x, y in coords[keep]]
+
+
+def simplify_geometry(
+    geom: dict[str, Any] | None, tolerance: float
+) -> dict[str, Any] | None:
+    """
+    Simplify a Polygon/MultiPolygon geometry with Douglas-Peucker.
+
+    Rings that collapse below 4 vertices are dropped (holes and small
+    islands disappear at coarse tolerances); if every polygon collapses the
+    largest exterior ring is kept, simplified at the coarsest tolerance that
+    still leaves a valid ring, so the feature stays visible.
+    """
+    polygons = polygons_of(geom)
+    if not polygons or tolerance <= 0:
+        return geom
+
+    simplified = []
+    for rings in polygons:
+        exterior = simplify_line(rings[0], tolerance)
+        if len(exterior) < 4:
+            continue
+        holes = [
+            h for h in (simplify_line(r, tolerance) for r in rings[1:]) if len(h) >= 4
+        ]
+        simplified.append([[list(p) for p in ring] for ring in (exterior, *holes)])
+
+    if not simplified:
+        largest = max(polygons, key=lambda rings: len(rings[0]))[0]
+        exterior = simplify_line(largest, tolerance)
+        while len(exterior) < 4 and len(exterior) < len(largest):
+            tolerance /= 2
+            exterior = simplify_line(largest, tolerance)
+        simplified.append([[list(p) for p in exterior]])
+    if len(simplified) == 1:
+        return {"type": "Polygon", "coordinates": simplified[0]}
+    return {"type": "MultiPolygon", "coordinates": simplified}
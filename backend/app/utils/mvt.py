@@ -0,0 +1,381 @@
+"""
+Mapbox Vector Tile (MVT v2) encoding for Somalia Geography API.
+
+A small, dependency-free encoder: geometries given in lon/lat are projected
+to Web Mercator tile coordinates, clipped to the (buffered) tile, quantized
+to the tile extent and written as protobuf following the MVT 2.1 spec.
+"""
+
+import math
+import struct
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from app.utils.geometry import BBox, Ring
+
+DEFAULT_EXTENT = 4096
+DEFAULT_BUFFER = 64
+
+# Geometry types (vector_tile.proto GeomType)
+POINT = 1
+LINESTRING = 2
+POLYGON = 3
+
+# Geometry commands
+MOVE_TO = 1
+LINE_TO = 2
+CLOSE_PATH = 7
+
+MAX_LATITUDE = 85.0511287798066
+
+TilePoint = tuple[int, int]
+
+
+def tile_bbox(z: int, x: int, y: int) -> BBox:
+    """
+    Lon/lat bounding box of a Web Mercator (XYZ) tile.
+    """
+    n = 2**z
+
+    def lat(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return (x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y))
+
+
+class TileProjection:
+    """
+    Projects lon/lat to integer tile coordinates (origin top-left, y down).
+    """
+
+    def __init__(self, z: int, x: int, y: int, extent: int = DEFAULT_EXTENT):
+        self.z, self.x, self.y = z, x, y
+        self.extent = extent
+        self.scale = 2**z
+
+    def project(
+        self, lons: Sequence[float] | np.ndarray, lats: Sequence[float] | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        lon = np.asarray(lons, dtype=np.float64)
+        lat = np.radians(
+            np.clip(np.asarray(lats, dtype=np.float64), -MAX_LATITUDE, MAX_LATITUDE)
+        )
+        world_x = (lon + 180.0) / 360.0 * self.scale
+        world_y = (
+            (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / math.pi) / 2.0 * self.scale
+        )
+        return (
+            np.rint((world_x - self.x) * self.extent).astype(np.int64),
+            np.rint((world_y - self.y) * self.extent).astype(np.int64),
+        )
+
+    def project_points(self, points: Sequence[Sequence[float]]) -> list[TilePoint]:
+        if len(points) == 0:
+            return []
+        coords = np.asarray(points, dtype=np.float64)
+        px, py = self.project(coords[:, 0], coords[:, 1])
+        return list(zip(px.tolist(), py.tolist(), strict=True))
+
+
+def _dedupe(points: list[TilePoint]) -> list[TilePoint]:
+    """Drop consecutive repeated points (common after quantization)."""
+    result: list[TilePoint] = []
+    for point in points:
+        if not result or point != result[-1]:
+            result.append(point)
+    return result
+
+
+def _inside(p: TilePoint, axis: int, bound: int, keep_below: bool) -> bool:
+    return p[axis] <= bound if keep_below else p[axis] >= bound
+
+
+def _intersect(a: TilePoint, b: TilePoint, axis: int, bound: int) -> TilePoint:
+    """Point where segment a-b crosses the line ``p[axis] == bound``."""
+    t = (bound - a[axis]) / (b[axis] - a[axis])
+    other = 1 - axis
+    value = round(a[other] + t * (b[other] - a[other]))
+    return (bound, value) if axis == 0 else (value, bound)
+
+
+def clip_ring(ring: list[TilePoint], lo: int, hi: int) -> list[TilePoint]:
+    """
+    Sutherland-Hodgman clipping of a closed ring to the square [lo, hi]^2.
+
+    The input may or may not repeat its first point; the output is open.
+    """
+    points = ring[:-1] if len(ring) > 1 and ring[0] == ring[-1] else ring
+    for axis, bound, keep_below in (
+        (0, lo, False),
+        (0, hi, True),
+        (1, lo, False),
+        (1, hi, True),
+    ):
+        if not points:
+            break
+        clipped: list[TilePoint] = []
+        previous = points[-1]
+        previous_inside = _inside(previous, axis, bound, keep_below)
+        for current in points:
+            current_inside = _inside(current, axis, bound, keep_below)
+            if current_inside != previous_inside:
+                clipped.append(_intersect(previous, current, axis, bound))
+            if current_inside:
+                clipped.append(current)
+            previous, previous_inside = current, current_inside
+        points = clipped
+    return _dedupe(points)
+
+
+def clip_line(line: list[TilePoint], lo: int, hi: int) -> list[list[TilePoint]]:
+    """
+    Liang-Barsky clipping of a polyline to the square [lo, hi]^2.
+
+    Returns the visible parts as separate polylines.
+    """
+    parts: list[list[TilePoint]] = []
+    current: list[TilePoint] = []
+    for (x1, y1), (x2, y2) in zip(line, line[1:], strict=False):
+        dx, dy = x2 - x1, y2 - y1
+        t0, t1 = 0.0, 1.0
+        visible = True
+        for p, q in ((-dx, x1 - lo), (dx, hi - x1), (-dy, y1 - lo), (dy, hi - y1)):
+            if p == 0:
+                if q < 0:
+                    visible = False
+                    break
+                continue
+            r = q / p
+            if p < 0:
+                t0 = max(t0, r)
+            else:
+                t1 = min(t1, r)
+            if t0 > t1:
+                visible = False
+                break
+        if not visible:
+            if len(current) > 1:
+                parts.append(current)
+            current = []
+            continue
+
+        start = (round(x1 + t0 * dx), round(y1 + t0 * dy))
+        end = (round(x1 + t1 * dx), round(y1 + t1 * dy))
+        if not current or current[-1] != start:
+            if len(current) > 1:
+                parts.append(current)
+            current = [start]
+        if end != current[-1]:
+            current.append(end)
+        if t1 < 1.0:
+            # The line leaves the tile here
+            if len(current) > 1:
+                parts.append(current)
+            current = []
+    if len(current) > 1:
+        parts.append(current)
+    return parts
+
+
+def _ring_area(ring: list[TilePoint]) -> float:
+    """Shoelace area in tile coordinates (positive = clockwise on screen)."""
+    area = 0
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1], strict=True):
+        area += x1 * y2 - x2 * y1
+    return area / 2
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _field(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+
+def _bytes_field(number: int, payload: bytes) -> bytes:
+    return _field(number, 2) + _varint(len(payload)) + payload
+
+
+def _packed(number: int, values: Sequence[int]) -> bytes:
+    return _bytes_field(number, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value: Any) -> bytes:
+    if isinstance(value, bool):
+        return _field(7, 0) + _varint(int(value))
+    if isinstance(value, int):
+        if value >= 0:
+            return _field(5, 0) + _varint(value)
+        return _field(6, 0) + _varint(_zigzag(value))
+    if isinstance(value, float):
+        return _field(3, 1) + struct.pack("<d", value)
+    return _bytes_field(1, str(value).encode("utf-8"))
+
+
+class MVTLayer:
+    """
+    Accumulates features for one tile layer.
+
+    Geometries are given in tile coordinates (see ``TileProjection``); they
+    are clipped to the tile plus ``buffer`` before encoding.
+    """
+
+    def __init__(
+        self, name: str, extent: int = DEFAULT_EXTENT, buffer: int = DEFAULT_BUFFER
+    ):
+        self.name = name
+        self.extent = extent
+        self.lo = -buffer
+        self.hi = extent + buffer
+        self._keys: dict[str, int] = {}
+        self._values: dict[tuple[type, Any], int] = {}
+        self._features: list[bytes] = []
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def _tags(self, properties: dict[str, Any]) -> list[int]:
+        tags: list[int] = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            key_index = self._keys.setdefault(key, len(self._keys))
+            value_index = self._values.setdefault(
+                (type(value), value), len(self._values)
+            )
+            tags.extend((key_index, value_index))
+        return tags
+
+    def _add(
+        self,
+        geom_type: int,
+        commands: list[int],
+        properties: dict[str, Any],
+        id_: int | None,
+    ) -> None:
+        feature = b""
+        if id_ is not None:
+            feature += _field(1, 0) + _varint(id_)
+        tags = self._tags(properties)
+        if tags:
+            feature += _packed(2, tags)
+        feature += _field(3, 0) + _varint(geom_type)
+        feature += _packed(4, commands)
+        self._features.append(feature)
+
+    @staticmethod
+    def _path(
+        commands: list[int],
+        cursor: list[int],
+        points: Sequence[TilePoint],
+        start_command: int,
+    ) -> None:
+        """Append MoveTo/LineTo commands for points, updating the cursor."""
+        commands.append((start_command & 0x7) | (1 << 3))
+        for i, (x, y) in enumerate(points):
+            if i == 1:
+                commands.append((LINE_TO & 0x7) | ((len(points) - 1) << 3))
+            commands.append(_zigzag(x - cursor[0]))
+            commands.append(_zigzag(y - cursor[1]))
+            cursor[0], cursor[1] = x, y
+
+    def add_point(
+        self, point: TilePoint, properties: dict[str, Any], id_: int | None = None
+    ) -> None:
+        x, y = point
+        if not (self.lo <= x <= self.hi and self.lo <= y <= self.hi):
+            return
+        self._add(
+            POINT, [(MOVE_TO & 0x7) | (1 << 3), _zigzag(x), _zigzag(y)], properties, id_
+        )
+
+    def add_line(
+        self, line: list[TilePoint], properties: dict[str, Any], id_: int | None = None
+    ) -> None:
+        parts = [
+            p
+            for p in (
+                _dedupe(part) for part in clip_line(_dedupe(line), self.lo, self.hi)
+            )
+            if len(p) > 1
+        ]
+        if not parts:
+            return
+        commands: list[int] = []
+        cursor = [0, 0]
+        for part in parts:
+            self._path(commands, cursor, part, MOVE_TO)
+        self._add(LINESTRING, commands, properties, id_)
+
+    def add_polygons(
+        self,
+        polygons: Sequence[Sequence[list[TilePoint]]],
+        properties: dict[str, Any],
+        id_: int | None = None,
+    ) -> None:
+        """
+        Add a (multi)polygon; each polygon is a list of rings, exterior first.
+        """
+        commands: list[int] = []
+        cursor = [0, 0]
+        for rings in polygons:
+            for ring_index, ring in enumerate(rings):
+                clipped = clip_ring(ring, self.lo, self.hi)
+                if len(clipped) < 3:
+                    if ring_index == 0:
+                        break  # Exterior outside the tile: skip the polygon
+                    continue
+                area = _ring_area(clipped)
+                if area == 0:
+                    if ring_index == 0:
+                        break
+                    continue
+                # Exterior rings must have positive area, holes negative
+                if (area > 0) != (ring_index == 0):
+                    clipped.reverse()
+                self._path(commands, cursor, clipped, MOVE_TO)
+                commands.append((CLOSE_PATH & 0x7) | (1 << 3))
+        if commands:
+            self._add(POLYGON, commands, properties, id_)
+
+    def encode(self) -> bytes:
+        layer = _field(15, 0) + _varint(2)
+        layer += _bytes_field(1, self.name.encode("utf-8"))
+        layer += b"".join(_bytes_field(2, feature) for feature in self._features)
+        layer += b"".join(_bytes_field(3, key.encode("utf-8")) for key in self._keys)
+        layer += b"".join(
+            _bytes_field(4, _encode_value(value)) for _, value in self._values
+        )
+        layer += _field(5, 0) + _varint(self.extent)
+        return layer
+
+
+def encode_tile(layers: Sequence[MVTLayer]) -> bytes:
+    """
+    Encode layers as a vector tile; empty layers are omitted.
+    """
+    return b"".join(_bytes_field(3, layer.encode()) for layer in layers if len(layer))
+
+
+def project_polygons(
+    projection: TileProjection, polygons: Sequence[Sequence[Ring]]
+) -> list[list[list[TilePoint]]]:
+    """
+    Project lon/lat polygons (lists of rings) to tile coordinates.
+    """
+    return [[projection.project_points(ring) for ring in rings] for rings in polygons]
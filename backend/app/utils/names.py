@@ -0,0 +1,84 @@
+"""
+Place name normalization for Somalia Geography API search.
+
+Somali place names are written in Somali orthography (Muqdisho, Kismaayo,
+Gaalkacyo, Xamar) and in English/Italian spellings (Mogadishu, Kismayo,
+Galkayo, Hamar). ``fold_name`` maps both towards one spelling, ``name_key``
+makes that an exact-match key, and ``phonetic_key`` reduces it to a
+consonant skeleton that also joins spellings differing in vowels and
+voiced/unvoiced consonants. The loader stores both keys in indexed
+``name_key``/``name_phonetic`` columns.
+"""
+
+import re
+import unicodedata
+
+_CAMEL_CASE = re.compile(r"(?<=[a-z])(?=[A-Z])")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_APOSTROPHES = re.compile(r"['\u2019\u02bc`]")
+_SOMALI_C = re.compile(r"c(?!h)")
+_LONG_VOWELS = re.compile(r"([aeiou])\1+")
+_SPACES = re.compile(r" +")
+_REPEATS = re.compile(r"(.)\1+")
+_VOWELS = re.compile(r"[aeiouy]")
+# Consonants that English/Italian spellings interchange: Muqdisho/Mogadishu,
+# Beledweyne/Belet Weyne
+_PHONETIC_CLASSES = str.maketrans(
+    {"q": "k", "g": "k", "t": "d", "p": "b", "v": "f", "z": "s"}
+)
+
+
+def normalize_name(name: str) -> str:
+    """
+    Search form of a name: diacritics stripped, CamelCase split into words
+    ("CeelBarde" -> "ceel barde"), lowercased, punctuation collapsed to
+    single spaces.
+    """
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = _CAMEL_CASE.sub(" ", text).lower()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Trigrams of a normalized text, pg_trgm style: every word is padded with
+    two spaces in front and one behind, so "bay" -> {"  b", " ba", "bay", "ay "}.
+    """
+    grams: set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def fold_name(name: str) -> str:
+    """
+    Normalized name with Somali orthography folded to its common
+    transliteration: glottal stop apostrophes dropped, x -> h (Xamar ->
+    hamar), the silent c (ayn) dropped (Gaalkacyo -> galkayo, Ceel -> el),
+    dh -> d, long vowels shortened (Kismaayo -> kismayo) and ey -> ei
+    (Hargeysa -> hargeisa).
+    """
+    text = normalize_name(_APOSTROPHES.sub("", name))
+    text = _SOMALI_C.sub("", text.replace("x", "h"))
+    text = _LONG_VOWELS.sub(r"\1", text.replace("dh", "d"))
+    text = text.replace("ey", "ei")
+    return _SPACES.sub(" ", text).strip()
+
+
+def name_key(name: str) -> str:
+    """Exact-match key: the folded name without spaces ("Ceel Barde" -> "elbarde")."""
+    return fold_name(name).replace(" ", "")
+
+
+def phonetic_key(name: str) -> str:
+    """
+    Consonant skeleton of the folded name: similar consonants merged
+    (q/g/k, t/d, p/b, v/f, z/s), vowels dropped after the first letter and
+    repeats collapsed, so Muqdisho and Mogadishu both give "mkdsh".
+    """
+    key = name_key(name).translate(_PHONETIC_CLASSES)
+    if not key:
+        return ""
+    return _REPEATS.sub(r"\1", key[0] + _VOWELS.sub("", key[1:]))
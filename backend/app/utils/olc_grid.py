@@ -0,0 +1,179 @@
+"""
+Precomputed Open Location Code cell -> district/region lookup grid.
+
+Every OLC cell (at ``settings.OLC_GRID_CODE_LENGTH``) covering the extent of
+the loaded boundaries is classified once:
+
+- cells crossed by any district or region boundary edge are marked as
+  boundary cells and resolved with an exact point-in-polygon test;
+- every other cell lies entirely inside one district (or outside all of
+  them), so its center decides the answer for the whole cell.
+
+Lookups for interior cells are then a single array read.
+"""
+
+import math
+
+import numpy as np
+from sqlmodel import Session
+
+from app import models
+from app.core.config import settings
+from app.utils.geo_index import (
+    AdminArea,
+    AdminIndex,
+    AdminMatch,
+    CachedIndex,
+    get_admin_index,
+)
+from app.utils.geometry import Ring
+from app.utils.olc_helper import olc_cell_size
+
+BOUNDARY = -2
+OUTSIDE = -1
+
+
+class OLCRegionGrid:
+    """
+    Lookup grid aligned with the global OLC cell grid.
+
+    Args:
+        admin: Admin boundary index used to classify cells and resolve
+            boundary cells
+        code_length: OLC code length that defines the cell size
+    """
+
+    def __init__(self, admin: AdminIndex, code_length: int):
+        self.admin = admin
+        self.code_length = code_length
+        self.cell_size = olc_cell_size(code_length)
+        self.districts: list[AdminArea] = list(admin.districts_by_id.values())
+        self.regions: list[AdminArea] = list(admin.regions_by_id.values())
+        self.row0 = self.col0 = 0
+        self.district_cells = np.full((0, 0), OUTSIDE, dtype=np.int16)
+        self.region_cells = np.full((0, 0), OUTSIDE, dtype=np.int16)
+
+        boxes = [area.bbox for area in (*self.districts, *self.regions) if area.bbox]
+        if not boxes:
+            return
+
+        parent = None
+        if code_length > 4:
+            # Classify coarse-to-fine: children of a coarse interior cell
+            # inherit its value, so only the few cells under coarse boundary
+            # cells need point-in-polygon tests.
+            parent = OLCRegionGrid(admin, code_length - 2)
+
+        self.row0 = self._row(min(b[1] for b in boxes))
+        self.col0 = self._col(min(b[0] for b in boxes))
+        rows = self._row(max(b[3] for b in boxes)) - self.row0 + 1
+        cols = self._col(max(b[2] for b in boxes)) - self.col0 + 1
+
+        boundary = np.zeros((rows, cols), dtype=bool)
+        for area in (*self.districts, *self.regions):
+            for rings in area.polygons:
+                for ring in rings:
+                    self._mark_ring(boundary, ring)
+
+        self.district_cells = np.full((rows, cols), BOUNDARY, dtype=np.int16)
+        self.region_cells = np.full((rows, cols), BOUNDARY, dtype=np.int16)
+        interior_rows, interior_cols = np.nonzero(~boundary)
+
+        if parent is not None and interior_rows.size:
+            # Parent cells are exactly 20x20 child cells in OLC pair codes
+            parent_rows = (interior_rows + self.row0) // 20 - parent.row0
+            parent_cols = (interior_cols + self.col0) // 20 - parent.col0
+            inherited = parent.district_cells[parent_rows, parent_cols] != BOUNDARY
+            self.district_cells[interior_rows[inherited], interior_cols[inherited]] = (
+                parent.district_cells[parent_rows[inherited], parent_cols[inherited]]
+            )
+            self.region_cells[interior_rows[inherited], interior_cols[inherited]] = (
+                parent.region_cells[parent_rows[inherited], parent_cols[inherited]]
+            )
+            interior_rows = interior_rows[~inherited]
+            interior_cols = interior_cols[~inherited]
+
+        if interior_rows.size:
+            lats = (interior_rows + self.row0 + 0.5) * self.cell_size - 90
+            lons = (interior_cols + self.col0 + 0.5) * self.cell_size - 180
+            district_pos = {a.id: i for i, a in enumerate(self.districts)}
+            region_pos = {a.id: i for i, a in enumerate(self.regions)}
+            matches = admin.locate_many(lons, lats)
+            self.district_cells[interior_rows, interior_cols] = [
+                district_pos[m.district.id] if m.district else OUTSIDE for m in matches
+            ]
+            self.region_cells[interior_rows, interior_cols] = [
+                region_pos[m.region.id] if m.region else OUTSIDE for m in matches
+            ]
+
+    def _row(self, lat: float) -> int:
+        return math.floor((lat + 90) / self.cell_size)
+
+    def _col(self, lon: float) -> int:
+        return math.floor((lon + 180) / self.cell_size)
+
+    def _mark_ring(self, boundary: np.ndarray, ring: Ring) -> None:
+        """Mark every cell an edge of the ring passes through."""
+        size = self.cell_size
+        for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1], strict=True):
+            if x1 > x2:
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            col_lo, col_hi = self._col(x1), self._col(x2)
+            for col in range(col_lo, col_hi + 1):
+                # Portion of the edge inside this column of cells
+                strip_lo = max(x1, (col * size) - 180)
+                strip_hi = min(x2, ((col + 1) * size) - 180)
+                if x2 == x1:
+                    ya, yb = y1, y2
+                else:
+                    slope = (y2 - y1) / (x2 - x1)
+                    ya = y1 + (strip_lo - x1) * slope
+                    yb = y1 + (strip_hi - x1) * slope
+                row_lo, row_hi = self._row(min(ya, yb)), self._row(max(ya, yb))
+                boundary[
+                    row_lo - self.row0 : row_hi - self.row0 + 1,
+                    col - self.col0,
+                ] = True
+
+    def locate(self, lon: float, lat: float) -> AdminMatch:
+        """
+        Find the district and region containing a point.
+
+        Interior cells answer in constant time; boundary cells fall back to
+        the exact polygon test.
+        """
+        row = self._row(lat) - self.row0
+        col = self._col(lon) - self.col0
+        rows, cols = self.district_cells.shape
+        if not (0 <= row < rows and 0 <= col < cols):
+            return AdminMatch(district=None, region=None)
+
+        district_pos = int(self.district_cells[row, col])
+        if district_pos == BOUNDARY:
+            return self.admin.locate(lon, lat)
+        region_pos = int(self.region_cells[row, col])
+        return AdminMatch(
+            district=self.districts[district_pos] if district_pos >= 0 else None,
+            region=self.regions[region_pos] if region_pos >= 0 else None,
+        )
+
+    def region_code(self, lat: float, lon: float) -> str | None:
+        region = self.locate(lon, lat).region
+        return region.code if region else None
+
+    @property
+    def is_empty(self) -> bool:
+        return self.district_cells.size == 0
+
+
+def _build_olc_grid(db: Session) -> OLCRegionGrid:
+    return OLCRegionGrid(get_admin_index(db), settings.OLC_GRID_CODE_LENGTH)
+
+
+olc_grid: CachedIndex[OLCRegionGrid] = CachedIndex(
+    "OLC region grid", [models.Region, models.District], _build_olc_grid
+)
+
+
+def get_olc_grid(db: Session) -> OLCRegionGrid:
+    return olc_grid.get(db)
@@ -4,11 +4,12 @@ Open Location Code (OLC) helper utilities for Somalia Geography API.
 Uses Google's Open Location Code library with Somalia-specific extensions.
 """
 
-from typing import Optional, Tuple
+from collections.abc import Callable
+
 from openlocationcode import openlocationcode as olc
 
 
-def generate_olc(lat: float, lon: float, code_length: Optional[int] = None) -> str:
+def generate_olc(lat: float, lon: float, code_length: int | None = None) -> str:
     """
     Generate Open Location Code for given coordinates.
 
@@ -48,7 +49,31 @@ def decode_olc(code: str) -> dict:
     }
 
 
-def generate_somalia_olc(lat: float, lon: float, region_code: Optional[str] = None) -> str:
+def olc_cell_size(code_length: int) -> float:
+    """
+    Size in degrees (latitude and longitude) of an Open Location Code cell.
+
+    Only the pair section of the code (lengths 2-10) is supported.
+
+    Args:
+        code_length: Code length, an even number from 2 to 10
+
+    Returns:
+        Cell size in degrees (e.g. 0.05 for 6, 0.0025 for 8)
+    """
+    if code_length % 2 or not 2 <= code_length <= olc.PAIR_CODE_LENGTH_:
+        raise ValueError(
+            f"Unsupported code length {code_length}: must be even and between 2 and 10"
+        )
+    return 20.0 / 20.0 ** (code_length // 2 - 1)
+
+
+def generate_somalia_olc(
+    lat: float,
+    lon: float,
+    region_code: str | None = None,
+    region_lookup: Callable[[float, float], str | None] | None = None,
+) -> str:
     """
     Generate Somalia-specific Open Location Code with region prefix.
 
@@ -56,6 +81,8 @@ def generate_somalia_olc(lat: float, lon: float, region_code: Optional[str] = No
         lat: Latitude
         lon: Longitude
         region_code: Optional region code (e.g., "SOM-BNR" for Banadir)
+        region_lookup: Optional callable (lat, lon) -> region code used when
+            region_code is not given (e.g. the OLC region grid)
 
     Returns:
         Somalia-specific location code
@@ -65,6 +92,10 @@ def generate_somalia_olc(lat: float, lon: float, region_code: Optional[str] = No
     if region_code:
         return f"{region_code}:{base_code}"
 
+    if region_lookup:
+        region_code = region_lookup(lat, lon)
+        return f"{region_code}:{base_code}" if region_code else base_code
+
     # Try to determine region based on coordinates (simplified)
     # This is a placeholder - in production, you'd use spatial queries
     region = _get_region_from_coords(lat, lon)
@@ -93,7 +124,7 @@ def decode_somalia_olc(code: str) -> dict:
         return decode_olc(code)
 
 
-def _get_region_from_coords(lat: float, lon: float) -> Optional[str]:
+def _get_region_from_coords(lat: float, lon: float) -> str | None:
     """
     Determine Somalia region code from coordinates.
 
@@ -109,15 +140,32 @@ def _get_region_from_coords(lat: float, lon: float) -> Optional[str]:
     # Simplified bounding boxes for Somali regions
     # These are approximate and should be replaced with actual spatial data
     regions = {
-        "BNR": {"lat_min": 1.8, "lat_max": 2.2, "lon_min": 45.0, "lon_max": 45.6},  # Banadir
-        "HRS": {"lat_min": 9.0, "lat_max": 10.0, "lon_min": 43.0, "lon_max": 45.0},  # Hiiraan
-        "SHB": {"lat_min": 2.0, "lat_max": 3.0, "lon_min": 42.0, "lon_max": 43.0},  # Shabelle
+        "BNR": {
+            "lat_min": 1.8,
+            "lat_max": 2.2,
+            "lon_min": 45.0,
+            "lon_max": 45.6,
+        },  # Banadir
+        "HRS": {
+            "lat_min": 9.0,
+            "lat_max": 10.0,
+            "lon_min": 43.0,
+            "lon_max": 45.0,
+        },  # Hiiraan
+        "SHB": {
+            "lat_min": 2.0,
+            "lat_max": 3.0,
+            "lon_min": 42.0,
+            "lon_max": 43.0,
+        },  # Shabelle
         # Add more regions as needed
     }
 
     for code, bounds in regions.items():
-        if (bounds["lat_min"] <= lat <= bounds["lat_max"] and
-            bounds["lon_min"] <= lon <= bounds["lon_max"]):
+        if (
+            bounds["lat_min"] <= lat <= bounds["lat_max"]
+            and bounds["lon_min"] <= lon <= bounds["lon_max"]
+        ):
             return code
 
     return None
@@ -0,0 +1,232 @@
+"""
+SQLite FTS5 full-text index of place and infrastructure names.
+
+A database-side alternative to the in-memory indexes of
+``app.utils.place_search``: the loader fills the ``place_fts`` table with
+region, district (with aliases), road and transport names, and
+``/places/search`` queries it with bm25 ranking when
+``settings.PLACE_SEARCH_BACKEND`` is "fts", so all workers share one index
+instead of each building its own. Names are indexed raw, in their
+normalized form (``app.utils.names.normalize_name``), which splits
+CamelCase names such as "CeelBarde" into words the tokenizer can match,
+and in their Somali-folded form (``fold_name``), so "Kismayo" finds
+"Kismaayo" like it does in the in-memory index. Spelling suggestions come
+from ``NameSpeller``, a cached delete dictionary over the region and
+district names and aliases.
+"""
+
+import logging
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, func, select
+
+from app import models
+from app.core.config import settings
+from app.utils.geo_index import CachedIndex
+from app.utils.names import fold_name, normalize_name
+from app.utils.place_search import CHARS_PER_EDIT, MAX_EDIT_DISTANCE, UNNAMED_ROADS
+from app.utils.spelling import SymSpell
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "place_fts"
+
+# bm25 weights of the (kind, entity_id, name, terms, region) columns
+BM25_WEIGHTS = (0.0, 0.0, 10.0, 5.0, 1.0)
+
+
+def _documents(db: Session) -> list[dict[str, Any]]:
+    def document(
+        kind: str,
+        entity_id: int,
+        name: str,
+        other_names: Sequence[str | None],
+        region: str | None,
+    ) -> dict[str, Any]:
+        forms = (
+            form(n)
+            for n in (name, *other_names)
+            if n
+            for form in (normalize_name, fold_name)
+        )
+        terms = " ".join(dict.fromkeys(term for term in forms if term))
+        return {
+            "kind": kind,
+            "entity_id": entity_id,
+            "name": name,
+            "terms": terms,
+            "region": region or "",
+        }
+
+    documents = [
+        document("region", row.id, row.name, [], row.name)
+        for row in db.exec(select(models.Region)).all()
+    ]
+    documents.extend(
+        document("district", row.id, row.name, row.aliases or [], row.region_name)
+        for row in db.exec(select(models.District)).all()
+    )
+    documents.extend(
+        document(
+            "airport", row.id, row.name, [row.iata_code, row.icao_code], row.region
+        )
+        for row in db.exec(select(models.Airport)).all()
+    )
+    documents.extend(
+        document("port", row.id, row.name, [], row.region)
+        for row in db.exec(select(models.Port)).all()
+    )
+    documents.extend(
+        document("checkpoint", row.id, row.name, [], row.region)
+        for row in db.exec(select(models.Checkpoint)).all()
+    )
+    # One document per road name
+    documents.extend(
+        document("road", road_id, name, [], None)
+        for name, road_id in db.exec(
+            select(models.Road.name, func.min(models.Road.id)).group_by(
+                models.Road.name
+            )
+        ).all()
+        if name and normalize_name(name) not in UNNAMED_ROADS
+    )
+    return documents
+
+
+def sync_place_fts(db: Session) -> bool:
+    """
+    Create (if needed) and refill the FTS5 name index.
+
+    Returns False (changing nothing) on other databases or when SQLite was
+    built without FTS5.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return False
+    try:
+        db.execute(
+            text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                "kind UNINDEXED, entity_id UNINDEXED, name, terms, region, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        )
+    except OperationalError as e:
+        db.rollback()
+        logger.warning("FTS5 place index not created: %s", e)
+        return False
+    db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    documents = _documents(db)
+    if documents:
+        db.execute(
+            text(
+                f"INSERT INTO {FTS_TABLE} (kind, entity_id, name, terms, region) "
+                "VALUES (:kind, :entity_id, :name, :terms, :region)"
+            ),
+            documents,
+        )
+    db.commit()
+    return True
+
+
+def match_expression(query: str) -> str | None:
+    """
+    FTS5 query matching every word of ``query`` as a prefix, as typed or in
+    its Somali-folded form ("xamar" -> "xamar" or "hamar").
+    """
+    words = normalize_name(query).split()
+    if not words:
+        return None
+    terms = []
+    for word in words:
+        forms = [
+            f'"{form}"*' for form in dict.fromkeys((word, fold_name(word))) if form
+        ]
+        terms.append(forms[0] if len(forms) == 1 else f"({' OR '.join(forms)})")
+    return " ".join(terms)
+
+
+def search_place_fts(
+    db: Session, query: str, limit: int, kinds: Sequence[str]
+) -> list[tuple[str, int]] | None:
+    """
+    (kind, id) of the best matches of the given kinds, best bm25 rank first,
+    or None when the FTS table does not exist.
+    """
+    expression = match_expression(query)
+    if expression is None:
+        return []
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    statement = text(
+        f"SELECT kind, entity_id FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH :expression AND kind IN :kinds "
+        f"ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT :limit"
+    ).bindparams(bindparam("kinds", expanding=True))
+    try:
+        rows = db.execute(
+            statement, {"expression": expression, "kinds": list(kinds), "limit": limit}
+        ).all()
+    except OperationalError:
+        db.rollback()
+        return None
+    return [(kind, int(entity_id)) for kind, entity_id in rows]
+
+
+class NameSpeller:
+    """
+    Spelling dictionary over place names (and aliases): the symmetric delete
+    index of ``app.utils.spelling.SymSpell`` over the Somali-folded names,
+    with the in-memory index's limits (one edit per ``CHARS_PER_EDIT``
+    characters, at most ``MAX_EDIT_DISTANCE``).
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: dict[str, str] = {}
+        for name in names:
+            term = fold_name(name)
+            if term:
+                self.names.setdefault(term, name)
+        self._speller = SymSpell(self.names, MAX_EDIT_DISTANCE)
+
+    def corrections(self, query: str) -> list[tuple[str, int]]:
+        """
+        Names within edit distance of the query: (name, distance), closest
+        first. Empty when the query is itself a name.
+        """
+        folded = fold_name(query)
+        max_distance = min(MAX_EDIT_DISTANCE, len(folded) // CHARS_PER_EDIT)
+        if max_distance == 0 or folded in self.names:
+            return []
+        return sorted(
+            (
+                (self.names[term], distance)
+                for term, distance in self._speller.lookup(folded, max_distance)
+            ),
+            key=lambda item: (item[1], item[0]),
+        )
+
+
+def build_place_speller(db: Session) -> NameSpeller:
+    names = list(db.exec(select(models.Region.name)).all())
+    for name, aliases in db.exec(
+        select(models.District.name, models.District.aliases)
+    ).all():
+        names.append(name)
+        names.extend(aliases or [])
+    return NameSpeller(names)
+
+
+# "Did you mean" suggestions of the fts backend, which skips the in-memory
+# place index and its spelling dictionary
+place_speller: CachedIndex[NameSpeller] = CachedIndex(
+    "place spelling",
+    [models.Region, models.District],
+    build_place_speller,
+    warm=lambda: settings.PLACE_SEARCH_BACKEND == "fts",
+)
+
+
+def get_place_speller(db: Session) -> NameSpeller:
+    return place_speller.get(db)
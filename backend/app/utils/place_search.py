@@ -0,0 +1,517 @@
+"""
+In-memory place search for Somalia Geography API.
+
+``PlaceIndex`` keeps the folded names (``app.utils.names.fold_name``, so
+"Kismaayo" and "Kismayo" are one term) of districts and regions (plus
+district aliases and the name of a district's region) in a trigram inverted
+index. The trigrams of a query select their posting lists, one ``bincount``
+gives the number of trigrams every indexed name shares with the query, and
+names are scored from that count alone, so a search never touches row data
+and misspellings ("Muqdisho" for "Mogadisho") still match.
+
+With ``spelling=True`` a ``SymSpell`` dictionary over the same terms adds
+edit-distance matches (one-letter typos in short names, which share few
+trigrams with the intended name) and "did you mean" corrections.
+
+``match_name_keys`` finds transliterations the trigrams miss ("Muqdisho"
+for "Mogadishu") as exact hits on the loader's indexed name key columns.
+
+``Autocompleter`` serves search-box completions from a sorted array of
+normalized name keys: a prefix is a contiguous range found by binary
+search, and the best entries of the range come from ranks precomputed at
+build time.
+"""
+
+import bisect
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sqlalchemy import func, or_
+from sqlmodel import Session, col, select
+
+from app import models
+from app.core.config import settings
+from app.utils.geo_index import CachedIndex
+from app.utils.names import fold_name, name_key, normalize_name, phonetic_key, trigrams
+from app.utils.spelling import SymSpell
+
+# Scores are in [0, 1]; names scoring lower are not matches
+MIN_SCORE = 0.3
+# A district also matches, below its own name, on the name of its region
+REGION_NAME_WEIGHT = 0.8
+# Road names that are placeholders, not names
+UNNAMED_ROADS = {"unnamed road", "road", ""}
+# Scores of exact name key and phonetic key hits
+KEY_SCORE = 1.0
+PHONETIC_SCORE = 0.9
+# Shorter phonetic keys ("bd") are too ambiguous to match on
+MIN_PHONETIC_LENGTH = 3
+# Spelling corrections allow one edit per this many query characters, at most
+# MAX_EDIT_DISTANCE ("baki" -> 1, "mogadishx" -> 2)
+CHARS_PER_EDIT = 4
+MAX_EDIT_DISTANCE = 2
+
+
+@dataclass
+class PlaceEntry:
+    """A searchable place and the data returned for it."""
+
+    kind: str  # region, district, airport, port, checkpoint, road
+    id: int
+    code: str | None
+    name: str
+    region: str | None
+    aliases: list[str] | None = None
+    centroid: dict[str, float] | None = None
+    population: int | None = None
+
+
+class PlaceIndex:
+    """
+    Trigram index over place names.
+
+    Args:
+        entries: Places to search
+        names: (entry position, name, weight) for every name an entry is
+            found by; a match through a name scores ``weight`` times the
+            name's similarity to the query
+        spelling: Also match names within edit distance of the query (see
+            ``corrections``)
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[PlaceEntry],
+        names: Sequence[tuple[int, str, float]],
+        spelling: bool = False,
+    ):
+        self.entries = list(entries)
+        term_ids: dict[str, int] = {}
+        term_names: dict[str, str] = {}
+        link_terms: list[int] = []
+        link_entries: list[int] = []
+        link_weights: list[float] = []
+        for position, name, weight in names:
+            term = fold_name(name)
+            if term:
+                link_terms.append(term_ids.setdefault(term, len(term_ids)))
+                term_names.setdefault(term, name)
+                link_entries.append(position)
+                link_weights.append(weight)
+        self.terms = list(term_ids)
+        self.term_names = [term_names[term] for term in self.terms]
+        self._term_ids = term_ids
+
+        postings: dict[str, list[int]] = defaultdict(list)
+        sizes = []
+        for term_id, term in enumerate(self.terms):
+            grams = trigrams(term)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings[gram].append(term_id)
+        self._postings = {
+            gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()
+        }
+        self._sizes = np.array(sizes, dtype=np.float64)
+        self._link_terms = np.array(link_terms, dtype=np.int64)
+        self._link_entries = np.array(link_entries, dtype=np.int64)
+        self._link_weights = np.array(link_weights, dtype=np.float64)
+        # Tie-break between equal scores: population, then name
+        order = sorted(
+            range(len(self.entries)),
+            key=lambda i: (-(self.entries[i].population or 0), self.entries[i].name),
+        )
+        self._tiebreak = np.empty(len(self.entries), dtype=np.int64)
+        self._tiebreak[order] = np.arange(len(self.entries))
+        # Corrections rank by the best entry their term leads to
+        self._term_rank = np.full(len(self.terms), len(self.entries), dtype=np.int64)
+        np.minimum.at(
+            self._term_rank, self._link_terms, self._tiebreak[self._link_entries]
+        )
+        self._speller = SymSpell(self.terms, MAX_EDIT_DISTANCE) if spelling else None
+
+    def term_scores(self, text: str) -> np.ndarray:
+        """
+        Similarity of a normalized query to every indexed term: the mean of
+        the trigram Jaccard similarity and the share of the query's trigrams
+        found in the term (so prefixes and partial names still score).
+        """
+        grams = trigrams(text)
+        hits = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not hits:
+            return np.zeros(len(self.terms))
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.terms)).astype(
+            np.float64
+        )
+        similarity = shared / (len(grams) + self._sizes - shared)
+        return (similarity + shared / len(grams)) / 2
+
+    def _corrections(self, text: str) -> list[tuple[int, int]]:
+        """(term id, edit distance) of the terms near a folded query, best first."""
+        if self._speller is None or text in self._term_ids:
+            return []
+        max_distance = min(MAX_EDIT_DISTANCE, len(text) // CHARS_PER_EDIT)
+        if max_distance == 0:
+            return []
+        found = [
+            (self._term_ids[term], distance)
+            for term, distance in self._speller.lookup(text, max_distance)
+        ]
+        return sorted(found, key=lambda item: (item[1], self._term_rank[item[0]]))
+
+    def corrections(self, query: str) -> list[tuple[str, int]]:
+        """
+        Names within edit distance of the query, closest (then most
+        populous) first: (name, distance). Empty when the query is itself an
+        indexed name or the index was built without ``spelling``.
+        """
+        return [
+            (self.term_names[term_id], distance)
+            for term_id, distance in self._corrections(fold_name(query))
+        ]
+
+    def matches(
+        self, query: str, corrections: list[tuple[int, int]] | None = None
+    ) -> list[tuple[PlaceEntry, float]]:
+        """
+        Every matching entry with its score, best first (then by population).
+        ``corrections`` are the query's ``_corrections`` when already looked up.
+        """
+        text = fold_name(query)
+        if not text or not self.entries:
+            return []
+        term_scores = self.term_scores(text)
+        # A correction scores the share of its characters left unchanged
+        for term_id, distance in (
+            self._corrections(text) if corrections is None else corrections
+        ):
+            correction_score = 1 - distance / max(len(text), len(self.terms[term_id]))
+            term_scores[term_id] = max(term_scores[term_id], correction_score)
+        scores = term_scores[self._link_terms] * self._link_weights
+        best = np.zeros(len(self.entries))
+        np.maximum.at(best, self._link_entries, scores)
+        best = np.round(best, 3)
+        matches = np.flatnonzero(best >= MIN_SCORE)
+        matches = matches[np.lexsort((self._tiebreak[matches], -best[matches]))]
+        return [
+            (self.entries[i], score)
+            for i, score in zip(matches.tolist(), best[matches].tolist(), strict=True)
+        ]
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[PlaceEntry, float]]:
+        """Best matching places with their score, best first."""
+        return self.matches(query)[:limit]
+
+    def search_with_corrections(
+        self, query: str, limit: int = 10
+    ) -> tuple[list[tuple[PlaceEntry, float]], list[tuple[str, int]]]:
+        """``search`` and ``corrections`` of a query, looking the corrections up once."""
+        corrections = self._corrections(fold_name(query))
+        return (
+            self.matches(query, corrections)[:limit],
+            [(self.term_names[term_id], distance) for term_id, distance in corrections],
+        )
+
+
+def region_entry(row: models.Region) -> PlaceEntry:
+    return PlaceEntry(
+        kind="region",
+        id=row.id,
+        code=row.code,
+        name=row.name,
+        region=row.name,
+        centroid={"lat": row.centroid_lat, "lon": row.centroid_lon}
+        if row.centroid_lat is not None and row.centroid_lon is not None
+        else None,
+        population=row.population,
+    )
+
+
+def district_entry(row: models.District) -> PlaceEntry:
+    return PlaceEntry(
+        kind="district",
+        id=row.id,
+        code=row.code or f"SOM-{row.region_name[:3].upper()}-{row.name[:3].upper()}",
+        name=row.name,
+        region=row.region_name,
+        aliases=row.aliases,
+        centroid=row.centroid,
+        population=row.population,
+    )
+
+
+def match_name_keys(db: Session, query: str) -> list[tuple[PlaceEntry, float]]:
+    """
+    Regions and districts whose name has the query's name key
+    (``KEY_SCORE``) or phonetic key (``PHONETIC_SCORE``), best first.
+    Exact lookups on the indexed ``name_key``/``name_phonetic`` columns.
+    """
+    key, phonetic = name_key(query), phonetic_key(query)
+    if not key:
+        return []
+    matches: list[tuple[PlaceEntry, float]] = []
+    tables: tuple[tuple[Any, Callable[[Any], PlaceEntry]], ...] = (
+        (models.Region, region_entry),
+        (models.District, district_entry),
+    )
+    for table, entry in tables:
+        condition = table.name_key == key
+        if len(phonetic) >= MIN_PHONETIC_LENGTH:
+            condition = or_(condition, table.name_phonetic == phonetic)
+        matches.extend(
+            (entry(row), KEY_SCORE if row.name_key == key else PHONETIC_SCORE)
+            for row in db.exec(select(table).where(condition)).all()
+        )
+    matches.sort(
+        key=lambda match: (-match[1], -(match[0].population or 0), match[0].name)
+    )
+    return matches
+
+
+def build_place_index(db: Session) -> PlaceIndex:
+    entries: list[PlaceEntry] = []
+    names: list[tuple[int, str, float]] = []
+    for region in db.exec(select(models.Region)).all():
+        names.append((len(entries), region.name, 1.0))
+        entries.append(region_entry(region))
+    for district in db.exec(select(models.District)).all():
+        position = len(entries)
+        names.append((position, district.name, 1.0))
+        names.extend((position, alias, 1.0) for alias in district.aliases or [])
+        names.append((position, district.region_name, REGION_NAME_WEIGHT))
+        entries.append(district_entry(district))
+    return PlaceIndex(entries, names, spelling=True)
+
+
+place_index: CachedIndex[PlaceIndex] = CachedIndex(
+    "place search",
+    [models.Region, models.District],
+    build_place_index,
+    # The fts backend only falls back to it when the FTS table is missing
+    warm=lambda: settings.PLACE_SEARCH_BACKEND == "memory",
+)
+
+
+def get_place_index(db: Session) -> PlaceIndex:
+    return place_index.get(db)
+
+
+# Entity types of the unified search index
+SEARCH_KINDS = ("region", "district", "airport", "port", "checkpoint", "road")
+
+
+def build_search_index(db: Session) -> PlaceIndex:
+    """
+    Index of every named entity: regions, districts (and aliases), airports
+    (also by IATA/ICAO code), ports, checkpoints, and roads grouped by name
+    (id of the first road carrying the name).
+    """
+    entries: list[PlaceEntry] = []
+    names: list[tuple[int, str, float]] = []
+
+    def add(entry: PlaceEntry, *other_names: str | None) -> None:
+        names.extend(
+            (len(entries), name, 1.0) for name in (entry.name, *other_names) if name
+        )
+        entries.append(entry)
+
+    for region in db.exec(select(models.Region)).all():
+        add(region_entry(region))
+    for district in db.exec(select(models.District)).all():
+        add(district_entry(district), *(district.aliases or []))
+    for airport in db.exec(select(models.Airport)).all():
+        add(
+            PlaceEntry(
+                kind="airport",
+                id=airport.id,
+                code=airport.iata_code or airport.icao_code,
+                name=airport.name,
+                region=airport.region,
+                centroid={"lat": airport.latitude, "lon": airport.longitude},
+            ),
+            airport.iata_code,
+            airport.icao_code,
+        )
+    facility_tables: tuple[tuple[str, Any], ...] = (
+        ("port", models.Port),
+        ("checkpoint", models.Checkpoint),
+    )
+    for kind, table in facility_tables:
+        for facility in db.exec(select(table)).all():
+            add(
+                PlaceEntry(
+                    kind=kind,
+                    id=facility.id,
+                    code=None,
+                    name=facility.name,
+                    region=facility.region,
+                    centroid={"lat": facility.latitude, "lon": facility.longitude},
+                )
+            )
+    for name, road_id in db.exec(
+        select(models.Road.name, func.min(models.Road.id)).group_by(models.Road.name)
+    ).all():
+        if name and normalize_name(name) not in UNNAMED_ROADS:
+            add(PlaceEntry(kind="road", id=road_id, code=None, name=name, region=None))
+    return PlaceIndex(entries, names)
+
+
+search_index: CachedIndex[PlaceIndex] = CachedIndex(
+    "entity search",
+    [
+        models.Region,
+        models.District,
+        models.Airport,
+        models.Port,
+        models.Checkpoint,
+        models.Road,
+    ],
+    build_search_index,
+)
+
+
+def get_search_index(db: Session) -> PlaceIndex:
+    return search_index.get(db)
+
+
+# Completion order of the entity types; within a type, by weight
+COMPLETION_KINDS = ("region", "district", "airport", "road")
+# Generic words that do not start a completion on their own ("ro" should
+# not complete every "... Road")
+GENERIC_WORDS = {
+    "road",
+    "rd",
+    "street",
+    "airport",
+    "airstrip",
+    "airfield",
+    "international",
+    "port",
+}
+
+
+@dataclass
+class Completion:
+    """A name offered as completion and the entity it belongs to."""
+
+    text: str  # The name or alias as stored
+    kind: str  # region, district, airport, road
+    id: int
+    name: str  # Entity name (differs from text for aliases)
+    region: str | None = None
+    weight: float = 0  # Population, road segment count, ...
+
+
+class Autocompleter:
+    """
+    Prefix completion over a sorted array of normalized keys.
+
+    Every completion is reachable from the start of each word of its text
+    (except ``GENERIC_WORDS``), so "barde" completes "CeelBarde". Completions are ranked once at build
+    time by type (``COMPLETION_KINDS``), then weight, then length.
+    """
+
+    def __init__(self, completions: Sequence[Completion]):
+        kind_order = {kind: i for i, kind in enumerate(COMPLETION_KINDS)}
+        self.completions = sorted(
+            completions,
+            key=lambda c: (
+                kind_order.get(c.kind, len(kind_order)),
+                -c.weight,
+                len(c.text),
+                c.text,
+            ),
+        )
+        keyed = sorted(
+            (" ".join(words[i:]), rank)
+            for rank, completion in enumerate(self.completions)
+            for words in [normalize_name(completion.text).split()]
+            for i in range(len(words))
+            if i == 0 or words[i] not in GENERIC_WORDS
+        )
+        self.keys = [key for key, _ in keyed]
+        self._ranks = np.array([rank for _, rank in keyed], dtype=np.int64)
+
+    def complete(self, prefix: str, limit: int = 10) -> list[Completion]:
+        """Best ``limit`` completions whose text has a word starting with ``prefix``."""
+        text = normalize_name(prefix)
+        if not text:
+            return []
+        start = bisect.bisect_left(self.keys, text)
+        end = bisect.bisect_left(self.keys, text + "\uffff", lo=start)
+        ranks = self._ranks[start:end]
+        # A completion can match through several of its words: keep spares
+        wanted = limit * 4
+        if len(ranks) > wanted:
+            ranks = ranks[np.argpartition(ranks, wanted)[:wanted]]
+        results: list[Completion] = []
+        for rank in dict.fromkeys(np.sort(ranks).tolist()):
+            results.append(self.completions[rank])
+            if len(results) == limit:
+                break
+        return results
+
+
+def build_autocompleter(db: Session) -> Autocompleter:
+    completions: list[Completion] = []
+    for region in db.exec(select(models.Region)).all():
+        completions.append(
+            Completion(
+                text=region.name,
+                kind="region",
+                id=region.id,
+                name=region.name,
+                region=region.name,
+                weight=region.population or 0,
+            )
+        )
+    for district in db.exec(select(models.District)).all():
+        for text in (district.name, *(district.aliases or [])):
+            completions.append(
+                Completion(
+                    text=text,
+                    kind="district",
+                    id=district.id,
+                    name=district.name,
+                    region=district.region_name,
+                    weight=district.population or 0,
+                )
+            )
+    for airport in db.exec(select(models.Airport)).all():
+        completions.append(
+            Completion(
+                text=airport.name,
+                kind="airport",
+                id=airport.id,
+                name=airport.name,
+                region=airport.region,
+                weight=1 if airport.type == "international" else 0,
+            )
+        )
+    # One completion per road name, weighted by how many roads carry it
+    for name, road_id, count in db.exec(
+        select(
+            models.Road.name,
+            func.min(col(models.Road.id)),
+            func.count(col(models.Road.id)),
+        ).group_by(col(models.Road.name))
+    ).all():
+        if name and normalize_name(name) not in UNNAMED_ROADS:
+            completions.append(
+                Completion(text=name, kind="road", id=road_id, name=name, weight=count)
+            )
+    return Autocompleter(completions)
+
+
+autocompleter: CachedIndex[Autocompleter] = CachedIndex(
+    "place autocomplete",
+    [models.Region, models.District, models.Airport, models.Road],
+    build_autocompleter,
+)
+
+
+def get_autocompleter(db: Session) -> Autocompleter:
+    return autocompleter.get(db)
@@ -0,0 +1,689 @@
+"""
+Routable road network for Somalia Geography API.
+
+The graph is built from the road polylines held by the road index:
+
+- vertices shared by several roads (after snapping coordinates to a
+  ~0.1 m grid) and road end points become graph nodes;
+- the stretches of road between consecutive nodes become undirected edges,
+  weighted by geodesic length and by travel time at a speed assumed from
+  ``Road.type`` and ``Road.surface``.
+
+Query points are snapped onto the nearest road segment, so searches start
+and end part-way along an edge rather than at the closest junction.
+
+Routing uses A* with ALT lower bounds: travel times from a few spread-out
+landmark nodes are precomputed when the graph is built, and the triangle
+inequality turns them into a much tighter heuristic than straight-line
+distance at top speed.
+"""
+
+import heapq
+import math
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from sqlmodel import Session
+
+from app import models
+from app.utils.geo_index import CachedIndex, RoadIndex, get_road_index
+from app.utils.geometry import EARTH_RADIUS_KM, haversine_km, haversine_km_array
+
+# Assumed average speeds (km/h) by road type, scaled by surface
+ROAD_TYPE_SPEEDS_KMH: dict[str, float] = {"primary": 80.0, "secondary": 50.0}
+DEFAULT_ROAD_SPEED_KMH = 40.0
+SURFACE_SPEED_FACTORS: dict[str, float] = {
+    "paved": 1.0,
+    "asphalt": 1.0,
+    "concrete": 1.0,
+    "gravel": 0.7,
+    "unpaved": 0.6,
+    "dirt": 0.5,
+    "ground": 0.5,
+    "sand": 0.4,
+}
+
+# Points farther than this from every road cannot be routed
+MAX_SNAP_KM = 25.0
+
+# Landmarks for the ALT routing heuristic
+LANDMARK_COUNT = 12
+
+# Coordinates are snapped to this many decimal places to find shared vertices
+_NODE_PRECISION = 1e6
+_KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+
+def road_speed_kmh(road_type: str | None, surface: str | None) -> float:
+    """
+    Assumed average travel speed on a road.
+    """
+    speed = ROAD_TYPE_SPEEDS_KMH.get((road_type or "").lower(), DEFAULT_ROAD_SPEED_KMH)
+    return speed * SURFACE_SPEED_FACTORS.get((surface or "").lower(), 1.0)
+
+
+@dataclass
+class RoadSnap:
+    """
+    A point snapped onto the road network.
+
+    Attributes:
+        edge: Graph edge the point lies on
+        segment: Flat vertex index of the road segment it lies on
+        offset_km: Distance along the edge from its first node
+        lon: Snapped longitude
+        lat: Snapped latitude
+        distance_km: Distance from the query point to the snapped point
+    """
+
+    edge: int
+    segment: int
+    offset_km: float
+    lon: float
+    lat: float
+    distance_km: float
+
+
+@dataclass
+class Route:
+    distance_km: float
+    duration_hours: float
+    coordinates: list[list[float]]
+
+
+@dataclass
+class Reach:
+    """
+    Part of the network reachable within a travel time.
+
+    Attributes:
+        hours: Travel time budget
+        road_km: Length of road reachable within the budget
+        points: (n, 2) [lon, lat] of reached nodes and of the farthest
+            reachable point on every partly reached edge
+    """
+
+    hours: float
+    road_km: float
+    points: np.ndarray
+
+
+class RoadGraph:
+    """
+    Undirected road graph over the polylines of a ``RoadIndex``.
+    """
+
+    def __init__(self, roads: RoadIndex):
+        self.roads = roads
+        xs, ys, starts = roads.xs, roads.ys, roads.starts
+        counts = np.diff(starts)
+        road_of_vertex = np.repeat(np.arange(len(roads)), counts)
+
+        # seg_km[j]: length of the segment from vertex j to j + 1 of the same
+        # road (0 at road ends); cum_km[j]: prefix sum, so the length between
+        # two vertices of one road is a difference of cum_km values.
+        self.seg_km = np.zeros(len(xs))
+        if len(xs) > 1:
+            same_road = road_of_vertex[:-1] == road_of_vertex[1:]
+            lengths = haversine_km_array(ys[:-1], xs[:-1], ys[1:], xs[1:])
+            self.seg_km[:-1] = np.where(same_road, lengths, 0.0)
+        self.cum_km = np.cumsum(self.seg_km) - self.seg_km
+
+        # Nodes: road end points and vertices shared by several roads
+        keys = np.round(xs * _NODE_PRECISION).astype(np.int64) * 400_000_000 + np.round(
+            (ys + 90) * _NODE_PRECISION
+        ).astype(np.int64)
+        _, vertex_key, key_counts = np.unique(
+            keys, return_inverse=True, return_counts=True
+        )
+        vertex_key = vertex_key.ravel()
+        is_node = key_counts[vertex_key] > 1
+        nonempty = counts > 0
+        is_node[starts[:-1][nonempty]] = True
+        is_node[starts[1:][nonempty] - 1] = True
+        node_vertices = np.nonzero(is_node)[0]
+
+        node_keys, first_vertex = np.unique(
+            vertex_key[node_vertices], return_index=True
+        )
+        node_of_key = np.full(len(key_counts), -1, dtype=np.int64)
+        node_of_key[node_keys] = np.arange(len(node_keys))
+        self._node_coords = np.column_stack(
+            (xs[node_vertices[first_vertex]], ys[node_vertices[first_vertex]])
+        )
+        self.node_lons: list[float] = self._node_coords[:, 0].tolist()
+        self.node_lats: list[float] = self._node_coords[:, 1].tolist()
+
+        # Edges: stretches of one road between consecutive nodes
+        first, last = node_vertices[:-1], node_vertices[1:]
+        same = road_of_vertex[first] == road_of_vertex[last]
+        self.edge_first = first[same]
+        self.edge_last = last[same]
+        self.edge_road = road_of_vertex[self.edge_first]
+        edge_km = self.cum_km[self.edge_last] - self.cum_km[self.edge_first]
+        speeds = np.array(
+            [
+                road_speed_kmh(t, s)
+                for t, s in zip(roads.types, roads.surfaces, strict=True)
+            ],
+            dtype=np.float64,
+        )
+        self.max_speed_kmh = (
+            float(speeds.max()) if speeds.size else DEFAULT_ROAD_SPEED_KMH
+        )
+        # NumPy arrays for vectorized work, lists for the search loops
+        self._edge_arrays = (
+            node_of_key[vertex_key[self.edge_first]],
+            node_of_key[vertex_key[self.edge_last]],
+            edge_km,
+            edge_km / speeds[self.edge_road] if edge_km.size else edge_km,
+        )
+        self.edge_u: list[int] = self._edge_arrays[0].tolist()
+        self.edge_v: list[int] = self._edge_arrays[1].tolist()
+        self.edge_km: list[float] = edge_km.tolist()
+        self.edge_hours: list[float] = self._edge_arrays[3].tolist()
+
+        self.adjacency: list[list[tuple[int, int]]] = [
+            [] for _ in range(len(node_keys))
+        ]
+        for edge, (u, v) in enumerate(zip(self.edge_u, self.edge_v, strict=True)):
+            if u != v:
+                self.adjacency[u].append((v, edge))
+                self.adjacency[v].append((u, edge))
+
+        self.landmark_hours = self._landmark_distances(LANDMARK_COUNT)
+        self._node_landmarks: list[tuple[float, ...]] = [
+            tuple(row) for row in self.landmark_hours.T.tolist()
+        ]
+
+    @property
+    def node_count(self) -> int:
+        return len(self.adjacency)
+
+    def shortest_paths(
+        self, sources: dict[int, float], weights: list[float], limit: float = math.inf
+    ) -> dict[int, float]:
+        """
+        Dijkstra from several weighted sources.
+
+        Args:
+            sources: Starting cost per node
+            weights: Cost per edge (``edge_hours`` or ``edge_km``)
+            limit: Nodes costing more than this are not expanded
+
+        Returns:
+            Cost of every node reached within ``limit``
+        """
+        best: dict[int, float] = {}
+        heap = [(cost, node) for node, cost in sources.items() if cost <= limit]
+        heapq.heapify(heap)
+        adjacency = self.adjacency
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if node in best:
+                continue
+            best[node] = cost
+            for neighbour, edge in adjacency[node]:
+                new_cost = cost + weights[edge]
+                if new_cost <= limit and neighbour not in best:
+                    heapq.heappush(heap, (new_cost, neighbour))
+        return best
+
+    def _largest_component(self) -> np.ndarray:
+        """Node ids of the largest connected component."""
+        component = np.full(self.node_count, -1, dtype=np.int64)
+        sizes: list[int] = []
+        for start in range(self.node_count):
+            if component[start] >= 0:
+                continue
+            label = len(sizes)
+            component[start] = label
+            stack = [start]
+            size = 0
+            while stack:
+                node = stack.pop()
+                size += 1
+                for neighbour, _ in self.adjacency[node]:
+                    if component[neighbour] < 0:
+                        component[neighbour] = label
+                        stack.append(neighbour)
+            sizes.append(size)
+        return np.flatnonzero(component == int(np.argmax(sizes)))
+
+    def _landmark_distances(self, count: int) -> np.ndarray:
+        """
+        Travel times (hours) from landmarks picked by farthest-point
+        selection; shape (landmarks, nodes), inf where unreachable.
+        """
+        nodes = self.node_count
+        if not nodes or not count:
+            return np.empty((0, nodes))
+        # Seed with the westernmost node of the largest connected component
+        component = self._largest_component()
+        landmark = int(component[np.argmin(self._node_coords[component, 0])])
+        rows: list[np.ndarray] = []
+        nearest = np.full(nodes, np.inf)
+        for _ in range(count):
+            row = np.full(nodes, np.inf)
+            reached = self.shortest_paths({landmark: 0.0}, self.edge_hours)
+            row[list(reached)] = list(reached.values())
+            rows.append(row)
+            nearest = np.minimum(nearest, row)
+            candidates = np.where(np.isfinite(nearest), nearest, -1.0)
+            landmark = int(candidates.argmax())
+            if candidates[landmark] <= 0:
+                break
+        return np.vstack(rows)
+
+    def _heuristic(self, end: RoadSnap) -> Callable[[int], float]:
+        """Lower bound on travel time (hours) from a node to ``end``."""
+        exits = self._entry_costs(end, self.edge_hours)
+        landmarks = []
+        for i, row in enumerate(self.landmark_hours):
+            to_end = min(float(row[node]) + cost for node, cost in exits.items())
+            # A landmark that cannot reach the destination gives no bound
+            if math.isfinite(to_end):
+                landmarks.append((i, to_end))
+        node_landmarks, node_lats, node_lons = (
+            self._node_landmarks,
+            self.node_lats,
+            self.node_lons,
+        )
+        end_lat, end_lon, max_speed = end.lat, end.lon, self.max_speed_kmh
+
+        def bound(node: int) -> float:
+            estimate = (
+                haversine_km(node_lats[node], node_lons[node], end_lat, end_lon)
+                / max_speed
+            )
+            row = node_landmarks[node]
+            for i, to_end in landmarks:
+                # Infinite when the node is cut off from the destination
+                gap = abs(row[i] - to_end)
+                if gap > estimate:
+                    estimate = gap
+            return estimate
+
+        return bound
+
+    def snap(
+        self, lon: float, lat: float, max_km: float = MAX_SNAP_KM
+    ) -> RoadSnap | None:
+        """
+        Snap a point onto the nearest road segment within ``max_km``.
+        """
+        if not self.edge_km:
+            return None
+        km_per_lon = _KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6)
+        radius = 0.01
+        while True:
+            box = (lon - radius, lat - radius, lon + radius, lat + radius)
+            best = self._nearest_segment(
+                lon, lat, self.roads.query_positions(box, exact=False), km_per_lon
+            )
+            # Roads outside the search box are at least this far away
+            covered_km = radius * min(km_per_lon, _KM_PER_DEGREE)
+            if best is not None and best[0] <= covered_km:
+                break
+            if covered_km >= max_km:
+                break
+            radius *= 4
+        if best is None or best[0] > max_km:
+            return None
+
+        # Approximate (planar) distance picked the segment; report geodesic
+        _, segment, t = best
+        xs, ys = self.roads.xs, self.roads.ys
+        snap_lon = float(xs[segment] + t * (xs[segment + 1] - xs[segment]))
+        snap_lat = float(ys[segment] + t * (ys[segment + 1] - ys[segment]))
+        edge = int(np.searchsorted(self.edge_first, segment, side="right")) - 1
+        offset = float(
+            self.cum_km[segment]
+            - self.cum_km[self.edge_first[edge]]
+            + t * self.seg_km[segment]
+        )
+        return RoadSnap(
+            edge=edge,
+            segment=segment,
+            offset_km=offset,
+            lon=snap_lon,
+            lat=snap_lat,
+            distance_km=haversine_km(lat, lon, snap_lat, snap_lon),
+        )
+
+    def _nearest_segment(
+        self, lon: float, lat: float, positions: np.ndarray, km_per_lon: float
+    ) -> tuple[float, int, float] | None:
+        """(distance_km, segment, t) of the closest segment of the given roads."""
+        if not positions.size:
+            return None
+        starts = self.roads.starts[positions]
+        seg_counts = np.maximum(self.roads.starts[positions + 1] - starts - 1, 0)
+        if not seg_counts.sum():
+            return None
+        offsets = np.arange(seg_counts.sum()) - np.repeat(
+            np.cumsum(seg_counts) - seg_counts, seg_counts
+        )
+        segments = np.repeat(starts, seg_counts) + offsets
+
+        # Local equirectangular projection around the query point (km)
+        xs, ys = self.roads.xs, self.roads.ys
+        ax = (xs[segments] - lon) * km_per_lon
+        ay = (ys[segments] - lat) * _KM_PER_DEGREE
+        dx = (xs[segments + 1] - lon) * km_per_lon - ax
+        dy = (ys[segments + 1] - lat) * _KM_PER_DEGREE - ay
+        length2 = dx * dx + dy * dy
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.clip(
+                np.where(length2 > 0, -(ax * dx + ay * dy) / length2, 0.0), 0.0, 1.0
+            )
+        distance = np.hypot(ax + t * dx, ay + t * dy)
+        best = int(distance.argmin())
+        return float(distance[best]), int(segments[best]), float(t[best])
+
+    def _entry_costs(self, snap: RoadSnap, weights: list[float]) -> dict[int, float]:
+        """Cost from a snapped point to each node of its edge (or back)."""
+        edge = snap.edge
+        length = self.edge_km[edge]
+        fraction = snap.offset_km / length if length > 0 else 0.0
+        costs: dict[int, float] = {}
+        for node, cost in (
+            (self.edge_u[edge], fraction * weights[edge]),
+            (self.edge_v[edge], (1 - fraction) * weights[edge]),
+        ):
+            costs[node] = min(cost, costs.get(node, math.inf))
+        return costs
+
+    def route_costs(
+        self, sources: list[RoadSnap], targets: list[RoadSnap]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Hours and km of the fastest routes from every source to every target.
+
+        One Dijkstra per source, each stopping once every target's edge has
+        been settled from both ends.
+
+        Returns:
+            (hours, km) arrays of shape (len(sources), len(targets)); inf
+            where no route exists
+        """
+        hours_matrix = np.full((len(sources), len(targets)), np.inf)
+        km_matrix = np.full((len(sources), len(targets)), np.inf)
+        exits = [self._entry_costs(target, self.edge_hours) for target in targets]
+        exit_km = [self._entry_costs(target, self.edge_km) for target in targets]
+        hours, lengths, adjacency = self.edge_hours, self.edge_km, self.adjacency
+
+        for i, source in enumerate(sources):
+            remaining = {node for target_exits in exits for node in target_exits}
+            entry_km = self._entry_costs(source, self.edge_km)
+            heap = [
+                (cost, entry_km[node], node)
+                for node, cost in self._entry_costs(source, hours).items()
+            ]
+            heapq.heapify(heap)
+            best: dict[int, tuple[float, float]] = {}
+            while heap and remaining:
+                cost, km, node = heapq.heappop(heap)
+                if node in best:
+                    continue
+                best[node] = (cost, km)
+                remaining.discard(node)
+                for neighbour, edge in adjacency[node]:
+                    if neighbour not in best:
+                        heapq.heappush(
+                            heap, (cost + hours[edge], km + lengths[edge], neighbour)
+                        )
+
+            for j, target in enumerate(targets):
+                candidates = [
+                    (best[node][0] + cost, best[node][1] + exit_km[j][node])
+                    for node, cost in exits[j].items()
+                    if node in best
+                ]
+                if source.edge == target.edge:
+                    along = abs(target.offset_km - source.offset_km)
+                    length = lengths[source.edge]
+                    candidates.append(
+                        (
+                            along / length * hours[source.edge] if length > 0 else 0.0,
+                            along,
+                        )
+                    )
+                if candidates:
+                    hours_matrix[i, j], km_matrix[i, j] = min(candidates)
+        return hours_matrix, km_matrix
+
+    def _points_along(self, edges: np.ndarray, offsets_km: np.ndarray) -> np.ndarray:
+        """[lon, lat] of points ``offsets_km`` along edges from their first node."""
+        if not edges.size:
+            return np.empty((0, 2))
+        xs, ys = self.roads.xs, self.roads.ys
+        first = self.edge_first[edges]
+        last = self.edge_last[edges]
+        target = self.cum_km[first] + offsets_km
+        vertex = np.clip(
+            np.searchsorted(self.cum_km, target, side="right") - 1, first, last - 1
+        )
+        seg_km = self.seg_km[vertex]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.clip(
+                np.where(seg_km > 0, (target - self.cum_km[vertex]) / seg_km, 0.0), 0, 1
+            )
+        return np.column_stack(
+            (
+                xs[vertex] + t * (xs[vertex + 1] - xs[vertex]),
+                ys[vertex] + t * (ys[vertex + 1] - ys[vertex]),
+            )
+        )
+
+    def reachable(self, start: RoadSnap, limits_hours: list[float]) -> list[Reach]:
+        """
+        Network reachable from a snapped point within each travel time.
+
+        Runs a single Dijkstra bounded by the largest limit; an edge is
+        reached from either end for the time left when getting there.
+        """
+        edge_u, edge_v, km, hours = self._edge_arrays
+        reached = self.shortest_paths(
+            self._entry_costs(start, self.edge_hours),
+            self.edge_hours,
+            max(limits_hours),
+        )
+        nodes = np.fromiter(reached.keys(), dtype=np.int64, count=len(reached))
+        costs = np.full(self.node_count, np.inf)
+        costs[nodes] = np.fromiter(
+            reached.values(), dtype=np.float64, count=len(reached)
+        )
+        cost_u = costs[edge_u]
+        cost_v = costs[edge_v]
+
+        results = []
+        for limit in limits_hours:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                from_u = np.clip(
+                    np.where(
+                        hours > 0, (limit - cost_u) / hours, (cost_u <= limit) * 1.0
+                    ),
+                    0,
+                    1,
+                )
+                from_v = np.clip(
+                    np.where(
+                        hours > 0, (limit - cost_v) / hours, (cost_v <= limit) * 1.0
+                    ),
+                    0,
+                    1,
+                )
+            covered = np.minimum(from_u + from_v, 1.0)
+
+            # The start edge is also covered outwards from the start point
+            edge, length = start.edge, km[start.edge]
+            radius = limit / hours[edge] * length if hours[edge] > 0 else length
+            intervals = sorted(
+                (
+                    (0.0, from_u[edge] * length),
+                    (length - from_v[edge] * length, length),
+                    (
+                        max(0.0, start.offset_km - radius),
+                        min(length, start.offset_km + radius),
+                    ),
+                )
+            )
+            start_km, (lo, hi) = 0.0, intervals[0]
+            for a, b in intervals[1:]:
+                if a > hi:
+                    start_km += hi - lo
+                    lo = a
+                hi = max(hi, b)
+            covered[edge] = (start_km + hi - lo) / length if length > 0 else 1.0
+
+            partial_u = np.nonzero((from_u > 0) & (from_u < 1))[0]
+            partial_v = np.nonzero((from_v > 0) & (from_v < 1))[0]
+            within = nodes[costs[nodes] <= limit]
+            start_reach = np.clip(
+                start.offset_km + np.array([-radius, radius]), 0, length
+            )
+            points = np.vstack(
+                (
+                    [[start.lon, start.lat]],
+                    self._points_along(np.array([edge, edge]), start_reach),
+                    self._node_coords[within],
+                    self._points_along(partial_u, from_u[partial_u] * km[partial_u]),
+                    self._points_along(
+                        partial_v, (1 - from_v[partial_v]) * km[partial_v]
+                    ),
+                )
+            )
+            results.append(
+                Reach(hours=limit, road_km=float(covered @ km), points=points)
+            )
+        return results
+
+    def _edge_coords(self, edge: int, from_node: int) -> list[list[float]]:
+        """Vertices of an edge, walked starting from ``from_node``."""
+        first, last = int(self.edge_first[edge]), int(self.edge_last[edge])
+        coords: list[list[float]] = np.column_stack(
+            (self.roads.xs[first : last + 1], self.roads.ys[first : last + 1])
+        ).tolist()
+        return coords if from_node == self.edge_u[edge] else coords[::-1]
+
+    def _partial_coords(self, snap: RoadSnap, node: int) -> list[list[float]]:
+        """Vertices from a snapped point to one node of its edge."""
+        xs, ys = self.roads.xs, self.roads.ys
+        first, last = int(self.edge_first[snap.edge]), int(self.edge_last[snap.edge])
+        if node == self.edge_u[snap.edge]:
+            vertices = range(snap.segment, first - 1, -1)
+        else:
+            vertices = range(snap.segment + 1, last + 1)
+        return [[snap.lon, snap.lat]] + [[float(xs[i]), float(ys[i])] for i in vertices]
+
+    def route(self, start: RoadSnap, end: RoadSnap) -> Route | None:
+        """
+        Fastest route between two snapped points (A* on travel time).
+
+        The heuristic (see ``_heuristic``) never overestimates, so the
+        first time the destination is taken off the queue it is optimal.
+        """
+        hours = self.edge_hours
+        exits = self._entry_costs(end, hours)
+        heuristic = self._heuristic(end)
+        adjacency = self.adjacency
+
+        best: dict[int, float] = {}
+        previous: dict[int, tuple[int, int]] = {}
+        heap: list[tuple[float, float, int]] = []
+        for node, cost in self._entry_costs(start, hours).items():
+            best[node] = cost
+            heapq.heappush(heap, (cost + heuristic(node), cost, node))
+
+        # Node -1 stands for the destination point itself
+        target_cost, target_via = math.inf, None
+        if start.edge == end.edge:
+            length = self.edge_km[start.edge]
+            if length > 0:
+                target_cost = (
+                    abs(end.offset_km - start.offset_km) / length * hours[start.edge]
+                )
+            else:
+                target_cost = 0.0
+            heapq.heappush(heap, (target_cost, target_cost, -1))
+
+        while heap:
+            _, cost, node = heapq.heappop(heap)
+            if node == -1:
+                break
+            if cost > best[node]:
+                continue
+            if node in exits and cost + exits[node] < target_cost:
+                target_cost, target_via = cost + exits[node], node
+                heapq.heappush(heap, (target_cost, target_cost, -1))
+            for neighbour, edge in adjacency[node]:
+                new_cost = cost + hours[edge]
+                if new_cost < best.get(neighbour, math.inf):
+                    best[neighbour] = new_cost
+                    previous[neighbour] = (node, edge)
+                    heapq.heappush(
+                        heap, (new_cost + heuristic(neighbour), new_cost, neighbour)
+                    )
+
+        if math.isinf(target_cost):
+            return None
+        if target_via is None:
+            # Both points on the same edge, no junction in between
+            coords = self._direct_coords(start, end)
+            return Route(abs(end.offset_km - start.offset_km), target_cost, coords)
+
+        # Walk back from the exit node to the node the search entered at
+        edges: list[tuple[int, int]] = []
+        node = target_via
+        while node in previous:
+            node, edge = previous[node]
+            edges.append((edge, node))
+        edges.reverse()
+
+        coords = self._partial_coords(start, node)
+        distance = self._partial_km(start, node)
+        for edge, from_node in edges:
+            coords.extend(self._edge_coords(edge, from_node)[1:])
+            distance += self.edge_km[edge]
+        coords.extend(self._partial_coords(end, target_via)[::-1][1:])
+        distance += self._partial_km(end, target_via)
+        return Route(distance, target_cost, _dedupe(coords))
+
+    def _partial_km(self, snap: RoadSnap, node: int) -> float:
+        if node == self.edge_u[snap.edge]:
+            return snap.offset_km
+        return self.edge_km[snap.edge] - snap.offset_km
+
+    def _direct_coords(self, start: RoadSnap, end: RoadSnap) -> list[list[float]]:
+        xs, ys = self.roads.xs, self.roads.ys
+        if (start.segment, start.offset_km) <= (end.segment, end.offset_km):
+            vertices = range(start.segment + 1, end.segment + 1)
+        else:
+            vertices = range(start.segment, end.segment, -1)
+        inner = [[float(xs[i]), float(ys[i])] for i in vertices]
+        coords = _dedupe([[start.lon, start.lat], *inner, [end.lon, end.lat]])
+        # A LineString needs two positions even when start == end
+        return coords if len(coords) > 1 else coords * 2
+
+
+def _dedupe(coords: list[list[float]]) -> list[list[float]]:
+    result: list[list[float]] = []
+    for point in coords:
+        if not result or point != result[-1]:
+            result.append(point)
+    return result
+
+
+def _build_road_graph(db: Session) -> RoadGraph:
+    return RoadGraph(get_road_index(db))
+
+
+road_graph: CachedIndex[RoadGraph] = CachedIndex(
+    "road graph", [models.Road], _build_road_graph
+)
+
+
+def get_road_graph(db: Session) -> RoadGraph:
+    return road_graph.get(db)
@@ -0,0 +1,391 @@
+"""
+Optional native geometry storage for Somalia Geography API.
+
+Geometries are always stored as GeoJSON in the ``geometry`` JSON columns.
+When the database supports it - PostGIS on Postgres, SpatiaLite on SQLite
+when the extension can be loaded - the loader also maintains a native
+``geom`` column with a spatial index on ``region``, ``district`` and ``road``,
+and endpoints push bbox and point-containment predicates into SQL. Otherwise
+they fall back to the precomputed bbox columns and the in-memory indexes.
+
+On SQLite the loader also maintains an R*Tree virtual table of row bounding
+boxes per table (``road_rtree``, ``district_rtree``, ...; the rtree module
+ships with stock SQLite), kept in sync by triggers, so bbox filters select
+their candidates from the R*Tree instead of scanning the bbox columns.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Integer, column, func, literal_column, table, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlmodel import Session, SQLModel, select
+
+from app import models
+from app.utils.geo_index import CachedIndex
+from app.utils.geometry import BBox
+
+logger = logging.getLogger(__name__)
+
+POSTGIS = "postgis"
+SPATIALITE = "spatialite"
+
+GEOMETRY_COLUMN = "geom"
+SRID = 4326
+
+# Tables whose GeoJSON geometry is mirrored into a native geometry column
+GEOMETRY_TABLES: tuple[type[SQLModel], ...] = (
+    models.Region,
+    models.District,
+    models.Road,
+)
+# Tables whose geometry column holds a bare [[lon, lat], ...] array, not a
+# GeoJSON object: mirrored as a LineString
+LINESTRING_TABLES: tuple[type[SQLModel], ...] = (models.Road,)
+
+# Tables with an R*Tree of row bounds: (min_lon, max_lon, min_lat, max_lat) columns
+RTREE_TABLES: dict[type[SQLModel], tuple[str, str, str, str]] = {
+    models.Region: ("min_lon", "max_lon", "min_lat", "max_lat"),
+    models.District: ("min_lon", "max_lon", "min_lat", "max_lat"),
+    models.Road: ("min_lon", "max_lon", "min_lat", "max_lat"),
+    models.Airport: ("longitude", "longitude", "latitude", "latitude"),
+    models.Port: ("longitude", "longitude", "latitude", "latitude"),
+    models.Checkpoint: ("longitude", "longitude", "latitude", "latitude"),
+}
+
+
+def _table_name(model: type[SQLModel]) -> str:
+    return str(model.__tablename__)
+
+
+def _rtree_name(model: type[SQLModel]) -> str:
+    return f"{_table_name(model)}_rtree"
+
+
+def _spatialite_loaded(db: Session) -> bool:
+    try:
+        db.exec(select(func.spatialite_version())).one()
+        return True
+    except DBAPIError:
+        db.rollback()
+        return False
+
+
+def geojson_sql(model: type[SQLModel], dialect: str) -> tuple[str, str]:
+    """
+    SQL text of a row's geometry as a GeoJSON string on ``dialect``
+    ("postgresql" or "sqlite"), and the condition for rows that have one.
+    Coordinate arrays of ``LINESTRING_TABLES`` are wrapped as a LineString
+    and need at least two points.
+    """
+    if model not in LINESTRING_TABLES:
+        return (
+            "geometry::text" if dialect == "postgresql" else "geometry"
+        ), "geometry IS NOT NULL"
+    if dialect == "postgresql":
+        return (
+            "json_build_object('type', 'LineString', 'coordinates', geometry)::text",
+            "CASE WHEN json_typeof(geometry) = 'array' THEN json_array_length(geometry) >= 2 ELSE false END",
+        )
+    return (
+        "json_object('type', 'LineString', 'coordinates', json(geometry))",
+        "json_type(geometry) = 'array' AND json_array_length(geometry) >= 2",
+    )
+
+
+def sync_geometry_columns(db: Session) -> str | None:
+    """
+    Create or refresh the native geometry columns from the GeoJSON geometry.
+
+    Returns the spatial backend used, or None when the database has neither
+    PostGIS nor a loadable SpatiaLite (nothing is changed then). The cached
+    spatial support is refreshed, so queries use the new columns at once.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        try:
+            db.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+        except DBAPIError as e:
+            db.rollback()
+            logger.warning(
+                "PostGIS is not available, keeping JSON geometry only: %s", e
+            )
+            return None
+        for model in GEOMETRY_TABLES:
+            name = _table_name(model)
+            geojson, present = geojson_sql(model, dialect)
+            db.execute(
+                text(
+                    f"ALTER TABLE {name} ADD COLUMN IF NOT EXISTS {GEOMETRY_COLUMN} geometry(Geometry, {SRID})"
+                )
+            )
+            db.execute(
+                text(
+                    f"UPDATE {name} SET {GEOMETRY_COLUMN} = "
+                    f"ST_SetSRID(ST_GeomFromGeoJSON({geojson}), {SRID}) WHERE {present}"
+                )
+            )
+            db.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{name}_{GEOMETRY_COLUMN} ON {name} USING GIST ({GEOMETRY_COLUMN})"
+                )
+            )
+            db.execute(text(f"ANALYZE {name}"))
+        db.commit()
+        _support.invalidate()
+        return POSTGIS
+
+    if dialect == "sqlite" and _spatialite_loaded(db):
+        has_metadata = db.execute(
+            text(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = 'geometry_columns'"
+            )
+        ).scalar()
+        if not has_metadata:
+            db.execute(text("SELECT InitSpatialMetadata(1)"))
+        for model in GEOMETRY_TABLES:
+            name = _table_name(model)
+            geojson, present = geojson_sql(model, dialect)
+            registered = db.execute(
+                text(
+                    "SELECT spatial_index_enabled FROM geometry_columns "
+                    "WHERE f_table_name = :name AND f_geometry_column = :column"
+                ),
+                {"name": name, "column": GEOMETRY_COLUMN},
+            ).first()
+            if registered is None:
+                db.execute(
+                    text(
+                        f"SELECT AddGeometryColumn('{name}', '{GEOMETRY_COLUMN}', {SRID}, 'GEOMETRY', 'XY')"
+                    )
+                )
+            db.execute(
+                text(
+                    f"UPDATE {name} SET {GEOMETRY_COLUMN} = "
+                    f"SetSRID(GeomFromGeoJSON({geojson}), {SRID}) WHERE {present}"
+                )
+            )
+            if registered is None or not registered[0]:
+                db.execute(
+                    text(f"SELECT CreateSpatialIndex('{name}', '{GEOMETRY_COLUMN}')")
+                )
+        db.commit()
+        _support.invalidate()
+        return SPATIALITE
+
+    return None
+
+
+def sync_rtree_tables(db: Session) -> bool:
+    """
+    Create the SQLite R*Tree bbox tables and their sync triggers, and
+    rebuild their contents from the bounds columns.
+
+    Returns False (changing nothing) on other databases or when SQLite was
+    built without the rtree module. The cached spatial support is refreshed.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return False
+    try:
+        for model, (min_lon, max_lon, min_lat, max_lat) in RTREE_TABLES.items():
+            name, rtree = _table_name(model), _rtree_name(model)
+            values = (
+                f"new.id, new.{min_lon}, new.{max_lon}, new.{min_lat}, new.{max_lat}"
+            )
+            present = f"new.{min_lon} IS NOT NULL AND new.{min_lat} IS NOT NULL"
+            bounds = ", ".join(dict.fromkeys((min_lon, max_lon, min_lat, max_lat)))
+            for statement in (
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {rtree} USING rtree(id, min_lon, max_lon, min_lat, max_lat)",
+                f"CREATE TRIGGER IF NOT EXISTS {rtree}_insert AFTER INSERT ON {name} WHEN {present} "
+                f"BEGIN INSERT INTO {rtree} VALUES ({values}); END",
+                f"CREATE TRIGGER IF NOT EXISTS {rtree}_update AFTER UPDATE OF {bounds} ON {name} "
+                f"BEGIN DELETE FROM {rtree} WHERE id = old.id; "
+                f"INSERT INTO {rtree} SELECT {values} WHERE {present}; END",
+                f"CREATE TRIGGER IF NOT EXISTS {rtree}_delete AFTER DELETE ON {name} "
+                f"BEGIN DELETE FROM {rtree} WHERE id = old.id; END",
+                f"DELETE FROM {rtree}",
+                f"INSERT INTO {rtree} SELECT id, {min_lon}, {max_lon}, {min_lat}, {max_lat} FROM {name} "
+                f"WHERE {min_lon} IS NOT NULL AND {min_lat} IS NOT NULL",
+            ):
+                db.execute(text(statement))
+    except OperationalError as e:
+        db.rollback()
+        logger.warning("SQLite R*Tree tables not created: %s", e)
+        return False
+    db.commit()
+    _support.invalidate()
+    return True
+
+
+@dataclass
+class SpatialSupport:
+    backend: str | None  # 'postgis', 'spatialite' or None
+    rtree: bool  # SQLite R*Tree bbox tables present
+
+
+def _detect_backend(db: Session) -> str | None:
+    """The spatial backend, if every geometry table has its native column."""
+    names = [_table_name(model) for model in GEOMETRY_TABLES]
+    dialect = db.get_bind().dialect.name
+    try:
+        if dialect == "postgresql":
+            columns = db.execute(
+                text(
+                    "SELECT count(*) FROM information_schema.columns "
+                    "WHERE table_schema = current_schema() AND column_name = :column "
+                    "AND table_name = ANY(:names)"
+                ),
+                {"column": GEOMETRY_COLUMN, "names": names},
+            ).scalar()
+            return POSTGIS if columns == len(names) else None
+        if dialect == "sqlite" and _spatialite_loaded(db):
+            columns = db.execute(
+                text(
+                    "SELECT count(*) FROM geometry_columns WHERE f_geometry_column = :column "
+                    "AND spatial_index_enabled = 1 AND f_table_name IN ("
+                    + ", ".join(f"'{name}'" for name in names)
+                    + ")"
+                ),
+                {"column": GEOMETRY_COLUMN},
+            ).scalar()
+            return SPATIALITE if columns == len(names) else None
+    except DBAPIError:
+        db.rollback()
+    return None
+
+
+def _detect_rtree(db: Session) -> bool:
+    if db.get_bind().dialect.name != "sqlite":
+        return False
+    names = [_rtree_name(model) for model in RTREE_TABLES]
+    present = db.execute(
+        text(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name IN ("
+            + ", ".join(f"'{name}'" for name in names)
+            + ")"
+        )
+    ).scalar()
+    return present == len(names)
+
+
+_support = CachedIndex(
+    "spatial support",
+    tuple(RTREE_TABLES),
+    lambda db: SpatialSupport(backend=_detect_backend(db), rtree=_detect_rtree(db)),
+)
+
+
+def spatial_backend(db: Session) -> str | None:
+    """'postgis', 'spatialite', or None for the JSON-only fallback."""
+    return _support.get(db).backend
+
+
+def _geom(model: type[SQLModel]) -> Any:
+    return literal_column(f"{_table_name(model)}.{GEOMETRY_COLUMN}")
+
+
+def _spatialite_candidates(model: type[SQLModel], frame: Any) -> Any:
+    """Row ids whose geometry MBR intersects ``frame``, from the SpatiaLite R*Tree."""
+    return (
+        select(literal_column("ROWID", Integer))
+        .select_from(table("SpatialIndex"))
+        .where(
+            literal_column("f_table_name") == _table_name(model),
+            literal_column("f_geometry_column") == GEOMETRY_COLUMN,
+            literal_column("search_frame") == frame,
+        )
+    )
+
+
+def bbox_conditions(db: Session, model: type[SQLModel], box: BBox) -> tuple[Any, ...]:
+    """
+    SQL conditions selecting the rows of ``model`` whose bounding box (or
+    point, for transport facilities) intersects ``box``: the spatial index
+    of a spatial backend, else the SQLite R*Tree, else the indexed bounds
+    columns precomputed by the loader.
+    """
+    min_lon, min_lat, max_lon, max_lat = box
+    support = _support.get(db)
+    if model in GEOMETRY_TABLES:
+        if support.backend == POSTGIS:
+            return (
+                _geom(model).op("&&")(
+                    func.ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, SRID)
+                ),
+            )
+        if support.backend == SPATIALITE:
+            frame = func.BuildMbr(min_lon, min_lat, max_lon, max_lat, SRID)
+            return (model.id.in_(_spatialite_candidates(model, frame)),)  # type: ignore[attr-defined]
+
+    low_lon, high_lon, low_lat, high_lat = (
+        getattr(model, name) for name in RTREE_TABLES[model]
+    )
+    overlaps = (
+        high_lon >= min_lon,
+        low_lon <= max_lon,
+        high_lat >= min_lat,
+        low_lat <= max_lat,
+    )
+    if not support.rtree:
+        return overlaps
+    rtree = table(
+        _rtree_name(model),
+        column("id"),
+        column("min_lon"),
+        column("max_lon"),
+        column("min_lat"),
+        column("max_lat"),
+    )
+    candidates = select(rtree.c.id).where(
+        rtree.c.max_lon >= min_lon,
+        rtree.c.min_lon <= max_lon,
+        rtree.c.max_lat >= min_lat,
+        rtree.c.min_lat <= max_lat,
+    )
+    # R*Tree bounds are 32-bit floats rounded outwards: re-check the candidates
+    return (model.id.in_(candidates), *overlaps)  # type: ignore[attr-defined]
+
+
+def intersects_conditions(
+    db: Session, model: type[SQLModel], box: BBox
+) -> tuple[Any, ...] | None:
+    """
+    SQL conditions selecting the rows of ``model`` whose geometry itself
+    intersects ``box``, or None without a spatial backend.
+    """
+    min_lon, min_lat, max_lon, max_lat = box
+    backend = spatial_backend(db)
+    if backend == POSTGIS:
+        envelope = func.ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, SRID)
+        return (func.ST_Intersects(_geom(model), envelope),)
+    if backend == SPATIALITE:
+        frame = func.BuildMbr(min_lon, min_lat, max_lon, max_lat, SRID)
+        return (
+            model.id.in_(_spatialite_candidates(model, frame)),  # type: ignore[attr-defined]
+            func.Intersects(_geom(model), frame) == 1,
+        )
+    return None
+
+
+def contains_point_conditions(
+    db: Session, model: type[SQLModel], lon: float, lat: float
+) -> tuple[Any, ...] | None:
+    """
+    SQL conditions selecting the rows of ``model`` whose geometry contains
+    the point (boundary included), or None without a spatial backend.
+    """
+    backend = spatial_backend(db)
+    if backend == POSTGIS:
+        return (
+            func.ST_Intersects(
+                _geom(model), func.ST_SetSRID(func.ST_MakePoint(lon, lat), SRID)
+            ),
+        )
+    if backend == SPATIALITE:
+        point = func.MakePoint(lon, lat, SRID)
+        return (
+            model.id.in_(_spatialite_candidates(model, point)),  # type: ignore[attr-defined]
+            func.Intersects(_geom(model), point) == 1,
+        )
+    return None
@@ -0,0 +1,225 @@
+"""
+In-memory spatial indexes for Somalia Geography API.
+
+- STRtree: static R-tree bulk-loaded with Sort-Tile-Recursive, for boxes
+- KDTree: static k-d tree, for nearest-neighbour queries on points
+
+The indexed datasets only change when the loader runs, so trees are built
+once and queried many times; they are never updated in place.
+"""
+
+import heapq
+import math
+from collections.abc import Sequence
+from typing import Any, Generic, TypeVar
+
+from app.utils.geometry import BBox
+
+T = TypeVar("T")
+
+
+class STRtree(Generic[T]):
+    """
+    Static R-tree packed with Sort-Tile-Recursive.
+
+    Args:
+        entries: (bbox, item) pairs to index
+        node_capacity: Maximum number of children per node
+    """
+
+    def __init__(self, entries: Sequence[tuple[BBox, T]], node_capacity: int = 10):
+        if node_capacity < 2:
+            raise ValueError("node_capacity must be at least 2")
+        self.node_capacity = node_capacity
+        self._items: list[T] = [item for _, item in entries]
+        self._boxes: list[BBox] = [bbox for bbox, _ in entries]
+        # Each level is a list of nodes; a node is (bbox, child indices).
+        # Level 0 children index into self._items, level n into level n-1.
+        self._levels: list[list[tuple[BBox, list[int]]]] = []
+
+        boxes = self._boxes
+        indices = list(range(len(boxes)))
+        while indices:
+            nodes = self._pack(boxes, indices)
+            self._levels.append(nodes)
+            if len(nodes) == 1:
+                break
+            boxes = [bbox for bbox, _ in nodes]
+            indices = list(range(len(nodes)))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _pack(
+        self, boxes: list[BBox], indices: list[int]
+    ) -> list[tuple[BBox, list[int]]]:
+        capacity = self.node_capacity
+        node_count = math.ceil(len(indices) / capacity)
+        slab_count = math.ceil(math.sqrt(node_count))
+        slab_size = slab_count * capacity
+
+        by_x = sorted(indices, key=lambda i: boxes[i][0] + boxes[i][2])
+        nodes = []
+        for start in range(0, len(by_x), slab_size):
+            slab = sorted(
+                by_x[start : start + slab_size], key=lambda i: boxes[i][1] + boxes[i][3]
+            )
+            for node_start in range(0, len(slab), capacity):
+                children = slab[node_start : node_start + capacity]
+                nodes.append(
+                    (
+                        (
+                            min(boxes[i][0] for i in children),
+                            min(boxes[i][1] for i in children),
+                            max(boxes[i][2] for i in children),
+                            max(boxes[i][3] for i in children),
+                        ),
+                        children,
+                    )
+                )
+        return nodes
+
+    def query(self, bbox: BBox) -> list[T]:
+        """
+        Return items whose bounding box intersects ``bbox``.
+        """
+        if not self._levels:
+            return []
+        min_x, min_y, max_x, max_y = bbox
+        results = []
+        top = len(self._levels) - 1
+        stack = [(top, i) for i in range(len(self._levels[top]))]
+        while stack:
+            level, index = stack.pop()
+            node_bbox, children = self._levels[level][index]
+            if (
+                node_bbox[0] > max_x
+                or node_bbox[2] < min_x
+                or node_bbox[1] > max_y
+                or node_bbox[3] < min_y
+            ):
+                continue
+            if level == 0:
+                for i in children:
+                    box = self._boxes[i]
+                    if (
+                        box[0] <= max_x
+                        and box[2] >= min_x
+                        and box[1] <= max_y
+                        and box[3] >= min_y
+                    ):
+                        results.append(self._items[i])
+            else:
+                stack.extend((level - 1, i) for i in children)
+        return results
+
+    def query_point(self, x: float, y: float) -> list[T]:
+        """
+        Return items whose bounding box contains the point (x, y).
+        """
+        return self.query((x, y, x, y))
+
+
+class KDTree(Generic[T]):
+    """
+    Static k-d tree over points in any number of dimensions.
+
+    Args:
+        entries: (point, item) pairs to index; all points must have the
+            same dimension
+        leaf_size: Maximum number of points stored in a leaf
+    """
+
+    def __init__(
+        self, entries: Sequence[tuple[Sequence[float], T]], leaf_size: int = 8
+    ):
+        self._points: list[tuple[float, ...]] = [tuple(point) for point, _ in entries]
+        self._items: list[T] = [item for _, item in entries]
+        self.leaf_size = max(1, leaf_size)
+        # Node: (axis, split value, left, right) or (-1, 0.0, indices, None)
+        self._root = (
+            self._build(list(range(len(self._points)))) if self._points else None
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _build(self, indices: list[int]) -> tuple[int, float, Any, Any]:
+        if len(indices) <= self.leaf_size:
+            return (-1, 0.0, indices, None)
+        points = self._points
+        dims = len(points[indices[0]])
+        # Split on the axis with the largest spread
+        spreads = [
+            max(points[i][d] for i in indices) - min(points[i][d] for i in indices)
+            for d in range(dims)
+        ]
+        axis = spreads.index(max(spreads))
+        indices.sort(key=lambda i: points[i][axis])
+        mid = len(indices) // 2
+        split = points[indices[mid]][axis]
+        return (axis, split, self._build(indices[:mid]), self._build(indices[mid:]))
+
+    def nearest(self, point: Sequence[float], k: int = 1) -> list[tuple[float, T]]:
+        """
+        Return the k nearest items as (euclidean distance, item), closest first.
+        """
+        if self._root is None or k < 1:
+            return []
+        target = tuple(point)
+        # Max-heap of (-squared distance, index) holding the best k so far
+        best: list[tuple[float, int]] = []
+
+        def visit(node: tuple[int, float, Any, Any]) -> None:
+            axis, split, left, right = node
+            if axis < 0:
+                for i in left:
+                    dist2 = sum(
+                        (a - b) ** 2
+                        for a, b in zip(self._points[i], target, strict=True)
+                    )
+                    if len(best) < k:
+                        heapq.heappush(best, (-dist2, i))
+                    elif dist2 < -best[0][0]:
+                        heapq.heapreplace(best, (-dist2, i))
+                return
+            diff = target[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(best) < k or diff * diff < -best[0][0]:
+                visit(far)
+
+        visit(self._root)
+        return [
+            (math.sqrt(-neg), self._items[i]) for neg, i in sorted(best, reverse=True)
+        ]
+
+    def within(self, point: Sequence[float], radius: float) -> list[tuple[float, T]]:
+        """
+        Return all items within euclidean ``radius`` as (distance, item), closest first.
+        """
+        if self._root is None or radius < 0:
+            return []
+        target = tuple(point)
+        radius2 = radius * radius
+        found: list[tuple[float, int]] = []
+
+        def visit(node: tuple[int, float, Any, Any]) -> None:
+            axis, split, left, right = node
+            if axis < 0:
+                for i in left:
+                    dist2 = sum(
+                        (a - b) ** 2
+                        for a, b in zip(self._points[i], target, strict=True)
+                    )
+                    if dist2 <= radius2:
+                        found.append((dist2, i))
+                return
+            diff = target[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if diff * diff <= radius2:
+                visit(far)
+
+        visit(self._root)
+        return [(math.sqrt(dist2), self._items[i]) for dist2, i in sorted(found)]
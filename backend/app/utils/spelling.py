@@ -0,0 +1,83 @@
+"""
+Typo-tolerant term lookup for Somalia Geography API search.
+
+``SymSpell`` is a symmetric delete spelling dictionary (after Wolf Garbe's
+SymSpell): every term is stored under all the strings obtained by deleting
+up to ``max_distance`` of its characters. A query generates its own deletes
+the same way, so candidates within the edit distance are found with a few
+dictionary lookups instead of comparing the query against every term, and
+only those candidates are verified with ``edit_distance``.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions
+    and adjacent transpositions), or ``max_distance + 1`` when larger.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def deletes(word: str, max_distance: int) -> set[str]:
+    """``word`` and every string obtained by deleting up to ``max_distance`` characters."""
+    variants = {word}
+    edge = {word}
+    for _ in range(max_distance):
+        edge = {v[:i] + v[i + 1 :] for v in edge for i in range(len(v))} - variants
+        variants |= edge
+    return variants
+
+
+class SymSpell:
+    """
+    Symmetric delete dictionary over a set of terms.
+
+    Args:
+        terms: Dictionary terms
+        max_distance: Largest edit distance a lookup can ask for
+    """
+
+    def __init__(self, terms: Iterable[str], max_distance: int = 2):
+        self.max_distance = max_distance
+        self.terms = set(terms)
+        self._deletes: dict[str, list[str]] = defaultdict(list)
+        for term in self.terms:
+            for variant in deletes(term, max_distance):
+                self._deletes[variant].append(term)
+
+    def lookup(self, word: str, max_distance: int = 2) -> list[tuple[str, int]]:
+        """(term, distance) of the terms within ``max_distance`` of ``word``, closest first."""
+        max_distance = min(max_distance, self.max_distance)
+        candidates: set[str] = set()
+        for variant in deletes(word, max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+        results = [
+            (term, edit_distance(word, term, max_distance)) for term in candidates
+        ]
+        return sorted(
+            (
+                (term, distance)
+                for term, distance in results
+                if distance <= max_distance
+            ),
+            key=lambda result: (result[1], result[0]),
+        )
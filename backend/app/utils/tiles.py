@@ -0,0 +1,256 @@
+"""
+Vector tile layers and tile cache for Somalia Geography API.
+
+Tiles are built from the cached in-memory indexes (admin boundaries,
+simplified boundaries, road segments) and cached by
+(dataset version, layer, z, x, y): in memory as an LRU and, when
+``settings.TILE_CACHE_DIR`` is set, on disk. The dataset version is derived
+from the signatures of the tables a layer is built from, so reloading the
+data naturally invalidates every cached tile.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from sqlmodel import Session
+
+from app import crud, models
+from app.core.config import settings
+from app.utils.geo_index import (
+    SIMPLIFY_ZOOM_LEVELS,
+    CachedIndex,
+    admin_index,
+    get_admin_index,
+    get_road_index,
+    road_index,
+    simplified_districts,
+    simplified_regions,
+    table_signature,
+)
+from app.utils.geometry import BBox, bbox_intersects, polygons_of
+from app.utils.mvt import (
+    DEFAULT_BUFFER,
+    DEFAULT_EXTENT,
+    MVTLayer,
+    TileProjection,
+    encode_tile,
+    project_polygons,
+    tile_bbox,
+)
+
+MAX_TILE_ZOOM = 22
+
+# Roads are left out of small-scale tiles and limited to primary roads
+# until the network is legible.
+ROADS_MIN_ZOOM = 6
+ALL_ROADS_MIN_ZOOM = 10
+
+
+def _buffered_bbox(z: int, x: int, y: int) -> BBox:
+    """Tile bbox grown by the MVT buffer, for prefiltering features."""
+    min_lon, min_lat, max_lon, max_lat = tile_bbox(z, x, y)
+    pad_lon = (max_lon - min_lon) * DEFAULT_BUFFER / DEFAULT_EXTENT
+    pad_lat = (max_lat - min_lat) * DEFAULT_BUFFER / DEFAULT_EXTENT
+    return (min_lon - pad_lon, min_lat - pad_lat, max_lon + pad_lon, max_lat + pad_lat)
+
+
+def _admin_layer(
+    name: str, simplified: CachedIndex[Any], with_region: bool
+) -> Callable[[Session, int, int, int], MVTLayer]:
+    def build(db: Session, z: int, x: int, y: int) -> MVTLayer:
+        admin = get_admin_index(db)
+        areas = admin.districts_by_id if with_region else admin.regions_by_id
+        levels = simplified.get(db) if z in SIMPLIFY_ZOOM_LEVELS else None
+        bbox = _buffered_bbox(z, x, y)
+        projection = TileProjection(z, x, y)
+        layer = MVTLayer(name)
+        for area in areas.values():
+            if area.bbox is None or not bbox_intersects(area.bbox, bbox):
+                continue
+            polygons = (
+                polygons_of(levels.get(area.id, z))
+                if levels is not None
+                else area.polygons
+            )
+            properties: dict[str, Any] = {
+                "id": area.id,
+                "name": area.name,
+                "code": area.code,
+            }
+            if with_region:
+                region = (
+                    admin.regions_by_id.get(area.region_id) if area.region_id else None
+                )
+                properties["region"] = region.name if region else None
+            layer.add_polygons(
+                project_polygons(projection, polygons), properties, area.id
+            )
+        return layer
+
+    return build
+
+
+def _roads_layer(db: Session, z: int, x: int, y: int) -> MVTLayer:
+    layer = MVTLayer("roads")
+    if z < ROADS_MIN_ZOOM:
+        return layer
+    index = get_road_index(db)
+    projection = TileProjection(z, x, y)
+    for position in index.query_positions(_buffered_bbox(z, x, y)).tolist():
+        road_type = index.types[position]
+        if z < ALL_ROADS_MIN_ZOOM and road_type != "primary":
+            continue
+        coords = index.coords(position)
+        px, py = projection.project(coords[:, 0], coords[:, 1])
+        road_id = int(index.ids[position])
+        layer.add_line(
+            list(zip(px.tolist(), py.tolist(), strict=True)),
+            {"id": road_id, "name": index.names[position], "type": road_type},
+            road_id,
+        )
+    return layer
+
+
+def _transport_layer(db: Session, z: int, x: int, y: int) -> MVTLayer:
+    bbox = _buffered_bbox(z, x, y)
+    projection = TileProjection(z, x, y)
+    layer = MVTLayer("transport")
+    for kind, table in models.TRANSPORT_KINDS.items():
+        for row in crud.get_facilities_in_bbox(db, table, bbox):
+            (point,) = projection.project_points([(row.longitude, row.latitude)])
+            properties = {
+                "id": row.id,
+                "kind": kind,
+                "name": row.name,
+                "type": row.type,
+            }
+            if isinstance(row, models.Airport):
+                properties["iata_code"] = row.iata_code
+                properties["icao_code"] = row.icao_code
+            layer.add_point(point, properties)
+    return layer
+
+
+def _index_version(*indexes: CachedIndex[Any]) -> Callable[[Session], tuple[Any, ...]]:
+    def version(db: Session) -> tuple[Any, ...]:
+        signature: tuple[Any, ...] = ()
+        for index in indexes:
+            index.get(db)
+            signature += index.signature or ()
+        return signature
+
+    return version
+
+
+def _transport_version(db: Session) -> tuple[Any, ...]:
+    return table_signature(db, *models.TRANSPORT_KINDS.values())
+
+
+# layer name -> (builder, dataset version)
+TILE_LAYERS: dict[
+    str,
+    tuple[
+        Callable[[Session, int, int, int], MVTLayer],
+        Callable[[Session], tuple[Any, ...]],
+    ],
+] = {
+    "regions": (
+        _admin_layer("regions", simplified_regions, with_region=False),
+        _index_version(simplified_regions, admin_index),
+    ),
+    "districts": (
+        _admin_layer("districts", simplified_districts, with_region=True),
+        _index_version(simplified_districts, admin_index),
+    ),
+    "roads": (_roads_layer, _index_version(road_index)),
+    "transport": (_transport_layer, _transport_version),
+}
+
+
+class TileCache:
+    """
+    LRU tile cache in memory, backed by an optional directory on disk.
+
+    Args:
+        max_entries: Number of tiles kept in memory
+        directory: Root of the on-disk cache, or None to disable it
+    """
+
+    def __init__(self, max_entries: int, directory: str | None = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._tiles: OrderedDict[tuple[str, str, int, int, int], bytes] = OrderedDict()
+
+    def _path(self, key: tuple[str, str, int, int, int]) -> str:
+        version, layer, z, x, y = key
+        return os.path.join(
+            self.directory or "", layer, version, str(z), str(x), f"{y}.pbf"
+        )
+
+    def get(self, key: tuple[str, str, int, int, int]) -> bytes | None:
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+        if self.directory:
+            try:
+                with open(self._path(key), "rb") as f:
+                    tile = f.read()
+            except OSError:
+                return None
+            self._remember(key, tile)
+        return tile
+
+    def put(self, key: tuple[str, str, int, int, int], tile: bytes) -> None:
+        self._remember(key, tile)
+        if self.directory:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent readers never see partial tiles
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(tile)
+            os.replace(tmp_path, path)
+
+    def _remember(self, key: tuple[str, str, int, int, int], tile: bytes) -> None:
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.max_entries:
+                self._tiles.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tiles.clear()
+
+
+tile_cache = TileCache(settings.TILE_CACHE_SIZE, settings.TILE_CACHE_DIR)
+
+
+def dataset_version(db: Session, layer: str) -> str:
+    """
+    Short hash identifying the data a layer's tiles are built from.
+    """
+    _, version = TILE_LAYERS[layer]
+    return hashlib.sha1(repr(version(db)).encode()).hexdigest()[:12]
+
+
+def get_tile(db: Session, layer: str, z: int, x: int, y: int) -> tuple[bytes, str]:
+    """
+    Return the encoded tile and the dataset version it was built from.
+    """
+    build, _ = TILE_LAYERS[layer]
+    version = dataset_version(db, layer)
+    key = (version, layer, z, x, y)
+    tile = tile_cache.get(key)
+    if tile is None:
+        tile = encode_tile([build(db, z, x, y)])
+        tile_cache.put(key, tile)
+    return tile, version
@@ -0,0 +1,286 @@
+"""
+TopoJSON encoding of administrative boundaries for Somalia Geography API.
+
+Neighbouring districts (and regions) share most of their borders. A
+``Topology`` stores every border once as an arc and describes each polygon
+ring as a sequence of arc references, following the TopoJSON spec:
+
+- coordinates are quantized to an integer grid (``transform``);
+- rings are cut into arcs at junctions, the points where the set of
+  neighbouring vertices differs between the rings passing through them;
+- identical arcs (in either direction) are stored once; a reversed use is
+  written as ``~index``;
+- arcs are delta-encoded.
+
+Simplification is applied to arcs rather than to polygons, so shared
+borders stay shared (no gaps or overlaps) at every zoom level.
+"""
+
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from itertools import pairwise
+from typing import Any
+
+from sqlmodel import Session, select
+
+from app import models
+from app.utils.geo_index import SIMPLIFY_ZOOM_LEVELS, CachedIndex, zoom_tolerance
+from app.utils.geometry import polygons_of, simplify_line
+
+# Grid size of the quantized coordinates (~15 m over Somalia's extent)
+QUANTIZATION = 100_000
+
+Point = tuple[int, int]
+
+
+class Topology:
+    """
+    Shared-arc topology of a set of polygon geometries.
+
+    Args:
+        geometries: Polygon/MultiPolygon GeoJSON geometries by id
+        quantization: Number of grid steps along each axis
+    """
+
+    def __init__(
+        self,
+        geometries: dict[int, dict[str, Any] | None],
+        quantization: int = QUANTIZATION,
+    ):
+        polygons_by_id = {id_: polygons_of(geom) for id_, geom in geometries.items()}
+        coords = [
+            p
+            for polygons in polygons_by_id.values()
+            for rings in polygons
+            for ring in rings
+            for p in ring
+        ]
+        if coords:
+            lons, lats = zip(*coords, strict=True)
+            x0, y0, x1, y1 = min(lons), min(lats), max(lons), max(lats)
+        else:
+            x0 = y0 = x1 = y1 = 0.0
+        self.translate = (x0, y0)
+        self.scale = (
+            (x1 - x0) / (quantization - 1) or 1.0,
+            (y1 - y0) / (quantization - 1) or 1.0,
+        )
+
+        quantized: dict[int, list[list[list[Point]]]] = {
+            id_: [[self._quantize(ring) for ring in rings] for rings in polygons]
+            for id_, polygons in polygons_by_id.items()
+        }
+        junctions = self._junctions(
+            ring
+            for polygons in quantized.values()
+            for rings in polygons
+            for ring in rings
+        )
+
+        self.arcs: list[list[Point]] = []
+        self._arc_ids: dict[tuple[Point, ...], int] = {}
+        # id -> polygons -> rings -> arc references
+        self.shapes: dict[int, list[list[list[int]]]] = {}
+        for id_, polygons in quantized.items():
+            shape = []
+            for rings in polygons:
+                if not rings or len(rings[0]) < 3:
+                    continue  # Exterior collapsed at this quantization
+                shape.append(
+                    [
+                        self._ring_arcs(ring, junctions)
+                        for ring in rings
+                        if len(ring) >= 3
+                    ]
+                )
+            self.shapes[id_] = shape
+
+        self._lock = threading.Lock()
+        self._levels: dict[
+            int | None, tuple[list[list[list[int]]], dict[int, list[list[list[int]]]]]
+        ] = {}
+
+    def _quantize(self, ring: Sequence[tuple[float, float]]) -> list[Point]:
+        """Quantize a ring and return it open, without repeated points."""
+        (tx, ty), (kx, ky) = self.translate, self.scale
+        points: list[Point] = []
+        for lon, lat in ring:
+            point = (round((lon - tx) / kx), round((lat - ty) / ky))
+            if not points or point != points[-1]:
+                points.append(point)
+        while len(points) > 1 and points[0] == points[-1]:
+            points.pop()
+        return points
+
+    @staticmethod
+    def _junctions(rings: Iterable[list[Point]]) -> set[Point]:
+        neighbours: dict[Point, tuple[Point, Point]] = {}
+        junctions: set[Point] = set()
+        for ring in rings:
+            n = len(ring)
+            if n < 3:
+                continue
+            for i, point in enumerate(ring):
+                a, b = ring[i - 1], ring[(i + 1) % n]
+                pair = (a, b) if a <= b else (b, a)
+                seen = neighbours.setdefault(point, pair)
+                if seen != pair:
+                    junctions.add(point)
+        return junctions
+
+    def _arc_ref(self, points: list[Point]) -> int:
+        key = tuple(points)
+        if key in self._arc_ids:
+            return self._arc_ids[key]
+        reversed_key = key[::-1]
+        if reversed_key in self._arc_ids:
+            return ~self._arc_ids[reversed_key]
+        self._arc_ids[key] = len(self.arcs)
+        self.arcs.append(points)
+        return len(self.arcs) - 1
+
+    def _ring_arcs(self, ring: list[Point], junctions: set[Point]) -> list[int]:
+        cuts = [i for i, point in enumerate(ring) if point in junctions]
+        if not cuts:
+            # Closed arc: start at the smallest point, in the canonical
+            # direction, so identical rings map to the same arc.
+            start = ring.index(min(ring))
+            forward = ring[start:] + ring[:start]
+            backward = [forward[0]] + forward[:0:-1]
+            canonical = min(forward, backward)
+            ref = self._arc_ref(canonical + canonical[:1])
+            return [ref if canonical == forward else ~ref]
+
+        rotated = ring[cuts[0] :] + ring[: cuts[0]]
+        offsets = [i - cuts[0] for i in cuts] + [len(ring)]
+        closed = rotated + rotated[:1]
+        return [self._arc_ref(closed[lo : hi + 1]) for lo, hi in pairwise(offsets)]
+
+    def _simplified_arc(self, arc: list[Point], tolerance: float) -> list[Point]:
+        (tx, ty), (kx, ky) = self.translate, self.scale
+        coords = [(x * kx + tx, y * ky + ty) for x, y in arc]
+        return [
+            (round((x - tx) / kx), round((y - ty) / ky))
+            for x, y in simplify_line(coords, tolerance)
+        ]
+
+    def _simplified_shapes(
+        self, arcs: list[list[Point]]
+    ) -> dict[int, list[list[list[int]]]]:
+        """
+        Drop rings that collapse once their arcs are simplified, like
+        ``simplify_geometry`` does; a feature whose polygons all collapse
+        keeps its largest exterior ring so it stays visible.
+        """
+
+        def vertices(ring: list[int], arc_list: list[list[Point]]) -> int:
+            return sum(len(arc_list[i if i >= 0 else ~i]) - 1 for i in ring)
+
+        shapes = {}
+        for id_, shape in self.shapes.items():
+            kept = []
+            for rings in shape:
+                if vertices(rings[0], arcs) < 3:
+                    continue
+                kept.append(
+                    [rings[0]]
+                    + [ring for ring in rings[1:] if vertices(ring, arcs) >= 3]
+                )
+            if not kept and shape:
+                kept = [
+                    [
+                        max(
+                            (rings[0] for rings in shape),
+                            key=lambda ring: vertices(ring, self.arcs),
+                        )
+                    ]
+                ]
+            shapes[id_] = kept
+        return shapes
+
+    def _level(
+        self, level: int | None
+    ) -> tuple[list[list[list[int]]], dict[int, list[list[list[int]]]]]:
+        """
+        Delta-encoded arcs and ring references for a zoom level
+        (None = full detail), computed once per level.
+        """
+        with self._lock:
+            if level not in self._levels:
+                if level is None:
+                    arcs, shapes = self.arcs, self.shapes
+                else:
+                    arcs = [
+                        self._simplified_arc(arc, zoom_tolerance(level))
+                        for arc in self.arcs
+                    ]
+                    shapes = self._simplified_shapes(arcs)
+                encoded = []
+                for arc in arcs:
+                    deltas = [list(arc[0])]
+                    deltas.extend(
+                        [x2 - x1, y2 - y1] for (x1, y1), (x2, y2) in pairwise(arc)
+                    )
+                    encoded.append(deltas)
+                self._levels[level] = (encoded, shapes)
+            return self._levels[level]
+
+    def to_topojson(
+        self,
+        name: str,
+        features: Sequence[tuple[int, dict[str, Any]]],
+        level: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        TopoJSON document for the given (id, properties) features.
+
+        Only the arcs used by these features are included, renumbered.
+        """
+        if level is not None and level not in SIMPLIFY_ZOOM_LEVELS:
+            level = None
+        encoded, shapes = self._level(level)
+        used: dict[int, int] = {}
+
+        def ref(index: int) -> int:
+            arc = index if index >= 0 else ~index
+            if arc not in used:
+                used[arc] = len(used)
+            return used[arc] if index >= 0 else ~used[arc]
+
+        geometries = []
+        for id_, properties in features:
+            shape = [
+                [[ref(i) for i in ring] for ring in rings]
+                for rings in shapes.get(id_, [])
+            ]
+            if not shape:
+                geometry: dict[str, Any] = {"type": None}
+            elif len(shape) == 1:
+                geometry = {"type": "Polygon", "arcs": shape[0]}
+            else:
+                geometry = {"type": "MultiPolygon", "arcs": shape}
+            geometry.update(id=id_, properties=properties)
+            geometries.append(geometry)
+
+        return {
+            "type": "Topology",
+            "transform": {"scale": list(self.scale), "translate": list(self.translate)},
+            "objects": {name: {"type": "GeometryCollection", "geometries": geometries}},
+            "arcs": [encoded[arc] for arc in used],
+        }
+
+
+def _topology_builder(table: Any) -> Callable[[Session], Topology]:
+    def build(db: Session) -> Topology:
+        rows = db.exec(select(table.id, table.geometry)).all()
+        return Topology(dict(rows))
+
+    return build
+
+
+region_topology: CachedIndex[Topology] = CachedIndex(
+    "region topology", [models.Region], _topology_builder(models.Region)
+)
+district_topology: CachedIndex[Topology] = CachedIndex(
+    "district topology", [models.District], _topology_builder(models.District)
+)
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Re-run the transport spatial join:
+assign every airport, port and checkpoint to the region and district
+containing it (see load_transport_admin in load_geodata.py).
+
+Run after reloading boundaries or transport data.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from load_geodata import load_transport_admin
+from sqlmodel import Session
+
+from app.core.db import engine
+
+
+def main():
+    with Session(engine) as db:
+        load_transport_admin(db)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,11 +13,17 @@ from pathlib import Path
 # Add the app directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy.orm import Session
-from sqlmodel import SQLModel
+import numpy as np
+from sqlalchemy import delete, insert, update
+from sqlmodel import Session, SQLModel, select
 from app.core.config import settings
 from app.core.db import engine
 from app import models
+from app.utils.geo_index import build_admin_index, bump_data_version
+from app.utils.geometry import area_metrics, line_length_inside_km, line_metrics, ring_edges
+from app.utils.names import name_key, phonetic_key
+from app.utils.place_fts import sync_place_fts
+from app.utils.spatial_db import sync_geometry_columns, sync_rtree_tables
 
 
 def normalize_field(props: dict, field_variations: list, default=None):
@@ -92,34 +98,18 @@ def load_regions(db: Session, data_file: str):
 def calculate_centroid(geom: dict) -> dict | None:
     """
     Calculate centroid from GeoJSON geometry.
-    Handles Point, Polygon, and MultiPolygon geometries.
+    Handles Point, Polygon, and MultiPolygon geometries; polygon centroids
+    are area-weighted over every polygon and hole.
     """
-    geom_type = geom.get('type')
-    coords = geom.get('coordinates')
-    
-    if not coords:
+    if geom and geom.get('type') == 'Point':
+        coords = geom.get('coordinates')
+        return {"lat": coords[1], "lon": coords[0]} if coords else None
+
+    (metrics,) = area_metrics([geom])
+    if metrics is None:
         return None
-    
-    if geom_type == 'Point':
-        return {"lat": coords[1], "lon": coords[0]}
-    elif geom_type == 'Polygon':
-        # For Polygon, use the first ring (exterior ring) and calculate simple centroid
-        ring = coords[0]
-        if not ring:
-            return None
-        # Calculate average of all points in the ring
-        lons = [point[0] for point in ring]
-        lats = [point[1] for point in ring]
-        return {"lat": sum(lats) / len(lats), "lon": sum(lons) / len(lons)}
-    elif geom_type == 'MultiPolygon':
-        # For MultiPolygon, use the first polygon's first ring
-        if coords and coords[0] and coords[0][0]:
-            ring = coords[0][0]
-            lons = [point[0] for point in ring]
-            lats = [point[1] for point in ring]
-            return {"lat": sum(lats) / len(lats), "lon": sum(lons) / len(lons)}
-    
-    return None
+    lon, lat = metrics.centroid
+    return {"lat": lat, "lon": lon}
 
 
 def load_districts(db: Session, data_file: str):
@@ -216,6 +206,44 @@ def load_districts(db: Session, data_file: str):
     print(f"Loaded {loaded_count} districts")
 
 
+def load_admin_metrics(db: Session):
+    """Precompute geometry metrics of every region and district.
+
+    Stores the area-weighted centroid, bounding box and geodesic area in
+    indexed columns, so endpoints can answer bbox and centroid questions
+    without parsing the JSON geometry. An area given by the source data is
+    kept. Can be re-run after reloading regions or districts.
+    """
+    print("Computing region/district geometry metrics...")
+
+    for table in (models.Region, models.District):
+        rows = db.execute(select(table.id, table.geometry, table.area_km2)).all()
+        updates = []
+        for (row_id, _, area_km2), metrics in zip(rows, area_metrics([row[1] for row in rows]), strict=True):
+            if metrics is None:
+                continue
+            lon, lat = metrics.centroid
+            min_lon, min_lat, max_lon, max_lat = metrics.bbox
+            values = {
+                "id": row_id,
+                "area_km2": area_km2 if area_km2 is not None else round(metrics.area_km2, 2),
+                "centroid_lat": lat,
+                "centroid_lon": lon,
+                "min_lon": min_lon,
+                "min_lat": min_lat,
+                "max_lon": max_lon,
+                "max_lat": max_lat,
+            }
+            if table is models.District:
+                values["centroid"] = {"lat": lat, "lon": lon}
+            updates.append(values)
+        if updates:
+            db.execute(update(table), updates)
+        print(f"Stored metrics for {len(updates)} of {len(rows)} {table.__tablename__} rows")
+    bump_data_version(db, models.Region, models.District)
+    db.commit()
+
+
 def load_roads(db: Session, data_file: str):
     """Load roads from GeoJSON file.
     
@@ -301,6 +329,145 @@ def load_roads(db: Session, data_file: str):
     print(f"Loaded {loaded_count} roads")
 
 
+def load_road_metrics(db: Session):
+    """Precompute the geodesic length and bounding box of every road.
+
+    All roads are measured in one vectorized pass and stored in indexed
+    columns, so bbox filters and length totals are plain SQL. A length given
+    by the source data is kept. Can be re-run after reloading roads.
+    """
+    print("Computing road lengths and bounding boxes...")
+
+    rows = db.execute(select(models.Road.id, models.Road.geometry, models.Road.length_km)).all()
+    lengths, bboxes = line_metrics([row[1] for row in rows])
+    updates = []
+    for (road_id, _, length_km), computed_km, bbox in zip(rows, lengths.tolist(), bboxes.tolist(), strict=True):
+        if np.isnan(bbox[0]):
+            continue
+        min_lon, min_lat, max_lon, max_lat = bbox
+        updates.append({
+            "id": road_id,
+            "length_km": length_km if length_km is not None else round(computed_km, 4),
+            "min_lon": min_lon,
+            "min_lat": min_lat,
+            "max_lon": max_lon,
+            "max_lat": max_lat,
+        })
+    if updates:
+        db.execute(update(models.Road), updates)
+    bump_data_version(db, models.Road)
+    db.commit()
+    print(f"Stored lengths and bboxes for {len(updates)} of {len(rows)} roads")
+
+
+def load_geometry_columns(db: Session):
+    """Mirror region, district and road geometry into native geometry columns.
+
+    Uses PostGIS on Postgres or SpatiaLite on SQLite (when the extension can
+    be loaded) and builds their spatial indexes. Skipped otherwise; the API
+    then works from the JSON geometry alone.
+    """
+    print("Syncing native geometry columns...")
+    backend = sync_geometry_columns(db)
+    if backend is None:
+        print("Info: no PostGIS/SpatiaLite available, keeping JSON geometry only")
+    else:
+        print(f"Stored {backend} geometry columns and spatial indexes")
+
+
+def load_rtree_tables(db: Session):
+    """Build the SQLite R*Tree bbox tables of every geographic table.
+
+    Triggers keep them in sync with later inserts, updates and deletes;
+    re-running rebuilds them. Skipped on other databases.
+    """
+    print("Building R*Tree bbox tables...")
+    if sync_rtree_tables(db):
+        print("Built R*Tree bbox tables")
+    else:
+        print("Info: R*Tree bbox tables not available on this database")
+
+
+def load_name_keys(db: Session):
+    """Store the search keys of every region, district, road and transport name.
+
+    ``name_key`` (folded Somali/English spelling) and ``name_phonetic``
+    (consonant skeleton) are indexed, so /places/search finds "Mogadishu"
+    for "Muqdisho" with an index lookup. Can be re-run after any reload.
+    """
+    print("Computing name search keys...")
+
+    for table in (models.Region, models.District, models.Road, models.Airport, models.Port, models.Checkpoint):
+        rows = db.execute(select(table.id, table.name)).all()
+        updates = [
+            {"id": row_id, "name_key": name_key(name), "name_phonetic": phonetic_key(name)}
+            for row_id, name in rows
+        ]
+        if updates:
+            db.execute(update(table), updates)
+        print(f"Stored name keys for {len(updates)} {table.__tablename__} rows")
+    db.commit()
+
+
+def load_place_fts(db: Session):
+    """Fill the SQLite FTS5 index of place, road and transport names.
+
+    Used by /places/search with PLACE_SEARCH_BACKEND=fts. Rebuilt from
+    scratch on every run; skipped on other databases.
+    """
+    print("Building FTS5 name index...")
+    if sync_place_fts(db):
+        print("Built FTS5 name index")
+    else:
+        print("Info: FTS5 name index not available on this database")
+
+
+def load_road_districts(db: Session):
+    """Compute the road <-> district membership table.
+
+    Each road is intersected with the districts whose polygons overlap its
+    bounding box, and the length of the road clipped to each district is
+    stored. Existing rows are replaced, so this can be re-run after
+    reloading roads or districts.
+    """
+    print("Computing road/district membership...")
+
+    db.execute(delete(models.RoadDistrict))
+    admin = build_admin_index(db)
+    part_edges = {}
+
+    roads = db.execute(select(models.Road.id, models.Road.geometry)).all()
+    links = []
+    for road_id, coords in roads:
+        if not coords or len(coords) < 2:
+            continue
+        # [lon, lat] only: positions may carry an altitude, on some vertices only
+        points = np.asarray([p[:2] for p in coords], dtype=np.float64)
+        xs, ys = points[:, 0], points[:, 1]
+        road_bbox = (xs.min(), ys.min(), xs.max(), ys.max())
+
+        lengths = {}
+        for district, rings in admin.district_polygons(road_bbox):
+            key = id(rings)
+            if key not in part_edges:
+                # All rings as one edge set (even-odd parity is additive)
+                edges = [ring_edges(ring) for ring in rings]
+                part_edges[key] = [tuple(np.concatenate([e[i] for e in edges]) for i in range(4))]
+            length_km = line_length_inside_km(xs, ys, part_edges[key])
+            if length_km > 0:
+                lengths[district.id] = lengths.get(district.id, 0.0) + length_km
+
+        links.extend(
+            {"road_id": road_id, "district_id": district_id, "length_km": round(length_km, 4)}
+            for district_id, length_km in lengths.items()
+        )
+
+    if links:
+        db.execute(insert(models.RoadDistrict), links)
+    db.commit()
+    print(f"Stored {len(links)} road/district links for {len(roads)} roads")
+
+
 def is_in_somalia(lat: float, lon: float) -> bool:
     """
     Check if coordinates are within Somalia bounding box.
@@ -418,11 +585,52 @@ def load_transport_from_geojson(db: Session, data_file: str, transport_type: str
         print(f"Error loading {transport_type}: {e}")
 
 
+def load_transport_admin(db: Session):
+    """Assign airports, ports and checkpoints to their region and district.
+
+    All facilities of a kind are located in one batch with the vectorized
+    point-in-polygon test of the admin index. The region and district
+    foreign keys are stored, and the region name replaces the label from
+    the source tags (usually missing, i.e. 'Unknown'), which is kept in
+    ``region_label``. Facilities outside every polygon get their source
+    label back and no foreign keys. Can be re-run after reloading
+    boundaries or transport data.
+    """
+    print("Assigning transport facilities to regions and districts...")
+
+    admin = build_admin_index(db)
+    for table in (models.Airport, models.Port, models.Checkpoint):
+        rows = db.execute(
+            select(table.id, table.longitude, table.latitude, table.region, table.region_label)
+        ).all()
+        if not rows:
+            continue
+        lons = np.array([row[1] for row in rows], dtype=np.float64)
+        lats = np.array([row[2] for row in rows], dtype=np.float64)
+        updates = []
+        for (row_id, _, _, region, label), match in zip(rows, admin.locate_many(lons, lats), strict=True):
+            # Rows not yet joined still carry the source label in ``region``
+            label = region if label is None else label
+            updates.append({
+                "id": row_id,
+                "region_id": match.region.id if match.region else None,
+                "district_id": match.district.id if match.district else None,
+                "region": match.region.name if match.region else label,
+                "region_label": label,
+            })
+        db.execute(update(table), updates)
+        located = sum(1 for values in updates if values["region_id"] is not None)
+        print(f"Located {located} of {len(rows)} {table.__tablename__} rows")
+    bump_data_version(db, models.Airport, models.Port, models.Checkpoint)
+    db.commit()
+
+
 def main():
     """Main data loading function."""
     print("Starting Somalia Geography data loading...")
 
-    # Create database tables
+    # Create database tables (columns added to existing tables come from
+    # the Alembic revisions: run `alembic upgrade head` first)
     SQLModel.metadata.create_all(bind=engine)
 
     # Get data directory path
@@ -442,12 +650,24 @@ def main():
         else:
             print(f"Warning: {districts_file} not found")
 
+        # Centroids, bboxes and areas of the admin boundaries
+        load_admin_metrics(db)
+
         roads_file = data_dir / "somalia_roads.geojson"
         if roads_file.exists():
             load_roads(db, str(roads_file))
         else:
             print(f"Warning: {roads_file} not found")
 
+        # Road lengths and bounding boxes
+        load_road_metrics(db)
+
+        # Link roads to the districts they pass through
+        load_road_districts(db)
+
+        # Native geometry columns for spatial SQL, when the database supports it
+        load_geometry_columns(db)
+
         # Load transport data from OSM GeoJSON files
         airports_file = data_dir / "somalia_airports_osm.geojson"
         if airports_file.exists():
@@ -467,6 +687,18 @@ def main():
         else:
             print(f"Info: {checkpoints_file} not found (optional)")
 
+        # Region/district of every transport facility
+        load_transport_admin(db)
+
+        # Normalized and phonetic name keys for search
+        load_name_keys(db)
+
+        # Bbox R*Trees for indexed bbox filters on SQLite
+        load_rtree_tables(db)
+
+        # Full-text name index
+        load_place_fts(db)
+
     print("Data loading completed successfully!")
 
 
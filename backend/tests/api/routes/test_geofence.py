@@ -0,0 +1,102 @@
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import anyio
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints.geofence import MAX_LINE_BYTES
+from app.core.config import settings
+from app.main import app
+
+URL = f"{settings.API_V1_STR}/geofence/stream"
+
+
+def _post(client: TestClient, chunks: list[bytes]) -> list[dict[str, Any]]:
+    def body() -> Iterator[bytes]:
+        yield from chunks
+
+    r = client.post(URL, content=body(), headers={"Content-Type": "application/x-ndjson"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in r.text.splitlines()]
+
+
+def _events(records: list[dict[str, Any]]) -> list[tuple[Any, ...]]:
+    return [
+        ("error", r["line"]) if "error" in r else (r["id"], r["event"], r["level"], r["code"], r["ts"])
+        for r in records
+    ]
+
+
+def test_geofence_stream_reassembles_lines_across_chunks(geo_client: TestClient) -> None:
+    records = _post(geo_client, [
+        b'{"id": "a", "lat": 2.',
+        b'3, "lon": 45.3, "ts": 1}\n{"id": "a", "lat": 2.3, "lon": 45.7',
+        b', "ts": 2}\n\n',
+        # Last record without a trailing newline: Mogadisho -> Bari
+        b'{"id": "a", "lat": 10.5, "lon": 49.5, "ts": 3}',
+    ])
+    assert _events(records) == [
+        ("a", "enter", "region", "SOM-BAN", 1),
+        ("a", "enter", "district", "SOM-BAN-MOG", 1),
+        ("a", "exit", "district", "SOM-BAN-MOG", 2),
+        ("a", "enter", "district", "SOM-BAN-AFG", 2),
+        ("a", "exit", "district", "SOM-BAN-AFG", 3),
+        ("a", "exit", "region", "SOM-BAN", 3),
+        ("a", "enter", "region", "SOM-BAR", 3),
+        ("a", "enter", "district", "SOM-BAR-BOS", 3),
+    ]
+
+
+def test_geofence_stream_skips_over_long_and_invalid_lines(geo_client: TestClient) -> None:
+    long_line = b'{"id": "b", "pad": "' + b"x" * (MAX_LINE_BYTES + 100) + b'"}'
+    records = _post(geo_client, [
+        b'{"id": "b", "lat": 2.3, "lon": 45.3}\n' + long_line[:3000],
+        long_line[3000:4500],  # buffer outgrows the limit: reported, rest discarded
+        long_line[4500:] + b'\n{"id": "b", "lat": 2.3, "lon": 45.7}\n',
+        b'not json\n{"id": "b", "lat": 95, "lon": 45.7}\n{"id": "c", "lat": 2.3, "lon": 45.7}\n',
+    ])
+    assert _events(records) == [
+        ("b", "enter", "region", "SOM-BAN", None),
+        ("b", "enter", "district", "SOM-BAN-MOG", None),
+        ("error", 2),
+        ("b", "exit", "district", "SOM-BAN-MOG", None),
+        ("b", "enter", "district", "SOM-BAN-AFG", None),
+        ("error", 4),
+        ("error", 5),
+        ("c", "enter", "region", "SOM-BAN", None),
+        ("c", "enter", "district", "SOM-BAN-AFG", None),
+    ]
+    assert records[2]["error"] == f"line longer than {MAX_LINE_BYTES} bytes"
+    assert records[6]["error"].startswith("lat: ")
+
+
+@pytest.mark.usefixtures("geo_client")
+def test_geofence_stream_ends_quietly_on_disconnect() -> None:
+    incoming = [
+        {"type": "http.request", "body": b'{"id": "a", "lat": 2.3, "lon": 45.3}\n', "more_body": True},
+        {"type": "http.disconnect"},
+    ]
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return incoming.pop(0)
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": URL, "raw_path": URL.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"testserver"), (b"content-type", b"application/x-ndjson")],
+        "client": ("testclient", 50000), "server": ("testserver", 80),
+    }
+    anyio.run(app, scope, receive, send)
+
+    assert sent[0]["type"] == "http.response.start" and sent[0]["status"] == 200
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    assert [json.loads(line)["code"] for line in body.splitlines()] == ["SOM-BAN", "SOM-BAN-MOG"]
+    # The response is abandoned rather than completed
+    assert sent[-1].get("more_body", False)
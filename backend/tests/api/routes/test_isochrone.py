@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/isochrone"
+
+
+def test_read_isochrones(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/", params={"lat": 2.2, "lon": 45.5, "minutes": "30,10"})
+    assert r.status_code == 200
+    content = r.json()
+    assert content["snap_distance_km"] == 0.0
+    assert [iso["minutes"] for iso in content["data"]] == [10.0, 30.0]
+    inner, outer = content["data"]
+    assert 0 < inner["road_km"] < outer["road_km"]
+    assert outer["geometry"]["type"] == "Polygon"
+
+
+def test_read_isochrones_invalid(geo_client: TestClient) -> None:
+    assert geo_client.get(f"{URL}/", params={"lat": 2.2, "lon": 45.5, "minutes": "a"}).status_code == 400
+    assert geo_client.get(f"{URL}/", params={"lat": 2.2, "lon": 45.5, "minutes": "0"}).status_code == 400
+    assert geo_client.get(f"{URL}/", params={"lat": 5.0, "lon": 40.0}).status_code == 404
@@ -0,0 +1,43 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/matrix"
+
+
+def test_create_matrix(geo_client: TestClient) -> None:
+    body = {
+        "origins": [{"district_code": "SOM-BAN-MOG"}, {"transport_kind": "airport", "transport_id": 1}],
+        "destinations": [{"transport_kind": "port", "transport_id": 1}, {"lat": 10.3, "lon": 49.3}],
+        "road": True,
+    }
+    r = geo_client.post(f"{URL}/", json=body)
+    assert r.status_code == 200
+    content = r.json()
+    # District centroid and facility locations
+    assert content["origins"] == [
+        {"lat": 2.25, "lon": 45.25, "name": "Mogadisho"},
+        {"lat": 2.3, "lon": 45.3, "name": "Aden Adde International Airport"},
+    ]
+    assert [len(row) for row in content["great_circle_km"]] == [2, 2]
+    assert abs(content["great_circle_km"][0][0] - 63.35) < 0.01
+    # Bosaso is not connected to the Banaadir roads
+    assert [row[1] for row in content["road_km"]] == [None, None]
+    assert all(row[0] > 0 for row in content["road_km"])
+    assert all(row[0] > 0 for row in content["road_minutes"])
+
+    body["road"] = False
+    assert geo_client.post(f"{URL}/", json=body).json()["road_km"] is None
+
+
+def test_create_matrix_invalid_points(geo_client: TestClient) -> None:
+    destinations = [{"lat": 2.0, "lon": 45.0}]
+    r = geo_client.post(f"{URL}/", json={"origins": [{"district_code": "SOM-XXX"}], "destinations": destinations})
+    assert r.status_code == 404
+    r = geo_client.post(f"{URL}/", json={"origins": [{"lat": 2.0}], "destinations": destinations})
+    assert r.status_code == 400
+    r = geo_client.post(
+        f"{URL}/",
+        json={"origins": [{"lat": 2.0, "lon": 45.0, "district_code": "SOM-BAN-MOG"}], "destinations": destinations},
+    )
+    assert r.status_code == 400
@@ -0,0 +1,26 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/nearby"
+
+
+def test_read_nearby(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/", params={"lat": 2.2, "lon": 45.3, "radius_km": 15})
+    assert r.status_code == 200
+    content = r.json()
+    features = [(f["layer"], f["id"]) for f in content["data"]]
+    assert content["count"] == len(features)
+    # On the road and inside Mogadisho; the airport 11 km north
+    assert ("roads", 1) in features and ("districts", 10) in features and ("airports", 1) in features
+    assert ("roads", 3) not in features and ("airports", 2) not in features
+    distances = [f["distance_km"] for f in content["data"]]
+    assert distances == sorted(distances)
+
+
+def test_read_nearby_layers(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/", params={"lat": 2.2, "lon": 45.3, "radius_km": 15, "layers": "airports, ports"})
+    assert [(f["layer"], f["name"]) for f in r.json()["data"]] == [("airports", "Aden Adde International Airport")]
+
+    r = geo_client.get(f"{URL}/", params={"lat": 2.2, "lon": 45.3, "layers": "rivers"})
+    assert r.status_code == 400
@@ -0,0 +1,46 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/places"
+
+
+def test_search_places(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/search", params={"name": "banaadir"})
+    assert r.status_code == 200
+    content = r.json()
+    # The region first, then its districts matching on the region name
+    assert [(place["type"], place["id"]) for place in content["data"]] == [
+        ("region", "SOM-BAN"), ("district", "SOM-BAN-AFG"), ("district", "SOM-BAN-MOG"),
+    ]
+    assert content["data"][0]["centroid"] == {"lat": 2.5, "lon": 45.5}
+
+    # Alias
+    r = geo_client.get(f"{URL}/search", params={"name": "xamar"})
+    assert [place["name"] for place in r.json()["data"]] == ["Mogadisho"]
+
+
+def test_search_places_misspelled(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/search", params={"name": "Mogadsho"})
+    content = r.json()
+    assert [place["name"] for place in content["data"]] == ["Mogadisho"]
+    assert content["suggestions"] == [{"text": "Mogadisho", "distance": 1}]
+
+
+def test_search_places_invalid_limit(geo_client: TestClient) -> None:
+    assert geo_client.get(f"{URL}/search", params={"name": "x", "limit": 0}).status_code == 400
+
+
+def test_autocomplete_places(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/autocomplete", params={"q": "b"})
+    assert r.status_code == 200
+    content = r.json()
+    assert content["query"] == "b"
+    assert [(s["type"], s["text"]) for s in content["data"]] == [
+        ("region", "Bari"), ("region", "Banaadir"), ("district", "Bosaso"),
+        ("airport", "Bosaso Airport"), ("road", "Bosaso Road"),
+    ]
+
+    r = geo_client.get(f"{URL}/autocomplete", params={"q": "AFG", "limit": 1})
+    assert [(s["text"], s["region"]) for s in r.json()["data"]] == [("Afgooye", "Banaadir")]
+    assert geo_client.get(f"{URL}/autocomplete", params={"q": "zz"}).json()["count"] == 0
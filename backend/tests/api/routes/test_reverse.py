@@ -0,0 +1,39 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/reverse"
+
+
+def test_reverse_geocode(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/", params={"lat": 2.3, "lon": 45.7})
+    assert r.status_code == 200
+    content = r.json()
+    assert (content["district_code"], content["district_name"]) == ("SOM-BAN-AFG", "Afgooye")
+    assert (content["region_id"], content["region_code"], content["region_name"]) == (1, "SOM-BAN", "Banaadir")
+
+
+def test_reverse_geocode_outside_every_area(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/", params={"lat": 5.0, "lon": 40.0})
+    assert r.status_code == 404
+
+
+def test_reverse_geocode_invalid_coordinates(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/", params={"lat": 95, "lon": 45.0})
+    assert r.status_code == 422
+
+
+def test_reverse_geocode_batch(geo_client: TestClient) -> None:
+    points = [[45.3, 2.3], [45.7, 2.3], [49.5, 10.5], [40.0, 5.0]]
+    r = geo_client.post(f"{URL}/batch", json={"points": points})
+    assert r.status_code == 200
+    assert r.json() == {
+        "district_codes": ["SOM-BAN-MOG", "SOM-BAN-AFG", "SOM-BAR-BOS", None],
+        "region_codes": ["SOM-BAN", "SOM-BAN", "SOM-BAR", None],
+        "count": 4,
+    }
+
+    r = geo_client.post(f"{URL}/batch", json={"points": []})
+    assert r.status_code == 200 and r.json()["count"] == 0
+    r = geo_client.post(f"{URL}/batch", json={"points": [[2.3, 95.0]]})
+    assert r.status_code == 400
@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/roads"
+
+
+def _road_ids(client: TestClient, **params: str) -> list[int]:
+    r = client.get(f"{URL}/", params=params)
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == len(content["data"])
+    return [road["id"] for road in content["data"]]
+
+
+def test_read_roads_bbox(geo_client: TestClient) -> None:
+    assert _road_ids(geo_client, bbox="45.52,2.19,45.6,2.21") == [1]
+    assert _road_ids(geo_client, bbox="45.4,2.4,45.6,2.6") == [2]
+    assert _road_ids(geo_client, bbox="40.0,0.0,41.0,1.0") == []
+    r = geo_client.get(f"{URL}/", params={"bbox": "45.0,2.0"})
+    assert r.status_code == 400
+
+
+def test_read_roads_in_district(geo_client: TestClient) -> None:
+    assert _road_ids(geo_client, district="SOM-BAN-MOG") == [1]
+    # Name match is case-insensitive; road 1 crosses into Afgooye
+    assert _road_ids(geo_client, district="afgooye") == [1, 2]
+    assert _road_ids(geo_client, district="Bosaso", type="secondary") == [3]
+    assert _road_ids(geo_client, district="Bosaso", type="primary") == []
+
+
+def test_read_roads_bbox_filters_and_pages_index_hits(geo_client: TestClient) -> None:
+    banaadir = "45.0,2.0,46.0,3.0"
+    r = geo_client.get(f"{URL}/", params={"bbox": banaadir, "skip": 1, "limit": 1})
+    assert r.status_code == 200
+    assert r.json()["count"] == 2
+    assert [road["id"] for road in r.json()["data"]] == [2]
+    assert _road_ids(geo_client, bbox=banaadir, type="secondary") == [2]
+    assert _road_ids(geo_client, bbox=banaadir, district="SOM-BAN-MOG") == [1]
+    assert _road_ids(geo_client, bbox=banaadir, district="Bosaso") == []
+    r = geo_client.get(f"{URL}/", params={"bbox": banaadir, "skip": 5})
+    assert r.json() == {"data": [], "count": 2}
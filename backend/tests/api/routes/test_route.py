@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/route"
+
+
+def test_read_route(geo_client: TestClient) -> None:
+    # West end of the primary road, then north along the secondary road
+    r = geo_client.get(f"{URL}/", params={"from": "2.21,45.12", "to": "2.79,45.51"})
+    assert r.status_code == 200
+    content = r.json()
+    assert content["geometry"] == {
+        "type": "LineString",
+        "coordinates": [[45.12, 2.2], [45.5, 2.2], [45.5, 2.79]],
+    }
+    assert abs(content["distance_km"] - 107.83) < 0.01
+    assert abs(content["origin_snap_km"] - 1.11) < 0.01
+    assert content["duration_minutes"] > 0
+
+
+def test_read_route_not_found(geo_client: TestClient) -> None:
+    # Banaadir and Bari roads are not connected
+    r = geo_client.get(f"{URL}/", params={"from": "2.21,45.12", "to": "10.3,49.3"})
+    assert r.status_code == 404
+    assert "disconnected" in r.json()["detail"]
+    # No road within the snapping distance
+    r = geo_client.get(f"{URL}/", params={"from": "5.0,40.0", "to": "2.2,45.5"})
+    assert r.status_code == 404
+
+
+def test_read_route_invalid_coordinates(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/", params={"from": "abc", "to": "2.2,45.5"})
+    assert r.status_code == 400
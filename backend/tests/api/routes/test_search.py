@@ -0,0 +1,32 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/search"
+
+
+def test_search(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/", params={"q": "bosaso"})
+    assert r.status_code == 200
+    content = r.json()
+    assert [(result["type"], result["id"]) for result in content["data"]] == [
+        ("district", 20), ("road", 3), ("airport", 2),
+    ]
+    assert content["counts"] == {"district": 1, "road": 1, "airport": 1}
+    assert content["data"][2]["region"] == "Bari"
+
+
+def test_search_airport_code_and_types(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/", params={"q": "MGQ"})
+    assert [result["name"] for result in r.json()["data"]] == ["Aden Adde International Airport"]
+
+    # Misspelled, restricted to some types
+    r = geo_client.get(f"{URL}/", params={"q": "afgoye", "types": "district,road"})
+    assert [(result["type"], result["name"]) for result in r.json()["data"]] == [
+        ("district", "Afgooye"), ("road", "Afgooye Road"),
+    ]
+    r = geo_client.get(f"{URL}/", params={"q": "bosaso", "per_type_limit": 1, "limit": 1, "skip": 1})
+    content = r.json()
+    assert content["count"] == 3 and [result["type"] for result in content["data"]] == ["road"]
+
+    assert geo_client.get(f"{URL}/", params={"q": "a", "types": "rivers"}).status_code == 400
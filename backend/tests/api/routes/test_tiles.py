@@ -0,0 +1,48 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/tiles"
+MVT = "application/vnd.mapbox-vector-tile"
+
+
+def test_read_tile(geo_client: TestClient) -> None:
+    # z10 tile over the Banaadir road junction (45.5 E, 2.2 N)
+    r = geo_client.get(f"{URL}/roads/10/641/505.pbf")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == MVT
+    assert b"Maka Al Mukarama Road" in r.content and b"Afgooye Road" in r.content
+    etag = r.headers["etag"]
+    assert etag.endswith('-10-641-505"')
+    # Served from the cache under the same dataset version
+    assert geo_client.get(f"{URL}/roads/10/641/505.pbf").headers["etag"] == etag
+
+    r = geo_client.get(f"{URL}/districts/10/641/505.pbf")
+    assert r.status_code == 200
+    assert b"SOM-BAN-MOG" in r.content and b"Banaadir" in r.content
+
+
+def test_read_tile_not_modified(geo_client: TestClient) -> None:
+    url = f"{URL}/roads/10/641/505.pbf"
+    etag = geo_client.get(url).headers["etag"]
+    for if_none_match in (etag, f'"other", W/{etag}', "*"):
+        r = geo_client.get(url, headers={"If-None-Match": if_none_match})
+        assert r.status_code == 304
+        assert r.content == b""
+        assert r.headers["etag"] == etag
+    r = geo_client.get(url, headers={"If-None-Match": '"other"'})
+    assert r.status_code == 200
+    assert r.content
+    # Another tile of the same layer and version does not match
+    assert geo_client.get(f"{URL}/roads/10/641/506.pbf", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_read_tile_leaves_roads_out_at_small_scales(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/roads/5/20/15.pbf")
+    assert r.status_code == 200
+    assert r.content == b""
+
+
+def test_read_tile_invalid(geo_client: TestClient) -> None:
+    assert geo_client.get(f"{URL}/rivers/1/0/0.pbf").status_code == 404
+    assert geo_client.get(f"{URL}/roads/2/4/0.pbf").status_code == 400
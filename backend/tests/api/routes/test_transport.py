@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = f"{settings.API_V1_STR}/transport"
+
+
+def test_nearest_facilities(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/nearest", params={"lat": 2.2, "lon": 45.3, "kind": "airport", "k": 5})
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 2
+    assert [(row["id"], row["region"]) for row in content["data"]] == [(1, "Banaadir"), (2, "Bari")]
+    assert abs(content["data"][0]["distance_km"] - 11.12) < 0.01
+
+    r = geo_client.get(f"{URL}/nearest", params={"lat": 2.2, "lon": 45.3, "kind": "PORT", "k": 1})
+    assert [row["name"] for row in r.json()["data"]] == ["Mogadishu Port"]
+
+
+def test_nearest_facilities_invalid_kind(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/nearest", params={"lat": 2.2, "lon": 45.3, "kind": "station"})
+    assert r.status_code == 400
+
+
+def test_read_airports_by_containing_area(geo_client: TestClient) -> None:
+    r = geo_client.get(f"{URL}/airports", params={"district": "SOM-BAN-MOG"})
+    assert r.status_code == 200
+    assert [(a["id"], a["region"], a["region_id"], a["district_id"]) for a in r.json()["data"]] == [
+        (1, "Banaadir", 1, 10),
+    ]
+    r = geo_client.get(f"{URL}/airports", params={"region": "bari"})
+    assert [a["id"] for a in r.json()["data"]] == [2]
+    r = geo_client.get(f"{URL}/ports", params={"region": "SOM-BAN", "district": "Afgooye"})
+    assert [p["name"] for p in r.json()["data"]] == ["Mogadishu Port"]
+    # The source label is internal
+    assert "region_label" not in r.json()["data"][0]
@@ -4,12 +4,16 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, delete
 
+from app.api import deps
 from app.core.config import settings
 from app.core.db import engine, init_db
 from app.main import app
 from app.models import Item, User
+from app.utils import geo_index
+from app.utils.tiles import tile_cache
+from tests.utils.geo import create_geography
 from tests.utils.user import authentication_token_from_email
-from tests.utils.utils import get_superuser_token_headers
+from tests.utils.utils import get_superuser_token_headers, memory_session
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -40,3 +44,25 @@ def normal_user_token_headers(client: TestClient, db: Session) -> dict[str, str]
     return authentication_token_from_email(
         client=client, email=settings.EMAIL_TEST_USER, db=db
     )
+
+
+def _reset_geo_caches() -> None:
+    for index in geo_index._registry:
+        index.invalidate()
+    tile_cache.clear()
+
+
+@pytest.fixture(scope="module")
+def geo_client() -> Generator[TestClient, None, None]:
+    """
+    Client for the geography endpoints, served from an in-memory database
+    filled by tests.utils.geo.create_geography.
+    """
+    with memory_session() as session:
+        create_geography(session)
+        app.dependency_overrides[deps.get_db] = lambda: session
+        _reset_geo_caches()
+        # No lifespan: the startup index warm-up would read the real database
+        yield TestClient(app)
+        app.dependency_overrides.pop(deps.get_db)
+        _reset_geo_caches()
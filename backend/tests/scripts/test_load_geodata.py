@@ -0,0 +1,26 @@
+import pytest
+from sqlmodel import select
+
+from app import models
+from scripts.load_geodata import load_road_districts
+from tests.utils.utils import memory_session, square_polygon
+
+
+def test_load_road_districts_drops_altitudes() -> None:
+    with memory_session() as db:
+        db.add(models.Region(id=1, name="Banaadir", code="SOM-BAN", geometry=square_polygon(45.0, 2.0, 1.0)))
+        for district_id, x in ((10, 45.0), (11, 45.5)):
+            db.add(models.District(
+                id=district_id, name=f"District {district_id}", code=f"SOM-BAN-{district_id}",
+                region_name="Banaadir", region_id=1, geometry=square_polygon(x, 2.0, 0.5),
+            ))
+        # Altitude on some positions only
+        db.add(models.Road(id=1, name="Road 1", type="primary", geometry=[[45.25, 2.2, 12.0], [45.75, 2.2]]))
+        db.commit()
+
+        load_road_districts(db)
+
+        links = db.exec(select(models.RoadDistrict).order_by(models.RoadDistrict.district_id)).all()
+        assert [link.district_id for link in links] == [10, 11]
+        # 0.25 degrees of longitude at 2.2 N on each side
+        assert [link.length_km for link in links] == pytest.approx([27.8, 27.8], abs=0.1)
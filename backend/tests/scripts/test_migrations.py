@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import SQLModel
+
+from app.core.config import settings
+
+BACKEND = Path(__file__).parents[2]
+
+
+def test_geo_columns_revision_round_trip(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    url = f"sqlite:///{tmp_path / 'geo.db'}"
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+    config = Config(str(BACKEND / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND / "app" / "alembic"))
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO region (id, name, code, centroid_lat) VALUES (1, 'Banaadir', 'SOM-BAN', 2.0)"))
+    command.stamp(config, "head")
+
+    # Back to the schema of a database loaded before the precomputed columns
+    command.downgrade(config, "1a31ce608336")
+    columns = {col["name"] for col in inspect(engine).get_columns("region")}
+    assert "centroid_lat" not in columns and "name_key" not in columns
+    assert "region_label" not in {col["name"] for col in inspect(engine).get_columns("airport")}
+    assert not inspect(engine).has_table("roaddistrict")
+
+    command.upgrade(config, "head")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT name, centroid_lat FROM region")).all() == [("Banaadir", None)]
+        diff = compare_metadata(MigrationContext.configure(conn), SQLModel.metadata)
+    # Only the foreign keys SQLite cannot add to existing tables are missing
+    assert {change[0] for change in diff} == {"add_fk"}
+    assert {change[1].table.name for change in diff} == {"airport", "port", "checkpoint"}
+    engine.dispose()
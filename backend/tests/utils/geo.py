@@ -0,0 +1,70 @@
+from sqlmodel import Session
+
+from app import models
+from scripts.load_geodata import (
+    load_admin_metrics,
+    load_name_keys,
+    load_place_fts,
+    load_road_districts,
+    load_road_metrics,
+    load_rtree_tables,
+    load_transport_admin,
+)
+from tests.utils.utils import square_polygon
+
+
+def create_geography(db: Session) -> None:
+    """
+    Small Somalia-like dataset, run through the loader's derived-data steps.
+
+    Banaadir (45..46 E, 2..3 N) is split into West and East districts at
+    45.5 E and holds a connected road network; Bari holds an isolated road.
+    """
+    db.add(models.Region(id=1, name="Banaadir", code="SOM-BAN", geometry=square_polygon(45.0, 2.0, 1.0)))
+    db.add(models.Region(id=2, name="Bari", code="SOM-BAR", geometry=square_polygon(49.0, 10.0, 1.0)))
+    db.add(models.District(
+        id=10, name="Mogadisho", code="SOM-BAN-MOG", region_name="Banaadir", region_id=1,
+        aliases=["Xamar"], geometry=square_polygon(45.0, 2.0, 0.5),
+    ))
+    db.add(models.District(
+        id=11, name="Afgooye", code="SOM-BAN-AFG", region_name="Banaadir", region_id=1,
+        geometry=square_polygon(45.5, 2.0, 0.5),
+    ))
+    db.add(models.District(
+        id=20, name="Bosaso", code="SOM-BAR-BOS", region_name="Bari", region_id=2,
+        geometry=square_polygon(49.0, 10.0, 1.0),
+    ))
+    db.add(models.Road(
+        id=1, name="Maka Al Mukarama Road", type="primary", surface="paved", condition="good",
+        geometry=[[45.1, 2.2], [45.5, 2.2], [45.9, 2.2]],
+    ))
+    db.add(models.Road(
+        id=2, name="Afgooye Road", type="secondary", surface="unpaved", condition="fair",
+        geometry=[[45.5, 2.2], [45.5, 2.8]],
+    ))
+    db.add(models.Road(
+        id=3, name="Bosaso Road", type="secondary", surface=None, condition=None,
+        geometry=[[49.2, 10.2], [49.4, 10.4]],
+    ))
+    db.add(models.Airport(
+        id=1, name="Aden Adde International Airport", iata_code="MGQ", icao_code="HCMM",
+        type="international", latitude=2.3, longitude=45.3, region="Unknown",
+    ))
+    db.add(models.Airport(
+        id=2, name="Bosaso Airport", iata_code="BSA", icao_code="HCMF",
+        type="domestic", latitude=10.3, longitude=49.3, region="Unknown",
+    ))
+    db.add(models.Port(id=1, name="Mogadishu Port", type="commercial", latitude=2.1, longitude=45.8, region="Unknown"))
+    db.add(models.Checkpoint(
+        id=1, name="Afgooye Checkpoint", type="security", latitude=2.7, longitude=45.5,
+        region="Unknown", status="active",
+    ))
+    db.commit()
+
+    load_admin_metrics(db)
+    load_road_metrics(db)
+    load_road_districts(db)
+    load_transport_admin(db)
+    load_name_keys(db)
+    load_rtree_tables(db)
+    load_place_fts(db)
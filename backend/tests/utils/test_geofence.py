@@ -0,0 +1,77 @@
+from app import models
+from app.utils.geo_index import AdminArea, AdminIndex
+from app.utils.geofence import BATCH_LOOKUP_MIN, GeofenceTracker
+from app.utils.geometry import polygons_of
+from tests.utils.utils import square_polygon
+
+
+def _tracker() -> GeofenceTracker:
+    region = AdminArea(id=1, code="SOM-BAN", name="Banaadir", bbox=None, polygons=polygons_of(square_polygon(45, 2, 2)))
+    west = AdminArea(
+        id=10, code="SOM-BAN-W", name="West", bbox=None,
+        polygons=polygons_of(square_polygon(45, 2, 1)), region_id=1,
+    )
+    east = AdminArea(
+        id=11, code="SOM-BAN-E", name="East", bbox=None,
+        polygons=polygons_of(square_polygon(46, 2, 1)), region_id=1,
+    )
+    return GeofenceTracker(AdminIndex([region], [west, east]))
+
+
+def _events(events: list) -> list:
+    return [(e.id, e.event, e.level, e.code) for e in events]
+
+
+def test_geofence_enter_and_exit() -> None:
+    tracker = _tracker()
+    events = tracker.update([
+        models.GeofencePing(id="a", lat=2.5, lon=45.5, ts=1),
+        models.GeofencePing(id="a", lat=2.6, lon=45.6, ts=2),  # same district: no event
+        models.GeofencePing(id="b", lat=2.5, lon=46.5, ts=2),
+        models.GeofencePing(id="a", lat=2.5, lon=46.2, ts=3),  # west -> east, same region
+    ])
+    assert _events(events) == [
+        ("a", "enter", "region", "SOM-BAN"),
+        ("a", "enter", "district", "SOM-BAN-W"),
+        ("b", "enter", "region", "SOM-BAN"),
+        ("b", "enter", "district", "SOM-BAN-E"),
+        ("a", "exit", "district", "SOM-BAN-W"),
+        ("a", "enter", "district", "SOM-BAN-E"),
+    ]
+    assert events[-1].ts == 3
+
+    # State carries over between batches; leaving everything exits inner first
+    events = tracker.update([
+        models.GeofencePing(id="a", lat=2.5, lon=46.8, ts=4),
+        models.GeofencePing(id="a", lat=5.0, lon=40.0, ts=5),
+    ])
+    assert _events(events) == [
+        ("a", "exit", "district", "SOM-BAN-E"),
+        ("a", "exit", "region", "SOM-BAN"),
+    ]
+
+
+def test_geofence_ids_keep_their_type() -> None:
+    tracker = _tracker()
+    events = tracker.update([
+        models.GeofencePing(id=1, lat=2.5, lon=45.5),
+        models.GeofencePing(id="1", lat=2.5, lon=45.5),  # a different device
+    ])
+    assert _events(events) == [
+        (1, "enter", "region", "SOM-BAN"),
+        (1, "enter", "district", "SOM-BAN-W"),
+        ("1", "enter", "region", "SOM-BAN"),
+        ("1", "enter", "district", "SOM-BAN-W"),
+    ]
+
+
+def test_geofence_batch_lookup_matches_scalar() -> None:
+    pings = [
+        models.GeofencePing(id=i % 7, lat=2.05 + (i % 19) * 0.1, lon=44.9 + (i % 23) * 0.1)
+        for i in range(BATCH_LOOKUP_MIN * 4)
+    ]
+    batched = _tracker().update(pings)
+    one_by_one_tracker = _tracker()
+    one_by_one = [event for ping in pings for event in one_by_one_tracker.update([ping])]
+    assert _events(batched) == _events(one_by_one)
+    assert batched
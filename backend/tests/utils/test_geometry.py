@@ -0,0 +1,110 @@
+import numpy as np
+
+from app.utils.geometry import (
+    area_metrics,
+    convex_hull,
+    haversine_km,
+    line_length_inside_km,
+    line_metrics,
+    parse_bbox,
+    ring_edges,
+    simplify_geometry,
+    simplify_line,
+)
+
+SQUARE = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0), (0.0, 0.0)]
+HOLE = [(0.4, 0.4), (0.6, 0.4), (0.6, 0.6), (0.4, 0.6), (0.4, 0.4)]
+
+
+def test_line_length_inside_crossing_line() -> None:
+    length = line_length_inside_km(np.array([-1.0, 2.0]), np.array([0.5, 0.5]), [ring_edges(SQUARE)])
+    assert abs(length - haversine_km(0.5, 0.0, 0.5, 1.0)) < 1e-3
+
+
+def test_line_length_inside_fully_inside_and_outside() -> None:
+    edges = [ring_edges(SQUARE)]
+    inside = line_length_inside_km(np.array([0.2, 0.3]), np.array([0.2, 0.3]), edges)
+    assert abs(inside - haversine_km(0.2, 0.2, 0.3, 0.3)) < 1e-9
+    assert line_length_inside_km(np.array([2.0, 3.0]), np.array([2.0, 3.0]), edges) == 0.0
+
+
+def test_line_length_inside_skips_holes() -> None:
+    edges = [ring_edges(SQUARE), ring_edges(HOLE)]
+    assert line_length_inside_km(np.array([0.45, 0.55]), np.array([0.5, 0.5]), edges) == 0.0
+    length = line_length_inside_km(np.array([0.3, 0.7]), np.array([0.5, 0.5]), edges)
+    assert abs(length - 2 * haversine_km(0.5, 0.3, 0.5, 0.4)) < 1e-3
+
+
+def test_parse_bbox() -> None:
+    assert parse_bbox("45.25,2.0,45.4,2.1") == (45.25, 2.0, 45.4, 2.1)
+    for bad in ("1,2,3", "a,b,c,d", "46,2,45,3"):
+        try:
+            parse_bbox(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad!r} should not parse")
+
+
+def test_simplify_line_keeps_significant_vertices() -> None:
+    line = [(0.0, 0.0), (1.0, 0.01), (2.0, -0.01), (3.0, 1.0), (4.0, 0.0)]
+    assert simplify_line(line, 0.1) == [(0.0, 0.0), (2.0, -0.01), (3.0, 1.0), (4.0, 0.0)]
+    assert simplify_line(line, 0.0) == line
+
+
+def test_simplify_geometry_keeps_collapsed_feature_visible() -> None:
+    geom = {"type": "MultiPolygon", "coordinates": [[[list(p) for p in SQUARE]]]}
+    simplified = simplify_geometry(geom, 10.0)
+    assert simplified is not None
+    assert simplified["type"] == "Polygon"
+    assert len(simplified["coordinates"][0]) >= 4
+
+
+def test_convex_hull() -> None:
+    points = [*SQUARE, (0.5, 0.5), (0.2, 0.8), (1.0, 0.5)]
+    hull = convex_hull(points)
+    assert hull[0] == hull[-1]
+    assert sorted(hull[:-1]) == sorted(SQUARE[:-1])
+    assert len(convex_hull([(0, 0), (1, 1), (2, 2)])) < 4
+
+
+def test_area_metrics() -> None:
+    square = {"type": "Polygon", "coordinates": [[list(p) for p in SQUARE]]}
+    # Hole given clockwise or counter-clockwise is subtracted either way
+    holed = {"type": "Polygon", "coordinates": [[list(p) for p in SQUARE], [list(p) for p in HOLE[::-1]]]}
+    # Second polygon three times the size of the first pulls the centroid east
+    multi = {
+        "type": "MultiPolygon",
+        "coordinates": [
+            [[list(p) for p in SQUARE]],
+            [[[2.0, 0.0], [5.0, 0.0], [5.0, 1.0], [2.0, 1.0], [2.0, 0.0]]],
+        ],
+    }
+    metrics = area_metrics([square, None, holed, multi, {"type": "Point", "coordinates": [1, 2]}])
+    assert metrics[1] is None and metrics[4] is None
+
+    square_metrics = metrics[0]
+    # One degree square at the equator, ~111.2 km on each side
+    assert abs(square_metrics.area_km2 - haversine_km(0, 0, 0, 1) * haversine_km(0, 0, 1, 0)) < 5
+    assert np.allclose(square_metrics.centroid, (0.5, 0.5))
+    assert square_metrics.bbox == (0.0, 0.0, 1.0, 1.0)
+
+    holed_metrics = metrics[2]
+    assert abs(holed_metrics.area_km2 / square_metrics.area_km2 - 0.96) < 1e-3
+    assert np.allclose(holed_metrics.centroid, (0.5, 0.5))
+
+    multi_metrics = metrics[3]
+    assert np.allclose(multi_metrics.centroid, ((0.5 * 1 + 3.5 * 3) / 4, 0.5))
+    assert multi_metrics.bbox == (0.0, 0.0, 5.0, 1.0)
+
+
+def test_line_metrics() -> None:
+    lines = [
+        [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]],
+        None,
+        [[10.0, 5.0, 120.0], [10.0, 6.0, 80.0]],  # with altitude
+    ]
+    lengths, bboxes = line_metrics(lines)
+    assert np.allclose(lengths, [haversine_km(0, 0, 0, 1) + haversine_km(0, 1, 1, 1), 0.0, haversine_km(5, 10, 6, 10)])
+    assert bboxes[0].tolist() == [0.0, 0.0, 1.0, 1.0]
+    assert np.isnan(bboxes[1]).all()
+    assert bboxes[2].tolist() == [10.0, 5.0, 10.0, 6.0]
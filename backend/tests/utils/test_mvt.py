@@ -0,0 +1,46 @@
+from app.utils.mvt import (
+    MVTLayer,
+    TileProjection,
+    _varint,
+    _zigzag,
+    clip_line,
+    clip_ring,
+    encode_tile,
+    tile_bbox,
+)
+
+
+def test_varint_and_zigzag() -> None:
+    assert _varint(1) == b"\x01"
+    assert _varint(300) == b"\xac\x02"
+    assert [_zigzag(n) for n in (0, -1, 1, -2, 2)] == [0, 1, 2, 3, 4]
+
+
+def test_tile_bbox_and_projection_round_trip() -> None:
+    assert tile_bbox(0, 0, 0)[0] == -180.0
+    min_lon, min_lat, max_lon, max_lat = tile_bbox(6, 40, 31)
+    projection = TileProjection(6, 40, 31)
+    xs, ys = projection.project([min_lon, max_lon], [max_lat, min_lat])
+    assert xs.tolist() == [0, 4096]
+    assert ys.tolist() == [0, 4096]
+
+
+def test_clip_ring_to_square() -> None:
+    square = [(-10, -10), (10, -10), (10, 10), (-10, 10), (-10, -10)]
+    assert sorted(clip_ring(square, 0, 20)) == [(0, 0), (0, 10), (10, 0), (10, 10)]
+    assert clip_ring([(30, 30), (40, 30), (40, 40)], 0, 20) == []
+
+
+def test_clip_line_splits_at_tile_edges() -> None:
+    line = [(-10, 5), (5, 5), (5, 30), (15, 30), (15, 5)]
+    assert clip_line(line, 0, 20) == [[(0, 5), (5, 5), (5, 20)], [(15, 20), (15, 5)]]
+
+
+def test_encode_tile_skips_empty_layers() -> None:
+    empty = MVTLayer("empty")
+    points = MVTLayer("points")
+    points.add_point((10, 10), {"name": "a"}, 1)
+    points.add_point((99999, 10), {"name": "outside"}, 2)
+    assert len(points) == 1
+    tile = encode_tile([empty, points])
+    assert b"points" in tile and b"empty" not in tile
@@ -0,0 +1,48 @@
+import numpy as np
+
+from app.utils.geo_index import AdminArea, AdminIndex
+from app.utils.geometry import polygons_of
+from app.utils.olc_grid import OLCRegionGrid
+from app.utils.olc_helper import generate_somalia_olc, olc_cell_size
+
+
+def _admin_index() -> AdminIndex:
+    region = AdminArea(
+        id=1, code="SOM-BAN", name="Banaadir", bbox=(45.0, 2.0, 45.6, 2.3),
+        polygons=polygons_of({
+            "type": "Polygon",
+            "coordinates": [[[45.0, 2.0], [45.6, 2.0], [45.6, 2.3], [45.0, 2.3], [45.0, 2.0]]],
+        }),
+    )
+    district = AdminArea(
+        id=10, code="SOM-BAN-MOG", name="Mogadisho", bbox=(45.0, 2.0, 45.33, 2.3), region_id=1,
+        polygons=polygons_of({
+            "type": "Polygon",
+            "coordinates": [[[45.0, 2.0], [45.33, 2.0], [45.21, 2.3], [45.0, 2.3], [45.0, 2.0]]],
+        }),
+    )
+    return AdminIndex([region], [district])
+
+
+def test_olc_cell_size() -> None:
+    assert olc_cell_size(6) == 0.05
+    assert olc_cell_size(8) == 0.0025
+
+
+def test_grid_matches_exact_lookup() -> None:
+    admin = _admin_index()
+    grid = OLCRegionGrid(admin, 8)
+
+    rng = np.random.default_rng(3)
+    for lon, lat in zip(rng.uniform(44.9, 45.7, 3000), rng.uniform(1.9, 2.4, 3000)):
+        expected = admin.locate(float(lon), float(lat))
+        match = grid.locate(float(lon), float(lat))
+        assert match.district is expected.district
+        assert match.region is expected.region
+
+
+def test_generate_somalia_olc_with_grid() -> None:
+    grid = OLCRegionGrid(_admin_index(), 6)
+    code = generate_somalia_olc(2.05, 45.1, region_lookup=grid.region_code)
+    assert code.startswith("SOM-BAN:")
+    assert ":" not in generate_somalia_olc(9.5, 44.0, region_lookup=grid.region_code)
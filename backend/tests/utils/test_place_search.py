@@ -0,0 +1,251 @@
+import pytest
+from sqlmodel import Session, select
+
+from app import models
+from app.api.v1.endpoints.places import search_places
+from app.core.config import settings
+from app.utils.names import fold_name, name_key, normalize_name, phonetic_key, trigrams
+from app.utils.place_fts import (
+    NameSpeller,
+    build_place_speller,
+    match_expression,
+    search_place_fts,
+    sync_place_fts,
+)
+from app.utils.place_search import (
+    PHONETIC_SCORE,
+    REGION_NAME_WEIGHT,
+    Autocompleter,
+    Completion,
+    PlaceEntry,
+    PlaceIndex,
+    build_search_index,
+    match_name_keys,
+    place_index,
+)
+from app.utils.spelling import SymSpell, edit_distance
+from tests.utils.utils import memory_session
+
+
+def _index(spelling: bool = False) -> PlaceIndex:
+    entries = [
+        PlaceEntry(kind="region", id=1, code="SOM-BAN", name="Banaadir", region="Banaadir"),
+        PlaceEntry(kind="district", id=10, code="SOM-BAN-MOG", name="Mogadisho", region="Banaadir",
+                   aliases=["Xamar"], population=2_000_000),
+        PlaceEntry(kind="district", id=11, code="SOM-MUD-GAL", name="Gaalkacyo", region="Mudug"),
+        PlaceEntry(kind="district", id=12, code="SOM-GAL-CEB", name="CeelBuur", region="Galguduud"),
+    ]
+    names = [(0, "Banaadir", 1.0)]
+    for position, entry in enumerate(entries[1:], start=1):
+        names.append((position, entry.name, 1.0))
+        names.extend((position, alias, 1.0) for alias in entry.aliases or [])
+        names.append((position, entry.region, REGION_NAME_WEIGHT))
+    return PlaceIndex(entries, names, spelling=spelling)
+
+
+def test_normalize_name() -> None:
+    assert normalize_name("CeelBarde") == "ceel barde"
+    assert normalize_name("  Béledweyne (town) ") == "beledweyne town"
+    assert trigrams("bay") == {"  b", " ba", "bay", "ay "}
+
+
+def test_somali_name_keys() -> None:
+    assert fold_name("Gaalkacyo") == "galkayo"
+    assert fold_name("Xamar Jajab") == "hamar jajab"
+    for somali, english in (
+        ("Kismaayo", "Kismayo"), ("Hargeysa", "Hargeisa"), ("Gaalkacyo", "Galkayo"),
+        ("Xamar", "Hamar"), ("CeelBarde", "El Barde"), ("Dhuusamareeb", "Dusa Mareb"),
+    ):
+        assert name_key(somali) == name_key(english)
+    # Vowel and consonant spelling variants only share the phonetic key
+    assert name_key("Muqdisho") != name_key("Mogadishu")
+    assert phonetic_key("Muqdisho") == phonetic_key("Mogadishu") == "mkdsh"
+    assert phonetic_key("BeledWeyn") == phonetic_key("Belet Weyn")
+    assert name_key("--") == phonetic_key("--") == ""
+
+
+def test_place_index_search() -> None:
+    index = _index()
+
+    # Misspelling of the district name
+    assert [(e.name, e.kind) for e, _ in index.search("Muqdisho")] == [("Mogadisho", "district")]
+    # Region first, its districts below through the region name
+    results = index.search("Banaadir")
+    assert [(e.name, score) for e, score in results] == [("Banaadir", 1.0), ("Mogadisho", REGION_NAME_WEIGHT)]
+    # Alias-only hit, prefix and CamelCase words
+    assert index.search("xamar")[0][0].code == "SOM-BAN-MOG"
+    assert index.search("gaalk")[0][0].name == "Gaalkacyo"
+    assert index.search("ceel buur")[0][1] == 1.0
+    # Somali and English spellings fold to the same term
+    assert index.search("Galkayo")[0] == (index.entries[2], 1.0)
+    assert index.search("zzz") == []
+    assert len(index.search("a", limit=1)) <= 1
+
+
+def test_symspell() -> None:
+    assert edit_distance("hudur", "hudru", 2) == 1  # transposition
+    assert edit_distance("baki", "bakool", 1) == 2
+    speller = SymSpell(["baki", "bakool", "mogadisho", "hudur"])
+    assert speller.lookup("bakj", 1) == [("baki", 1)]
+    assert speller.lookup("bako", 2) == [("baki", 1), ("bakool", 2)]
+    assert speller.lookup("baki", 2) == [("baki", 0)]
+    assert speller.lookup("mgadishx", 2) == [("mogadisho", 2)]
+    assert speller.lookup("mgadishx", 1) == []
+    assert speller.lookup("zzzz", 2) == []
+
+
+def test_place_index_corrections() -> None:
+    index = _index(spelling=True)
+
+    # A one-letter typo in a short name shares few trigrams but is a correction
+    assert index.corrections("Gaalkaxyo") == [("Gaalkacyo", 1)]
+    assert [(e.name, score) for e, score in index.search("Ceel Buor")][:1] == [("CeelBuur", 0.857)]
+    assert index.corrections("Mgadishx") == [("Mogadisho", 2)]
+    # Exact names, short queries and indexes built without spelling correct nothing
+    assert index.corrections("Banadiir") == []  # folds to the indexed "banadir"
+    assert index.corrections("Bxn") == []
+    assert _index().corrections("Gaalkaxyo") == []
+    assert index.search_with_corrections("Gaalkaxyo", 1) == (
+        index.search("Gaalkaxyo", 1), [("Gaalkacyo", 1)]
+    )
+
+
+def test_autocompleter() -> None:
+    completer = Autocompleter([
+        Completion(text="Aden Adde Road", kind="road", id=5, name="Aden Adde Road", weight=40),
+        Completion(text="Bardera Airport", kind="airport", id=7, name="Bardera Airport"),
+        Completion(text="CeelBarde", kind="district", id=12, name="CeelBarde", region="Bakool"),
+        Completion(text="Xamar", kind="district", id=10, name="Mogadisho", region="Banaadir"),
+        Completion(text="Mogadisho", kind="district", id=10, name="Mogadisho", region="Banaadir"),
+        Completion(text="Mudug", kind="region", id=3, name="Mudug", region="Mudug"),
+        Completion(text="Mogadishu-Baidoa Road", kind="road", id=6, name="Mogadishu-Baidoa Road", weight=90),
+    ])
+
+    # Regions, then districts, then roads by weight
+    assert [c.text for c in completer.complete("m")] == [
+        "Mudug", "Mogadisho", "Mogadishu-Baidoa Road",
+    ]
+    # Any word start, CamelCase included; generic words are not entry points
+    assert [c.text for c in completer.complete("bard")] == ["CeelBarde", "Bardera Airport"]
+    assert [c.text for c in completer.complete("adde r")] == ["Aden Adde Road"]
+    assert completer.complete("ro") == []
+    assert completer.complete("xam")[0].name == "Mogadisho"
+    assert len(completer.complete("m", limit=2)) == 2
+    assert completer.complete("") == []
+
+
+def _session() -> Session:
+    db = memory_session()
+    db.add(models.Region(id=1, name="Banaadir", code="SOM-BAN"))
+    db.add(models.District(
+        id=10, name="Mogadisho", code="SOM-BAN-MOG", region_name="Banaadir", region_id=1, aliases=["Xamar"],
+    ))
+    db.add(models.District(id=11, name="CeelBarde", code="SOM-BAK-CEE", region_name="Bakool", region_id=1))
+    db.add(models.Airport(
+        id=7, name="Aden Adde International Airport", iata_code="MGQ", icao_code="HCMM",
+        type="international", latitude=2.01, longitude=45.30, region="Banaadir",
+    ))
+    for road_id, name in ((3, "Aden Adde Road"), (4, "Aden Adde Road"), (5, "Unnamed Road")):
+        db.add(models.Road(id=road_id, name=name, type="primary", geometry={"type": "LineString", "coordinates": []}))
+    db.commit()
+    return db
+
+
+def test_search_index() -> None:
+    with _session() as db:
+        index = build_search_index(db)
+
+        assert [(e.kind, e.id) for e, _ in index.matches("MGQ")] == [("airport", 7)]
+        # Roads are grouped by name under their first id; placeholders are skipped
+        matches = index.matches("aden adde")
+        assert [(e.kind, e.id) for e, _ in matches] == [("road", 3), ("airport", 7)]
+        assert matches[0][1] > matches[1][1]
+        assert all(e.name != "Unnamed Road" for e in index.entries)
+        assert index.matches("xamar")[0][0].code == "SOM-BAN-MOG"
+        # Unlike /places/search, districts do not match on their region name
+        assert [e.kind for e, _ in index.matches("banaadir")] == ["region"]
+
+
+def test_match_name_keys() -> None:
+    with _session() as db:
+        assert match_name_keys(db, "Mogadishu") == []  # keys not computed yet
+        for table in (models.Region, models.District):
+            for row in db.exec(select(table)).all():
+                row.name_key, row.name_phonetic = name_key(row.name), phonetic_key(row.name)
+                db.add(row)
+        db.commit()
+
+        assert [(e.kind, e.id, score) for e, score in match_name_keys(db, "Mogadishu")] == [
+            ("district", 10, PHONETIC_SCORE),
+        ]
+        assert [(e.kind, e.id, score) for e, score in match_name_keys(db, "El Barde")] == [("district", 11, 1.0)]
+        assert [e.kind for e, _ in match_name_keys(db, "BANAADIR")] == ["region"]
+        assert match_name_keys(db, "Kismayo") == []
+        assert match_name_keys(db, "") == []
+    # Table-only columns
+    for schema in (models.RegionPublic, models.DistrictCreate, models.DistrictUpdate, models.AirportPublic):
+        assert not {"name_key", "name_phonetic"} & set(schema.model_fields)
+
+
+def test_place_fts() -> None:
+    with _session() as db:
+        assert search_place_fts(db, "barde", 5, ("district", "region")) is None  # not built yet
+        assert sync_place_fts(db)
+        assert search_place_fts(db, "barde", 5, ("district", "region")) == [("district", 11)]
+        assert search_place_fts(db, "xam", 5, ("district",)) == [("district", 10)]
+        assert search_place_fts(db, "mgq", 5, ("airport",)) == [("airport", 7)]
+        # The region ranks above the district that only matches on its region name
+        assert search_place_fts(db, "banaadir", 5, ("district", "region")) == [("region", 1), ("district", 10)]
+        assert search_place_fts(db, "--", 5, ("district",)) == []
+        # Somali-folded names and queries
+        assert match_expression("Xamar Jajab") == '("xamar"* OR "hamar"*) "jajab"*'
+        assert search_place_fts(db, "el barde", 5, ("district",)) == [("district", 11)]
+        assert search_place_fts(db, "hamar", 5, ("district",)) == [("district", 10)]
+
+
+def test_place_speller() -> None:
+    with _session() as db:
+        speller = build_place_speller(db)
+    assert speller.corrections("Mogadixo") == [("Mogadisho", 1)]
+    assert speller.corrections("Xamat") == [("Xamar", 1)]  # aliases are suggested too
+    assert speller.corrections("Ceel Barde") == []
+    assert speller.corrections("Xam") == []
+    # Suggestions keep the first spelling of names that fold alike
+    assert NameSpeller(["Kismaayo", "Kismayo"]).corrections("Kisnaayo") == [("Kismaayo", 1)]
+
+
+def test_place_index_warms_with_memory_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "PLACE_SEARCH_BACKEND", "memory")
+    assert place_index.warm()
+    monkeypatch.setattr(settings, "PLACE_SEARCH_BACKEND", "fts")
+    assert not place_index.warm()
+
+
+def test_search_places_looks_up_corrections_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    lookups = []
+    original = PlaceIndex._corrections
+
+    def corrections(index: PlaceIndex, text: str) -> list[tuple[int, int]]:
+        lookups.append(text)
+        return original(index, text)
+
+    monkeypatch.setattr(settings, "PLACE_SEARCH_BACKEND", "memory")
+    monkeypatch.setattr(PlaceIndex, "_corrections", corrections)
+    with _session() as db:
+        response = search_places(db=db, name="Mogadixo", limit=5)
+    assert [(s.text, s.distance) for s in response.suggestions] == [("Mogadisho", 1)]
+    assert lookups == ["mogadiho"]
+
+
+def test_search_places_fts_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    def no_index(_db: Session) -> None:
+        raise AssertionError("in-memory index built with the fts backend")
+
+    monkeypatch.setattr(settings, "PLACE_SEARCH_BACKEND", "fts")
+    monkeypatch.setattr(place_index, "get", no_index)
+    with _session() as db:
+        sync_place_fts(db)
+        response = search_places(db=db, name="Mogadixo", limit=5)
+        # No FTS hit for the typo: retried with the suggestion
+        assert [(r.type, r.name) for r in response.data] == [("district", "Mogadisho")]
+        assert [(s.text, s.distance) for s in response.suggestions] == [("Mogadisho", 1)]
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from app.utils.geo_index import RoadIndex
+from app.utils.road_graph import RoadGraph, road_speed_kmh
+
+
+def _graph() -> RoadGraph:
+    # A slow direct secondary road and a longer primary detour through C,
+    # plus a disconnected road far away.
+    return RoadGraph(RoadIndex(
+        [
+            (1, [[45.0, 2.0], [45.5, 2.0], [46.0, 2.0]]),  # A - B, secondary
+            (2, [[45.0, 2.0], [45.5, 2.2]]),  # A - C, primary
+            (3, [[45.5, 2.2], [46.0, 2.0]]),  # C - B, primary
+            (4, [[48.0, 8.0], [48.1, 8.0]]),  # isolated
+        ],
+        types=["secondary", "primary", "primary", "secondary"],
+        surfaces=["unpaved", "paved", "paved", None],
+    ))
+
+
+def test_speeds_by_type_and_surface() -> None:
+    assert road_speed_kmh("primary", "paved") > road_speed_kmh("secondary", None)
+    assert road_speed_kmh("secondary", "unpaved") < road_speed_kmh("secondary", None)
+
+
+def test_graph_snaps_shared_vertices_into_nodes() -> None:
+    graph = _graph()
+    # A, B, C plus the two ends of the isolated road
+    assert graph.node_count == 5
+    assert len(graph.edge_km) == 4
+
+
+def test_route_prefers_faster_road() -> None:
+    graph = _graph()
+    start, end = graph.snap(45.0, 1.99), graph.snap(46.0, 1.99)
+    assert start is not None and end is not None
+    assert start.distance_km == pytest.approx(1.11, abs=0.01)
+
+    route = graph.route(start, end)
+    assert route is not None
+    assert [45.5, 2.2] in route.coordinates
+    assert route.distance_km > 111.0  # detour is longer than the direct road
+    assert route.duration_hours == pytest.approx(route.distance_km / 80.0)
+
+
+def test_route_along_one_edge_and_disconnected() -> None:
+    graph = _graph()
+    start, end = graph.snap(45.2, 2.01), graph.snap(45.7, 2.01)
+    route = graph.route(start, end)
+    assert route is not None
+    assert route.coordinates[0] == [45.2, 2.0] and route.coordinates[-1] == [45.7, 2.0]
+    assert [45.5, 2.0] in route.coordinates
+
+    assert graph.route(start, graph.snap(48.05, 8.0)) is None
+    assert graph.snap(30.0, 30.0) is None
+
+
+def test_reachable_within_time_limits() -> None:
+    graph = _graph()
+    start = graph.snap(45.0, 2.0)
+    assert start is not None
+    total_km = sum(graph.edge_km[:3])
+
+    half, everything = graph.reachable(start, [0.01, 10.0])
+    # 0.01 h reaches 0.8 km along the primary road and 0.3 km along the unpaved one
+    assert half.road_km == pytest.approx(0.01 * 80 + 0.01 * 30, rel=1e-6)
+    assert everything.road_km == pytest.approx(total_km)
+    assert len(everything.points) >= 3
+
+
+def test_route_costs_match_routes() -> None:
+    graph = _graph()
+    sources = [graph.snap(45.0, 1.99), graph.snap(45.2, 2.01)]
+    targets = [graph.snap(46.0, 1.99), graph.snap(45.7, 2.01), graph.snap(48.05, 8.0)]
+    hours, km = graph.route_costs(sources, targets)
+    assert hours.shape == km.shape == (2, 3)
+    for i, source in enumerate(sources):
+        for j, target in enumerate(targets[:2]):
+            route = graph.route(source, target)
+            assert hours[i, j] == pytest.approx(route.duration_hours)
+            assert km[i, j] == pytest.approx(route.distance_km)
+    assert np.isinf(hours[:, 2]).all()
+
+
+def test_first_landmark_in_largest_component() -> None:
+    graph = RoadGraph(RoadIndex(
+        [
+            (1, [[45.0, 2.0], [45.5, 2.0], [46.0, 2.0]]),
+            (2, [[45.5, 2.0], [45.5, 2.5]]),
+            (3, [[41.0, 3.0], [41.1, 3.0]]),  # isolated, farthest west
+        ],
+        types=["primary", "primary", "track"],
+        surfaces=[None, None, None],
+    ))
+    first = graph.landmark_hours[0]
+    # Seeded at the west end of the main road, reaching its four nodes only
+    assert graph.node_lons[int(np.argmin(first))] == 45.0
+    assert int(np.isfinite(first).sum()) == 4
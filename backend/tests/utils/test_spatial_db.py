@@ -0,0 +1,123 @@
+import json
+import random
+import sqlite3
+
+import pytest
+from sqlalchemy import delete, event, text, update
+from sqlmodel import Session, SQLModel, func, select
+
+from app import models
+from app.core.db import load_spatialite
+from app.utils import spatial_db
+from tests.utils.utils import memory_engine
+
+
+def _session(spatialite: bool = False) -> Session:
+    engine = memory_engine()
+    if spatialite:
+        event.listen(engine, "connect", load_spatialite)
+    SQLModel.metadata.create_all(engine)
+    return Session(engine)
+
+
+def _count(db: Session, box: tuple) -> int:
+    return db.exec(select(func.count(models.Road.id)).where(*spatial_db.bbox_conditions(db, models.Road, box))).one()
+
+
+def test_rtree_bbox_conditions_match_bounds_columns() -> None:
+    rng = random.Random(3)
+    with _session() as db:
+        for i in range(300):
+            lon, lat = rng.uniform(41, 51), rng.uniform(-2, 12)
+            db.add(models.Road(
+                name=f"Road {i}", type="primary", geometry={"type": "LineString", "coordinates": []},
+                min_lon=lon, min_lat=lat, max_lon=lon + rng.uniform(0, 0.5), max_lat=lat + rng.uniform(0, 0.5),
+            ))
+        db.commit()
+        boxes = []
+        for _ in range(20):
+            lon, lat = rng.uniform(41, 50), rng.uniform(-2, 11)
+            boxes.append((lon, lat, lon + rng.uniform(0.1, 2), lat + rng.uniform(0.1, 2)))
+
+        spatial_db._support.invalidate()
+        expected = [_count(db, box) for box in boxes]  # bounds columns only
+        assert not spatial_db._support.get(db).rtree
+        # The sync refreshes the cached support itself
+        assert spatial_db.sync_rtree_tables(db)
+        assert spatial_db._support.get(db).rtree
+        assert [_count(db, box) for box in boxes] == expected
+        assert sum(expected) > 0
+
+        # Triggers follow updates and deletes
+        road_id = db.exec(select(models.Road.id)).first()
+        db.execute(update(models.Road).where(models.Road.id == road_id).values(
+            min_lon=60.0, min_lat=20.0, max_lon=60.5, max_lat=20.5,
+        ))
+        assert _count(db, (60.1, 20.1, 60.2, 20.2)) == 1
+        db.execute(delete(models.Road).where(models.Road.id == road_id))
+        assert _count(db, (60.1, 20.1, 60.2, 20.2)) == 0
+        assert db.execute(text("SELECT count(*) FROM road_rtree")).scalar() == 299
+    spatial_db._support.invalidate()
+
+
+def _add_roads(db: Session) -> None:
+    db.add(models.Road(
+        id=1, name="Aden Adde Road", type="primary", geometry=[[45.30, 2.03], [45.34, 2.06]],
+        min_lon=45.30, min_lat=2.03, max_lon=45.34, max_lat=2.06,
+    ))
+    db.add(models.Road(id=2, name="Stub", type="track", geometry=[[45.31, 2.04]]))
+    db.add(models.Road(id=3, name="No geometry", type="track"))
+    db.commit()
+
+
+def test_road_geojson_sql_wraps_coordinates() -> None:
+    with _session() as db:
+        _add_roads(db)
+        geojson, present = spatial_db.geojson_sql(models.Road, "sqlite")
+        rows = db.execute(text(f"SELECT id, {geojson} FROM road WHERE {present}")).all()
+        assert [(row_id, json.loads(value)) for row_id, value in rows] == [
+            (1, {"type": "LineString", "coordinates": [[45.30, 2.03], [45.34, 2.06]]}),
+        ]
+        assert spatial_db.geojson_sql(models.District, "sqlite") == ("geometry", "geometry IS NOT NULL")
+
+
+def test_geometry_columns_road_bbox() -> None:
+    with _session(spatialite=True) as db:
+        _add_roads(db)
+        spatial_db._support.invalidate()
+        assert spatial_db.spatial_backend(db) is None
+        if spatial_db.sync_geometry_columns(db) is None:
+            pytest.skip("SpatiaLite cannot be loaded into this sqlite3 build")
+        assert spatial_db.spatial_backend(db) == spatial_db.SPATIALITE
+        for box, expected in (((45.32, 2.04, 45.33, 2.05), [1]), ((46.0, 3.0, 46.1, 3.1), [])):
+            for conditions in (
+                spatial_db.intersects_conditions(db, models.Road, box),
+                spatial_db.bbox_conditions(db, models.Road, box),
+            ):
+                assert conditions is not None
+                assert db.exec(select(models.Road.id).where(*conditions)).all() == expected
+    spatial_db._support.invalidate()
+
+
+class _Connection:
+    def __init__(self, library_error: Exception | None) -> None:
+        self.library_error = library_error
+        self.extension_loading: list[bool] = []
+
+    def enable_load_extension(self, enabled: bool) -> None:
+        self.extension_loading.append(enabled)
+
+    def load_extension(self, _path: str) -> None:
+        if self.library_error:
+            raise self.library_error
+
+
+@pytest.mark.parametrize("library_error", [None, sqlite3.OperationalError("cannot open shared object file")])
+def test_load_spatialite_always_disables_extension_loading(library_error: Exception | None) -> None:
+    conn = _Connection(library_error)
+    load_spatialite(conn, None)
+    assert conn.extension_loading == [True, False]
+
+
+def test_load_spatialite_without_extension_support() -> None:
+    load_spatialite(object(), None)  # sqlite3 build without enable_load_extension
@@ -0,0 +1,211 @@
+import random
+
+import numpy as np
+from sqlmodel import Session, SQLModel
+
+from app import models
+from app.utils.geo_index import (
+    AdminArea,
+    AdminIndex,
+    PointIndex,
+    RoadIndex,
+    bump_data_version,
+    table_signature,
+)
+from app.utils.geometry import haversine_km, point_in_rings, polygons_of
+from app.utils.spatial_index import STRtree
+from tests.utils.utils import memory_engine, square_polygon
+
+
+def test_strtree_query_matches_brute_force() -> None:
+    rng = random.Random(42)
+    entries = []
+    for i in range(500):
+        x, y = rng.uniform(40, 50), rng.uniform(0, 10)
+        entries.append(((x, y, x + rng.uniform(0, 1), y + rng.uniform(0, 1)), i))
+    tree = STRtree(entries, node_capacity=8)
+
+    for _ in range(50):
+        x, y = rng.uniform(40, 50), rng.uniform(0, 10)
+        query = (x, y, x + 0.5, y + 0.5)
+        expected = {
+            i for (bbox, i) in entries
+            if bbox[0] <= query[2] and query[0] <= bbox[2] and bbox[1] <= query[3] and query[1] <= bbox[3]
+        }
+        assert set(tree.query(query)) == expected
+
+
+def test_strtree_empty() -> None:
+    assert STRtree([]).query_point(45.0, 2.0) == []
+
+
+def test_point_in_rings_with_hole() -> None:
+    rings = polygons_of({
+        "type": "Polygon",
+        "coordinates": [
+            [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+            [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]],
+        ],
+    })[0]
+    assert point_in_rings(1, 1, rings)
+    assert not point_in_rings(5, 5, rings)
+    assert not point_in_rings(11, 5, rings)
+
+
+def test_admin_index_locate() -> None:
+    region = AdminArea(id=1, code="SOM-BAN", name="Banaadir", bbox=None, polygons=polygons_of(square_polygon(45, 2, 2)))
+    west = AdminArea(
+        id=10, code="SOM-BAN-W", name="West", bbox=None,
+        polygons=polygons_of(square_polygon(45, 2, 1)), region_id=1,
+    )
+    east = AdminArea(
+        id=11, code="SOM-BAN-E", name="East", bbox=None,
+        polygons=polygons_of(square_polygon(46, 2, 1)), region_id=1,
+    )
+    index = AdminIndex([region], [west, east])
+
+    match = index.locate(45.5, 2.5)
+    assert match.district is west
+    assert match.region is region
+
+    match = index.locate(46.5, 2.5)
+    assert match.district is east
+
+    # Inside the region but not covered by any district
+    match = index.locate(45.5, 3.5)
+    assert match.district is None
+    assert match.region is region
+
+    match = index.locate(30.0, 2.5)
+    assert match.district is None and match.region is None
+
+
+def test_admin_index_locate_many_matches_locate() -> None:
+    region = AdminArea(id=1, code="SOM-BAN", name="Banaadir", bbox=None, polygons=polygons_of(square_polygon(45, 2, 2)))
+    districts = [
+        AdminArea(id=10, code="W", name="West", bbox=None, polygons=polygons_of(square_polygon(45, 2, 1)), region_id=1),
+        AdminArea(id=11, code="E", name="East", bbox=None, polygons=polygons_of(square_polygon(46, 2, 1)), region_id=1),
+    ]
+    index = AdminIndex([region], districts)
+
+    rng = np.random.default_rng(7)
+    lons = rng.uniform(44.5, 47.5, 2000)
+    lats = rng.uniform(1.5, 4.5, 2000)
+    for lon, lat, match in zip(lons, lats, index.locate_many(lons, lats)):
+        expected = index.locate(float(lon), float(lat))
+        assert match.district is expected.district
+        assert match.region is expected.region
+
+
+def test_point_index_nearest_matches_haversine() -> None:
+    rng = random.Random(5)
+    points = [(i, rng.uniform(-2, 12), rng.uniform(41, 51)) for i in range(300)]
+    index = PointIndex(points)
+
+    for _ in range(20):
+        lat, lon = rng.uniform(-2, 12), rng.uniform(41, 51)
+        expected = sorted((haversine_km(lat, lon, p_lat, p_lon), i) for i, p_lat, p_lon in points)[:5]
+        result = index.nearest(lat, lon, k=5)
+        assert [i for i, _ in result] == [i for _, i in expected]
+        for (_, distance), (expected_distance, _) in zip(result, expected):
+            assert abs(distance - expected_distance) < 1e-6
+
+
+def test_point_index_empty() -> None:
+    assert PointIndex([]).nearest(2.0, 45.0, k=3) == []
+
+
+def test_road_index_bbox_query() -> None:
+    index = RoadIndex([
+        (1, [[45.0, 2.0], [45.1, 2.1]]),  # fully inside
+        (2, [[44.0, 2.5], [46.0, 2.5]]),  # crosses the box, no vertex inside
+        (3, [[44.8, 1.8], [45.4, 2.4]]),  # diagonal through the box
+        (4, [[44.7, 2.5], [45.05, 2.9]]),  # bbox overlaps, segment passes above the corner
+        (5, [[47.0, 3.0]]),  # single point outside
+    ])
+    box = (44.95, 1.96, 45.3, 2.6)
+    assert index.query(box) == [1, 2, 3]
+    assert index.query(box, exact=False) == [1, 2, 3, 4]
+    assert index.query((40.0, 0.0, 41.0, 1.0)) == []
+
+
+def test_road_index_drops_altitudes() -> None:
+    box = (44.95, 1.96, 45.3, 2.6)
+    all_3d = RoadIndex([(1, [[45.0, 2.0, 10.0], [45.1, 2.1, 12.0]])])
+    assert all_3d.query(box) == [1]
+    assert list(all_3d.xs) == [45.0, 45.1] and list(all_3d.ys) == [2.0, 2.1]
+
+    mixed = RoadIndex([
+        (1, [[45.0, 2.0, 10.0], [45.1, 2.1]]),
+        (2, [[47.0, 3.0], [47.1, 3.1, 5.0]]),
+    ])
+    assert mixed.query(box) == [1]
+    assert list(mixed.ys) == [2.0, 2.1, 3.0, 3.1]
+
+
+def test_point_index_within_matches_haversine() -> None:
+    rng = random.Random(9)
+    points = [(i, rng.uniform(-2, 12), rng.uniform(41, 51)) for i in range(300)]
+    index = PointIndex(points)
+
+    for _ in range(20):
+        lat, lon = rng.uniform(-2, 12), rng.uniform(41, 51)
+        expected = sorted(
+            (haversine_km(lat, lon, p_lat, p_lon), i)
+            for i, p_lat, p_lon in points
+            if haversine_km(lat, lon, p_lat, p_lon) <= 150
+        )
+        result = index.within(lat, lon, 150)
+        assert [i for i, _ in result] == [i for _, i in expected]
+    assert PointIndex([]).within(2.0, 45.0, 10) == []
+
+
+def test_road_index_within() -> None:
+    index = RoadIndex([
+        (1, [[45.0, 2.0], [45.2, 2.0]]),  # passes 0.01 deg (~1.1 km) south of the point
+        (2, [[45.0, 2.1], [45.2, 2.1]]),  # ~10 km north
+        (3, [[46.0, 2.0], [46.1, 2.1]]),  # far away
+    ])
+    positions, distances = index.within(45.1, 2.01, 5)
+    assert [index.ids[p] for p in positions] == [1]
+    assert abs(distances[0] - 1.11) < 0.01
+
+    positions, distances = index.within(45.1, 2.01, 20)
+    assert [index.ids[p] for p in positions] == [1, 2]
+    assert list(distances) == sorted(distances)
+
+
+def test_admin_index_districts_within() -> None:
+    region = AdminArea(id=1, code="SOM-BAN", name="Banaadir", bbox=None, polygons=polygons_of(square_polygon(45, 2, 2)))
+    west = AdminArea(id=10, code="W", name="West", bbox=None, polygons=polygons_of(square_polygon(45, 2, 1)), region_id=1)
+    east = AdminArea(id=11, code="E", name="East", bbox=None, polygons=polygons_of(square_polygon(46, 2, 1)), region_id=1)
+    index = AdminIndex([region], [west, east])
+
+    # 0.1 deg west of the West/East border, ~11 km from East
+    result = index.districts_within(45.9, 2.5, 5)
+    assert [(area.code, distance) for area, distance in result] == [("W", 0.0)]
+
+    result = index.districts_within(45.9, 2.5, 20)
+    assert [area.code for area, _ in result] == ["W", "E"]
+    assert 10.5 < result[1][1] < 11.5
+
+
+def test_table_signature_tracks_data_version() -> None:
+    engine = memory_engine()
+    models.Region.__table__.create(engine)  # type: ignore[attr-defined]
+    with Session(engine) as db:
+        db.add(models.Region(id=1, name="Banaadir", code="SOM-BAN"))
+        db.commit()
+        # Databases created before the version table still get a signature
+        assert table_signature(db, models.Region) == (1, 1, None)
+
+        SQLModel.metadata.create_all(engine)
+        before = table_signature(db, models.Region)
+        # An in-place rewrite keeps count and ids but bumps the version
+        bump_data_version(db, models.Region)
+        db.commit()
+        after = table_signature(db, models.Region)
+        assert after != before and after[:2] == before[:2]
+        bump_data_version(db, models.Region)
+        db.commit()
+        assert table_signature(db, models.Region) == (1, 1, 2)
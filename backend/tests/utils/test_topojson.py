@@ -0,0 +1,42 @@
+from app.utils.topojson import Topology
+from tests.utils.utils import square_polygon
+
+
+def _decode(topology: dict, refs: list) -> list:
+    (kx, ky), (tx, ty) = topology["transform"]["scale"], topology["transform"]["translate"]
+    points: list = []
+    for ref in refs:
+        x = y = 0
+        arc = []
+        for dx, dy in topology["arcs"][ref if ref >= 0 else ~ref]:
+            x, y = x + dx, y + dy
+            arc.append((round(x * kx + tx, 6), round(y * ky + ty, 6)))
+        if ref < 0:
+            arc.reverse()
+        points.extend(arc if not points else arc[1:])
+    return points
+
+
+def test_shared_border_is_stored_once() -> None:
+    topology = Topology({1: square_polygon(45, 2, 1), 2: square_polygon(46, 2, 1)}, quantization=1001)
+    doc = topology.to_topojson("districts", [(1, {"name": "West"}), (2, {"name": "East"})])
+
+    west, east = doc["objects"]["districts"]["geometries"]
+    assert west["type"] == "Polygon" and west["properties"] == {"name": "West"}
+    # Two outer arcs plus the shared edge, which east uses reversed
+    assert len(doc["arcs"]) == 3
+    shared = set(west["arcs"][0]) & {~ref for ref in east["arcs"][0]}
+    assert len(shared) == 1
+
+    ring = _decode(doc, west["arcs"][0])
+    assert ring[0] == ring[-1]
+    assert set(ring) == {(45.0, 2.0), (46.0, 2.0), (46.0, 3.0), (45.0, 3.0)}
+
+
+def test_subset_only_includes_used_arcs() -> None:
+    topology = Topology({1: square_polygon(45, 2, 1), 2: square_polygon(46, 2, 1), 3: square_polygon(48, 2, 1)}, quantization=1001)
+    doc = topology.to_topojson("districts", [(3, {})])
+    (geometry,) = doc["objects"]["districts"]["geometries"]
+    assert len(doc["arcs"]) == 1
+    assert geometry["arcs"] in ([[0]], [[~0]])
+    assert len(set(_decode(doc, geometry["arcs"][0]))) == 4
@@ -0,0 +1,80 @@
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, select
+
+from app import models
+from app.api.v1.endpoints.transport import _location_filters
+from scripts.load_geodata import load_transport_admin
+from tests.utils.utils import memory_session, square_polygon
+
+
+def _session() -> Session:
+    db = memory_session()
+    db.add(models.Region(id=1, name="Banaadir", code="SOM-BAN", geometry=square_polygon(45.0, 2.0, 1.0)))
+    db.add(models.District(
+        id=10, name="Mogadisho", code="SOM-BAN-MOG", region_name="Banaadir", region_id=1,
+        geometry=square_polygon(45.0, 2.0, 0.5),
+    ))
+    for airport_id, lon, lat in ((1, 45.2, 2.2), (2, 45.8, 2.8), (3, 50.0, 10.0)):
+        db.add(models.Airport(
+            id=airport_id, name=f"Airport {airport_id}", type="domestic",
+            latitude=lat, longitude=lon, region="Unknown",
+        ))
+    db.add(models.Port(id=1, name="Port 1", type="commercial", latitude=2.1, longitude=45.1, region="Unknown"))
+    db.commit()
+    return db
+
+
+def _airport_ids(db: Session, **filters: str | None) -> list[int]:
+    args = {"region": None, "district": None, "bbox": None, **filters}
+    conditions = _location_filters(db, models.Airport, args["region"], args["district"], args["bbox"])
+    return list(db.exec(select(models.Airport.id).where(*conditions).order_by(models.Airport.id)).all())
+
+
+def test_load_transport_admin_assigns_region_and_district() -> None:
+    with _session() as db:
+        load_transport_admin(db)
+
+        airports = {row.id: row for row in db.exec(select(models.Airport)).all()}
+        assert (airports[1].region_id, airports[1].district_id, airports[1].region) == (1, 10, "Banaadir")
+        # Inside the region but outside every district
+        assert (airports[2].region_id, airports[2].district_id, airports[2].region) == (1, None, "Banaadir")
+        # Outside Somalia: no foreign keys, source label kept
+        assert (airports[3].region_id, airports[3].district_id, airports[3].region) == (None, None, "Unknown")
+        port = db.get(models.Port, 1)
+        assert port is not None and (port.region_id, port.district_id) == (1, 10)
+
+
+def test_load_transport_admin_rerun_restores_source_label() -> None:
+    with _session() as db:
+        load_transport_admin(db)
+        # Boundaries reloaded: the region no longer covers airport 2
+        region = db.get(models.Region, 1)
+        assert region is not None
+        region.geometry = square_polygon(45.0, 2.0, 0.5)
+        db.add(region)
+        db.commit()
+        load_transport_admin(db)
+
+        airport = db.get(models.Airport, 2)
+        assert airport is not None
+        assert (airport.region_id, airport.region, airport.region_label) == (None, "Unknown", "Unknown")
+        airport = db.get(models.Airport, 1)
+        assert airport is not None and (airport.region, airport.region_label) == ("Banaadir", "Unknown")
+
+
+def test_location_filters() -> None:
+    with _session() as db:
+        load_transport_admin(db)
+
+        assert _airport_ids(db) == [1, 2, 3]
+        # Region and district by name (case-insensitive) or code
+        assert _airport_ids(db, region="banaadir") == [1, 2]
+        assert _airport_ids(db, region="SOM-BAN") == [1, 2]
+        assert _airport_ids(db, district="MOGADISHO") == [1]
+        assert _airport_ids(db, district="SOM-BAN-MOG", region="Banaadir") == [1]
+        assert _airport_ids(db, region="Mudug") == []
+        assert _airport_ids(db, bbox="45.5,2.5,46,3") == [2]
+        with pytest.raises(HTTPException) as error:
+            _airport_ids(db, bbox="45,2,44")
+        assert error.value.status_code == 400
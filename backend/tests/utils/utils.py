@@ -1,7 +1,11 @@
 import random
 import string
+from typing import Any
 
 from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
 
 from app.core.config import settings
 
@@ -24,3 +28,22 @@ def get_superuser_token_headers(client: TestClient) -> dict[str, str]:
     a_token = tokens["access_token"]
     headers = {"Authorization": f"Bearer {a_token}"}
     return headers
+
+
+def square_polygon(x: float, y: float, size: float) -> dict[str, Any]:
+    return {
+        "type": "Polygon",
+        "coordinates": [[[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]],
+    }
+
+
+def memory_engine() -> Engine:
+    """Empty in-memory SQLite database, shared by every session of the engine."""
+    return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+def memory_session() -> Session:
+    """Session on a fresh in-memory SQLite database with every table created."""
+    engine = memory_engine()
+    SQLModel.metadata.create_all(engine)
+    return Session(engine)
@@ -186,7 +186,7 @@ fetchBtn.addEventListener('click', fetchData);
 // Populate regions for filter and wire endpoint-dependent controls
 async function loadRegionsForFilter() {
   try {
-    const res = await fetch(`${API_BASE}/regions?limit=300`);
+    const res = await fetch(`${API_BASE}/regions?limit=300&zoom=0`);
     const body = await res.json();
     const items = Array.isArray(body?.data) ? body.data : [];
     for (const r of items) {